@@ -0,0 +1,297 @@
+"""
+Benchmark the version checks as the number of database aliases grows.
+
+Databases are synthetic: SQLite, plus fake PostgreSQL and MySQL backends that
+return canned versions after a configurable latency, so no servers are
+needed. Each result records the wall time, memory allocations, and
+connections opened by one check run.
+
+Run with:
+
+    python -m benchmarks.bench_checks --output results.json
+
+Then, after changing code, compare against the saved results:
+
+    python -m benchmarks.bench_checks --compare results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.core.checks import CheckMessage
+from django.db.backends.signals import connection_created
+from django.db.utils import ConnectionHandler
+from django.test import override_settings
+
+VENDOR_ENGINES = {
+    "postgresql": "benchmarks.fake_backends.postgresql",
+    "mysql": "benchmarks.fake_backends.mysql",
+}
+
+
+def build_databases(aliases: int, latency: float) -> dict[str, dict[str, Any]]:
+    """
+    Build a DATABASES setting with the given number of aliases: "default" on
+    SQLite, and the rest alternating between fake PostgreSQL and MySQL.
+    """
+    databases: dict[str, dict[str, Any]] = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    }
+    vendors = list(VENDOR_ENGINES)
+    for i in range(1, aliases):
+        databases[f"db_{i:04}"] = {
+            "ENGINE": VENDOR_ENGINES[vendors[i % len(vendors)]],
+            "NAME": ":memory:",
+            "FAKE_LATENCY": latency,
+        }
+    return databases
+
+
+def build_config(
+    databases: dict[str, dict[str, Any]], per_alias: bool
+) -> dict[str, Any]:
+    """
+    Build a VERSION_CHECKS setting, with either one specifier per vendor or
+    one per alias.
+    """
+    config: dict[str, Any] = {"python": ">=3", "sqlite": ">=3"}
+    if per_alias:
+        for vendor, specifier in [("postgresql", ">=16"), ("mysql", ">=8")]:
+            config[vendor] = {
+                alias: specifier
+                for alias, db in databases.items()
+                if db["ENGINE"] == VENDOR_ENGINES[vendor]
+            }
+    else:
+        config["postgresql"] = ">=16"
+        config["mysql"] = ">=8"
+    return config
+
+
+def get_checks() -> dict[str, Callable[..., list[CheckMessage]]]:
+    from django_version_checks import checks
+
+    return {
+        "python": checks.check_python_version,
+        "sqlite": checks.check_sqlite_version,
+        "postgresql": checks.check_postgresql_version,
+        "mysql": checks.check_mysql_version,
+        "unified": checks.check_versions,
+    }
+
+
+def run_once(
+    check: Callable[..., list[CheckMessage]],
+    databases: dict[str, dict[str, Any]],
+    *,
+    trace: bool,
+) -> dict[str, Any]:
+    from django_version_checks.probing import clear_detected_versions
+
+    # A fresh handler per run, so no connection has its version cached.
+    handler = ConnectionHandler(databases)
+    clear_detected_versions()
+    opened = 0
+
+    def count_open(**kwargs: Any) -> None:
+        nonlocal opened
+        opened += 1
+
+    connection_created.connect(count_open, weak=False)
+    try:
+        with mock.patch("django_version_checks.checks.connections", handler):
+            if trace:
+                tracemalloc.start()
+            start = time.perf_counter()
+            check(databases=list(databases))
+            elapsed = time.perf_counter() - start
+            if trace:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+    finally:
+        connection_created.disconnect(count_open)
+        handler.close_all()
+
+    result: dict[str, Any] = {"wall_time": elapsed, "connections_opened": opened}
+    if trace:
+        stats = snapshot.statistics("filename")
+        result["allocated_blocks"] = sum(stat.count for stat in stats)
+        result["allocated_bytes"] = sum(stat.size for stat in stats)
+        result["peak_bytes"] = peak
+    return result
+
+
+def run_benchmarks(
+    *,
+    aliases: list[int],
+    latency: float,
+    repeat: int,
+    workers: int,
+) -> list[dict[str, Any]]:
+    results = []
+    for check_name, check in get_checks().items():
+        for alias_count in aliases:
+            databases = build_databases(alias_count, latency)
+            for per_alias in [False, True]:
+                config = build_config(databases, per_alias)
+                with override_settings(
+                    VERSION_CHECKS=config,
+                    VERSION_CHECKS_PROBE_WORKERS=workers,
+                    VERSION_CHECKS_CACHE_PATH=None,
+                ):
+                    runs = [
+                        run_once(check, databases, trace=False) for _ in range(repeat)
+                    ]
+                    traced = run_once(check, databases, trace=True)
+                wall_times = [run["wall_time"] for run in runs]
+                results.append(
+                    {
+                        "check": check_name,
+                        "aliases": alias_count,
+                        "config": "per_alias" if per_alias else "single",
+                        "wall_time_min": min(wall_times),
+                        "wall_time_median": statistics.median(wall_times),
+                        "connections_opened": runs[0]["connections_opened"],
+                        "allocated_blocks": traced["allocated_blocks"],
+                        "allocated_bytes": traced["allocated_bytes"],
+                        "peak_bytes": traced["peak_bytes"],
+                    }
+                )
+    return results
+
+
+def result_key(result: dict[str, Any]) -> tuple[str, int, str]:
+    return (result["check"], result["aliases"], result["config"])
+
+
+def compare(
+    baseline: list[dict[str, Any]],
+    results: list[dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """
+    Return a description of each result that is more than threshold times
+    slower, or opens more connections, than its baseline.
+    """
+    baseline_by_key = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = baseline_by_key.get(result_key(result))
+        if old is None:
+            continue
+        label = "{} aliases={} config={}".format(*result_key(result))
+        # Ignore noise on runs too fast to measure reliably.
+        if (
+            result["wall_time_min"] > 0.001
+            and result["wall_time_min"] > old["wall_time_min"] * threshold
+        ):
+            regressions.append(
+                f"{label}: wall time {old['wall_time_min']:.6f}s ->"
+                + f" {result['wall_time_min']:.6f}s"
+            )
+        if result["connections_opened"] > old["connections_opened"]:
+            regressions.append(
+                f"{label}: connections opened {old['connections_opened']} ->"
+                + f" {result['connections_opened']}"
+            )
+    return regressions
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--aliases",
+        default="1,10,100,1000",
+        help="Comma-separated database alias counts to benchmark.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds each fake server takes to report its version.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--compare", help="Compare against results in this JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio that counts as a regression when comparing.",
+    )
+    args = parser.parse_args(argv)
+
+    if not settings.configured:
+        settings.configure(
+            DATABASES=build_databases(1, 0.0),
+            INSTALLED_APPS=["django_version_checks"],
+        )
+        django.setup()
+
+    results = run_benchmarks(
+        aliases=[int(n) for n in args.aliases.split(",")],
+        latency=args.latency,
+        repeat=args.repeat,
+        workers=args.workers,
+    )
+    for result in results:
+        print(
+            "{check:>10} aliases={aliases:<5} config={config:<9}"
+            " min={wall_time_min:.6f}s median={wall_time_median:.6f}s"
+            " opened={connections_opened:<5} blocks={allocated_blocks}".format(**result)
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(
+                {
+                    "commit": get_commit(),
+                    "python": platform.python_version(),
+                    "django": django.__version__,
+                    "results": results,
+                },
+                output_file,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import time
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.utils.functional import cached_property
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    """
+    An SQLite connection that reports itself as MySQL, opening a connection
+    and waiting FAKE_LATENCY seconds to simulate the round trip for its
+    server version.
+    """
+
+    vendor = "mysql"
+    display_name = "Fake MySQL"
+
+    @cached_property
+    def mysql_version(self) -> tuple[int, ...]:
+        with self.temporary_connection():
+            pass
+        time.sleep(self.settings_dict.get("FAKE_LATENCY", 0.0))
+        version: tuple[int, ...] = self.settings_dict.get("FAKE_VERSION", (8, 0, 36))
+        return version
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import time
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.utils.functional import cached_property
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    """
+    An SQLite connection that reports itself as PostgreSQL, opening a
+    connection and waiting FAKE_LATENCY seconds to simulate the round trip
+    for its server version.
+    """
+
+    vendor = "postgresql"
+    display_name = "Fake PostgreSQL"
+
+    @cached_property
+    def pg_version(self) -> int:
+        with self.temporary_connection():
+            pass
+        time.sleep(self.settings_dict.get("FAKE_LATENCY", 0.0))
+        version: int = self.settings_dict.get("FAKE_VERSION", 16_00_02)
+        return version
@@ -1,9 +1,38 @@
 from __future__ import annotations
 
+from typing import Any
+
 from django.apps import AppConfig
-from django.core.checks import Tags, register
+from django.conf import settings
+from django.core.checks import CheckMessage, Tags, register
+
+from django_version_checks.signals import version_probed
+from django_version_checks.typing import CheckFunc
+
+
+def lazy_check(name: str) -> CheckFunc:
+    """
+    Return a function that runs the named check from the checks module,
+    importing it only then, so processes that never run checks, such as web
+    workers, don't pay to import it and its dependencies.
+    """
+
+    def check(**kwargs: Any) -> list[CheckMessage]:
+        from django_version_checks import checks
+
+        func: CheckFunc = getattr(checks, name)
+        return func(**kwargs)
+
+    check.__module__ = "django_version_checks.checks"
+    check.__name__ = check.__qualname__ = name
+    return check
+
 
-from django_version_checks import checks
+def observe_probe(**kwargs: Any) -> None:
+    # Import metrics on the first probe, rather than at startup.
+    from django_version_checks.metrics import observe_probe
+
+    observe_probe(**kwargs)
 
 
 class DjangoVersionChecksAppConfig(AppConfig):
@@ -11,8 +40,32 @@ class DjangoVersionChecksAppConfig(AppConfig):
     verbose_name = "django-version-checks"
 
     def ready(self) -> None:
-        register(Tags.compatibility)(checks.check_config)
-        register(Tags.compatibility)(checks.check_python_version)
-        register(Tags.database)(checks.check_postgresql_version)
-        register(Tags.database)(checks.check_mysql_version)
-        register(Tags.database)(checks.check_sqlite_version)
+        version_probed.connect(
+            observe_probe, dispatch_uid="django_version_checks.metrics"
+        )
+
+        if getattr(settings, "VERSION_CHECKS_RECHECK_INTERVAL", None) is not None:
+            from django_version_checks.recheck import start_rechecker
+
+            start_rechecker()
+
+        if getattr(settings, "VERSION_CHECKS_PROFILE", False):
+            from django_version_checks.profiling import install_profiler
+
+            install_profiler()
+
+        if getattr(settings, "VERSION_CHECKS_UNIFIED", False):
+            register(Tags.compatibility, Tags.database)(lazy_check("check_versions"))
+            return
+
+        register(Tags.compatibility)(lazy_check("check_config"))
+        register(Tags.compatibility)(lazy_check("check_python_version"))
+        register(Tags.compatibility)(lazy_check("check_python_build"))
+        register(Tags.compatibility)(lazy_check("check_package_versions"))
+        register(Tags.database)(lazy_check("check_postgresql_version"))
+        register(Tags.database)(lazy_check("check_postgresql_settings"))
+        register(Tags.database)(lazy_check("check_mysql_version"))
+        register(Tags.database)(lazy_check("check_mysql_variables"))
+        register(Tags.database)(lazy_check("check_sqlite_version"))
+        register(Tags.database)(lazy_check("check_sqlite_compile_options"))
+        register(Tags.database)(lazy_check("check_version_skew"))
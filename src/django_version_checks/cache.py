@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+from django.conf import settings
+
+if sys.platform == "win32":  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
+from django_version_checks.typing import VersionTuple
+
+DEFAULT_TTL = 3600.0
+
+
+def connection_fingerprint(settings_dict: dict[str, Any]) -> str:
+    """
+    Identify a database server by its connection settings, so that changing
+    any of them invalidates the cached version.
+    """
+    key = json.dumps(
+        [
+            settings_dict.get("ENGINE", ""),
+            settings_dict.get("HOST", ""),
+            str(settings_dict.get("PORT", "")),
+            settings_dict.get("NAME", ""),
+        ]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class VersionCache:
+    def __init__(self, path: str | os.PathLike[str], ttl: float) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+
+    def load_entries(self) -> dict[str, tuple[VersionTuple, str | None]]:
+        """
+        Return the unexpired entries, mapping fingerprints to versions and
+        flavors, or None where no flavor was stored. A missing or unreadable
+        file is treated as empty.
+        """
+        now = time.time()
+        return {
+            fingerprint: (tuple(entry["version"]), entry.get("flavor"))
+            for fingerprint, entry in self._read().items()
+            if now - entry["detected_at"] < self.ttl
+        }
+
+    def store(
+        self,
+        versions: dict[str, VersionTuple],
+        flavors: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Merge the given versions, and any flavors of the same fingerprints,
+        into the file. Writes go to a temporary file that atomically replaces
+        the cache, so concurrent readers never see a partial file. Failure to
+        write is ignored, as the cache is only an optimization.
+        """
+        if not versions:
+            return
+        now = time.time()
+        entries = {
+            fingerprint: entry
+            for fingerprint, entry in self._read().items()
+            if now - entry["detected_at"] < self.ttl
+        }
+        for fingerprint, version in versions.items():
+            entries[fingerprint] = {"version": list(version), "detected_at": now}
+            if flavors and fingerprint in flavors:
+                entries[fingerprint]["flavor"] = flavors[fingerprint]
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as temp_file:
+                    json.dump(entries, temp_file)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            pass
+
+    def lock(self) -> CacheLock:
+        """
+        Return an exclusive lock on the cache, for processes to hold while
+        probing, so that others on the host wait and then read the results
+        rather than probing too.
+        """
+        return CacheLock(self.path.with_name(f"{self.path.name}.lock"))
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            with self.path.open() as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {
+            fingerprint: entry
+            for fingerprint, entry in data.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get("version"), list)
+            and all(isinstance(i, int) for i in entry["version"])
+            and isinstance(entry.get("detected_at"), (int, float))
+            and isinstance(entry.get("flavor", ""), str)
+        }
+
+
+class CacheLock:
+    """
+    An exclusive advisory lock on a file, blocking until acquired. Failure to
+    lock is ignored, as the cache is only an optimization.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock_file: IO[bytes] | None = None
+
+    def acquire(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = self.path.open("ab")
+        except OSError:
+            return
+        try:
+            if sys.platform == "win32":  # pragma: no cover
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except OSError:
+            lock_file.close()
+            return
+        self.lock_file = lock_file
+
+    def release(self) -> None:
+        if self.lock_file is None:
+            return
+        # Closing the file releases the lock.
+        self.lock_file.close()
+        self.lock_file = None
+
+    def __enter__(self) -> CacheLock:
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
+
+
+def get_cache() -> VersionCache | None:
+    path = getattr(settings, "VERSION_CHECKS_CACHE_PATH", None)
+    if not isinstance(path, (str, os.PathLike)):
+        return None
+    ttl: Any = getattr(settings, "VERSION_CHECKS_CACHE_TTL", DEFAULT_TTL)
+    if not isinstance(ttl, (int, float)) or isinstance(ttl, bool) or ttl < 0:
+        ttl = DEFAULT_TTL
+    return VersionCache(path, ttl)
@@ -1,20 +1,56 @@
 from __future__ import annotations
 
+import fnmatch
+import importlib.metadata
+import operator
+import os
+import re
+import shlex
 import sys
-from collections.abc import Callable, Generator
-from functools import wraps
-from typing import Any, cast
+import sysconfig
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Generator, Iterator, Mapping, Sequence
+from functools import cache, wraps
+from types import MappingProxyType
+from typing import Any, Generic, NamedTuple, TypeVar, cast
 
 from django.conf import settings
-from django.core.checks import CheckMessage, Error
+from django.core.checks import CheckMessage, Error, Warning
+from django.core.signals import setting_changed
 from django.db import connections
 from django.db.backends.base.base import BaseDatabaseWrapper
+from django.dispatch import receiver
 from packaging.specifiers import InvalidSpecifier, SpecifierSet
-from packaging.version import Version
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
 
-from django_version_checks.typing import CheckFunc
+from django_version_checks.probing import (
+    PostgresqlSetting,
+    ProbeResult,
+    aget_detected_versions,
+    clear_detected_versions,
+    detect_version,
+    detect_within,
+    format_version,
+    get_detected_versions,
+    get_mysql_variables,
+    get_postgresql_settings,
+    get_probe_timeout,
+    get_sqlite_compile_options,
+    raw_connection,
+    version_detectors,
+)
+from django_version_checks.specifiers import CompiledSpecifierSet, version_matches
+from django_version_checks.timing import (
+    probe_message,
+    timed_check,
+    timing_messages_enabled,
+    vendor_display_name,
+)
+from django_version_checks.typing import CheckFunc, VersionTuple
 
 
+@timed_check
 def check_config(**kwargs: Any) -> list[CheckMessage]:
     errors: list[CheckMessage] = []
 
@@ -29,6 +65,115 @@ def check_config(**kwargs: Any) -> list[CheckMessage]:
                 )
             )
 
+    if settings.is_overridden("VERSION_CHECKS_PROBE_WORKERS"):
+        workers = settings.VERSION_CHECKS_PROBE_WORKERS
+        if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+            errors.append(
+                bad_type_error(
+                    setting="VERSION_CHECKS_PROBE_WORKERS",
+                    name="",
+                    expected="positive int",
+                    value=workers,
+                )
+            )
+
+    if settings.is_overridden("VERSION_CHECKS_CACHE_PATH"):
+        path = settings.VERSION_CHECKS_CACHE_PATH
+        if path is not None and not isinstance(path, (str, os.PathLike)):
+            errors.append(
+                bad_type_error(
+                    setting="VERSION_CHECKS_CACHE_PATH",
+                    name="",
+                    expected="str, Path, or None",
+                    value=path,
+                )
+            )
+
+    if settings.is_overridden("VERSION_CHECKS_CACHE_TTL"):
+        ttl = settings.VERSION_CHECKS_CACHE_TTL
+        if not isinstance(ttl, (int, float)) or isinstance(ttl, bool) or ttl < 0:
+            errors.append(
+                bad_type_error(
+                    setting="VERSION_CHECKS_CACHE_TTL",
+                    name="",
+                    expected="non-negative number",
+                    value=ttl,
+                )
+            )
+
+    if settings.is_overridden("VERSION_CHECKS_TIMING_HOOK"):
+        hook = settings.VERSION_CHECKS_TIMING_HOOK
+        if hook is not None and not isinstance(hook, str) and not callable(hook):
+            errors.append(
+                bad_type_error(
+                    setting="VERSION_CHECKS_TIMING_HOOK",
+                    name="",
+                    expected="callable, import string, or None",
+                    value=hook,
+                )
+            )
+
+    if settings.is_overridden("VERSION_CHECKS_TIMING_MESSAGES"):
+        timing_messages = settings.VERSION_CHECKS_TIMING_MESSAGES
+        if not isinstance(timing_messages, bool):
+            errors.append(
+                bad_type_error(
+                    setting="VERSION_CHECKS_TIMING_MESSAGES",
+                    name="",
+                    expected="bool",
+                    value=timing_messages,
+                )
+            )
+
+    if settings.is_overridden("VERSION_CHECKS_PROFILE"):
+        profile = settings.VERSION_CHECKS_PROFILE
+        if not isinstance(profile, (bool, str, os.PathLike)) and profile is not None:
+            errors.append(
+                bad_type_error(
+                    setting="VERSION_CHECKS_PROFILE",
+                    name="",
+                    expected="bool, str, Path, or None",
+                    value=profile,
+                )
+            )
+
+    for setting in [
+        "VERSION_CHECKS_PROBE_TIMEOUT",
+        "VERSION_CHECKS_PROBE_DEADLINE",
+        "VERSION_CHECKS_RECHECK_INTERVAL",
+    ]:
+        if settings.is_overridden(setting):
+            timeout = getattr(settings, setting)
+            if timeout is not None and (
+                not isinstance(timeout, (int, float))
+                or isinstance(timeout, bool)
+                or timeout <= 0
+            ):
+                errors.append(
+                    bad_type_error(
+                        setting=setting,
+                        name="",
+                        expected="positive number or None",
+                        value=timeout,
+                    )
+                )
+
+    if settings.is_overridden("VERSION_CHECKS_RECHECK_JITTER"):
+        jitter = settings.VERSION_CHECKS_RECHECK_JITTER
+        if (
+            not isinstance(jitter, (int, float))
+            or isinstance(jitter, bool)
+            or not 0 <= jitter < 1
+        ):
+            errors.append(
+                bad_type_error(
+                    setting="VERSION_CHECKS_RECHECK_JITTER",
+                    name="",
+                    expected="number from 0 up to 1",
+                    value=jitter,
+                )
+            )
+
     return errors
 
 
@@ -40,8 +185,14 @@ def get_config() -> dict[str, str | dict[str, str]]:
     return {}
 
 
-def bad_type_error(*, name: str, expected: str, value: object) -> Error:
-    label = "settings.VERSION_CHECKS"
+def bad_type_error(
+    *,
+    setting: str = "VERSION_CHECKS",
+    name: str,
+    expected: str,
+    value: object,
+) -> Error:
+    label = f"settings.{setting}"
     if name:
         label += f"[{name!r}]"
     return Error(
@@ -60,84 +211,602 @@ def bad_specifier_error(*, name: str, value: object) -> Error:
     )
 
 
-def parse_specifier_str(*, name: str) -> Callable[[CheckFunc], CheckFunc]:
-    def decorator(func: CheckFunc) -> CheckFunc:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> list[CheckMessage]:
-            config = get_config()
-            if name not in config:
-                return []
-            specifier = config[name]
-            if not isinstance(specifier, str):
-                return [bad_type_error(name=name, expected="str", value=specifier)]
+def compile_specifier_str(*, name: str, value: object) -> SpecifierSet | Error:
+    if not isinstance(value, str):
+        return bad_type_error(name=name, expected="str", value=value)
 
-            try:
-                specifier_set = SpecifierSet(specifier)
-            except InvalidSpecifier:
-                return [bad_specifier_error(name=name, value=specifier)]
+    try:
+        return SpecifierSet(value)
+    except InvalidSpecifier:
+        return bad_specifier_error(name=name, value=value)
 
-            return func(specifier_set, *args, **kwargs)
 
-        return cast(CheckFunc, wrapper)
+def compile_specifier_dict(
+    *, name: str, value: object
+) -> Mapping[str, SpecifierSet] | Error:
+    if not (
+        isinstance(value, dict)
+        and all(isinstance(k, str) for k in value)
+        and all(isinstance(s, str) for s in value.values())
+    ):
+        return bad_type_error(name=name, expected="dict[str, str]", value=value)
+
+    specifier_dict = {}
+    for key, specifier in value.items():
+        try:
+            specifier_dict[key] = SpecifierSet(specifier)
+        except InvalidSpecifier:
+            return bad_specifier_error(name=name, value=specifier)
+    return MappingProxyType(specifier_dict)
 
-    return decorator
 
+T = TypeVar("T")
 
-class AnyDict(dict[str, str]):
-    def __init__(self, value: str) -> None:
+
+class AnyDict(dict[str, T]):
+    def __init__(self, value: T) -> None:
         self.value = value
 
-    def __getitem__(self, key: str) -> str:
+    def __getitem__(self, key: str) -> T:
         return self.value
 
 
-def parse_specifier_str_or_dict(*, name: str) -> Callable[[CheckFunc], CheckFunc]:
-    def decorator(func: CheckFunc) -> CheckFunc:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> list[CheckMessage]:
-            config = get_config()
-            if name not in config:
-                return []
-            specifiers = config[name]
-
-            specifier_dict: dict[str, str]
-            if isinstance(specifiers, str):
-                try:
-                    specifier_set = SpecifierSet(specifiers)
-                except InvalidSpecifier:
-                    return [bad_specifier_error(name=name, value=specifiers)]
-                specifier_dict = AnyDict(specifier_set)
+class AliasPatternDict(Mapping[str, T]):
+    """
+    Map database aliases to values, such as specifiers, where keys may be
+    glob patterns like "shard_*". An exact alias takes precedence over
+    patterns, and among patterns, the first declared that matches wins. All
+    patterns are compiled into one regex, and each alias's result is
+    memoized, so lookups cost at most a single match.
+    """
+
+    def __init__(self, value_dict: dict[str, T]) -> None:
+        self.value_dict = value_dict
+        self.exact = {}
+        patterns = []
+        self.pattern_values = []
+        for alias, value in value_dict.items():
+            if is_alias_pattern(alias):
+                patterns.append(alias)
+                self.pattern_values.append(value)
+            else:
+                self.exact[alias] = value
+        # Alternation tries each group in order, so the first declared wins.
+        self.regex = re.compile(
+            "|".join(
+                f"(?P<p{i}>{fnmatch.translate(pattern)})"
+                for i, pattern in enumerate(patterns)
+            )
+        )
+        self.resolved: dict[str, T | None] = {}
+
+    def __getitem__(self, key: str) -> T:
+        try:
+            return self.exact[key]
+        except KeyError:
+            pass
+        try:
+            value = self.resolved[key]
+        except KeyError:
+            value = None
+            if self.pattern_values:
+                match = self.regex.match(key)
+                if match is not None:
+                    value = self.pattern_values[int(cast(str, match.lastgroup)[1:])]
+            self.resolved[key] = value
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.value_dict)
+
+    def __len__(self) -> int:
+        return len(self.value_dict)
+
+
+def is_alias_pattern(alias: str) -> bool:
+    return any(c in alias for c in "*?[")
+
+
+def compile_specifier_str_or_dict(
+    *, name: str, value: object
+) -> Mapping[str, SpecifierSet] | Error:
+    if isinstance(value, str):
+        try:
+            return AnyDict(CompiledSpecifierSet(value))
+        except InvalidSpecifier:
+            return bad_specifier_error(name=name, value=value)
+    elif (
+        isinstance(value, dict)
+        and all(isinstance(a, str) for a in value)
+        and all(isinstance(s, str) for s in value.values())
+    ):
+        specifier_dict = {}
+        for alias, specifier in value.items():
+            try:
+                specifier_dict[alias] = CompiledSpecifierSet(specifier)
+            except InvalidSpecifier:
+                return bad_specifier_error(name=name, value=specifier)
+        return AliasPatternDict(specifier_dict)
+    else:
+        return bad_type_error(
+            name=name,
+            expected="str or dict[str, str]",
+            value=value,
+        )
+
+
+def normalize_compile_option(option: str) -> str:
+    # Names are case-insensitive, and SQLite reports them without the
+    # SQLITE_ prefix of the C macros. Values, like COMPILER=gcc-12, may not
+    # be.
+    name, equals, value = option.partition("=")
+    return name.upper().removeprefix("SQLITE_") + equals + value
+
+
+def compile_options_list_or_dict(
+    *, name: str, value: object
+) -> Mapping[str, frozenset[str]] | Error:
+    def is_option_list(options: object) -> bool:
+        return isinstance(options, list) and all(isinstance(o, str) for o in options)
+
+    if is_option_list(value):
+        return AnyDict(
+            frozenset(normalize_compile_option(o) for o in cast(list[str], value))
+        )
+    elif (
+        isinstance(value, dict)
+        and all(isinstance(a, str) for a in value)
+        and all(is_option_list(o) for o in value.values())
+    ):
+        return AliasPatternDict(
+            {
+                alias: frozenset(normalize_compile_option(o) for o in options)
+                for alias, options in value.items()
+            }
+        )
+    else:
+        return bad_type_error(
+            name=name,
+            expected="list[str] or dict[str, list[str]]",
+            value=value,
+        )
+
+
+# Maps the units that PostgreSQL settings accept to their kind and their
+# multiple of its base unit, bytes or microseconds.
+# See: https://www.postgresql.org/docs/current/config-setting.html#CONFIG-SETTING-NAMES-VALUES  # noqa: E501
+postgresql_units: dict[str, tuple[str, int]] = {
+    "B": ("memory", 1),
+    "kB": ("memory", 1024),
+    "MB": ("memory", 1024**2),
+    "GB": ("memory", 1024**3),
+    "TB": ("memory", 1024**4),
+    "us": ("time", 1),
+    "ms": ("time", 1000),
+    "s": ("time", 1000**2),
+    "min": ("time", 60 * 1000**2),
+    "h": ("time", 60 * 60 * 1000**2),
+    "d": ("time", 24 * 60 * 60 * 1000**2),
+}
+
+postgresql_bools = {
+    "on": "on",
+    "true": "on",
+    "yes": "on",
+    "1": "on",
+    "off": "off",
+    "false": "off",
+    "no": "off",
+    "0": "off",
+}
+
+comparison_operators: dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+postgresql_quantity_re = re.compile(r"(-?\d+(?:\.\d+)?)\s*([a-zA-Z]*)")
+comparison_re = re.compile(r"\s*(>=|<=|==|!=|>|<)\s*(.*?)\s*")
+
+
+def parse_postgresql_quantity(value: str) -> tuple[float, str] | None:
+    """
+    Parse a number with an optional unit, like "128MB", into the number and
+    unit.
+    """
+    match = postgresql_quantity_re.fullmatch(value.strip())
+    if match is None or (match[2] and match[2] not in postgresql_units):
+        return None
+    return float(match[1]), match[2]
+
+
+def postgresql_unit_scale(unit: str | None) -> tuple[str, float]:
+    """
+    Return the kind of a pg_settings unit, and its multiple of the base unit.
+    Units may have a count, like "8kB" for settings in 8kB blocks. Unitless
+    and unknown units are their own kind.
+    """
+    if not unit:
+        return "", 1.0
+    quantity = parse_postgresql_quantity(unit if unit[0].isdigit() else f"1{unit}")
+    if quantity is None:
+        return unit, 1.0
+    number, name = quantity
+    kind, multiplier = postgresql_units[name]
+    return kind, number * multiplier
+
+
+def format_postgresql_setting(setting: PostgresqlSetting) -> str:
+    # Like SHOW, use the largest unit that is exact, such as "128MB" for
+    # 16384 8kB blocks.
+    kind, multiplier = postgresql_unit_scale(setting.unit)
+    if setting.vartype == "integer" and kind in ("memory", "time"):
+        value = int(setting.setting) * int(multiplier)
+        if value > 0:
+            for name, (unit_kind, unit_multiplier) in reversed(
+                postgresql_units.items()
+            ):
+                if unit_kind == kind and value % unit_multiplier == 0:
+                    return f"{value // unit_multiplier}{name}"
+    if setting.unit and not setting.unit[0].isdigit():
+        return f"{setting.setting}{setting.unit}"
+    return setting.setting
+
+
+A = TypeVar("A", bound="SettingAssertion[Any]")
+S = TypeVar("S")
+
+
+class SettingAssertion(ABC, Generic[S]):
+    """
+    An expected value for a database server setting: either a plain value,
+    like "off" or "128MB", or comma-separated comparisons, like
+    ">=128MB,<1GB". Subclasses compare it to their database's settings.
+    """
+
+    __slots__ = ("text", "clauses")
+
+    def __init__(self, text: str, clauses: list[tuple[str, str]]) -> None:
+        self.text = text
+        self.clauses = clauses
+
+    def __str__(self) -> str:
+        return self.text
+
+    def matches(self, setting: S) -> bool:
+        return all(
+            self.clause_matches(setting, comparison, expected)
+            for comparison, expected in self.clauses
+        )
+
+    @abstractmethod
+    def clause_matches(self, setting: S, comparison: str, expected: str) -> bool:
+        """
+        Return whether the setting satisfies one comparison clause.
+        """
+
+    @staticmethod
+    @abstractmethod
+    def parse_quantity(value: str) -> tuple[float, str] | None:
+        """
+        Parse a number with an optional unit, or return None if invalid.
+        """
+
+    @classmethod
+    def compile(cls: type[A], value: object) -> A | None:
+        if isinstance(value, bool):
+            text = "on" if value else "off"
+            return cls(text, [("==", text)])
+        elif isinstance(value, (int, float)):
+            return cls(str(value), [("==", str(value))])
+        elif not isinstance(value, str):
+            return None
+
+        # Only split on commas if the value starts with a comparison, since
+        # plain values like search_path's may contain them.
+        if comparison_re.match(value) is None:
+            return cls(value, [("==", value)])
+        clauses = []
+        for clause in value.split(","):
+            match = comparison_re.fullmatch(clause)
+            if match is None or not match[2]:
+                return None
+            comparison, expected = match[1], match[2]
+            if comparison not in ("==", "!=") and cls.parse_quantity(expected) is None:
+                return None
+            clauses.append((comparison, expected))
+        return cls(value, clauses)
+
+
+class PostgresqlSettingAssertion(SettingAssertion[PostgresqlSetting]):
+    """
+    Numbers are compared in the setting's base unit, with unitless numbers in
+    the setting's own unit, as PostgreSQL reads them.
+    """
+
+    __slots__ = ()
+
+    parse_quantity = staticmethod(parse_postgresql_quantity)
+
+    def clause_matches(
+        self, setting: PostgresqlSetting, comparison: str, expected: str
+    ) -> bool:
+        compare = comparison_operators[comparison]
+        if setting.vartype in ("integer", "real"):
+            quantity = parse_postgresql_quantity(expected)
+            if quantity is None:
+                return False
+            number, unit = quantity
+            kind, multiplier = postgresql_unit_scale(setting.unit)
+            if unit:
+                expected_kind, expected_multiplier = postgresql_units[unit]
+                if expected_kind != kind:
+                    return False
+                number *= expected_multiplier
+            else:
+                number *= multiplier
+            return compare(float(setting.setting) * multiplier, number)
+        elif comparison not in ("==", "!="):
+            return False
+        actual = setting.setting
+        if setting.vartype == "bool":
+            actual = postgresql_bools.get(actual.lower(), actual.lower())
+            expected = postgresql_bools.get(expected.lower(), expected.lower())
+        elif setting.vartype == "enum":
+            actual = actual.lower()
+            expected = expected.lower()
+        return compare(actual, expected)
+
+
+# Maps the size suffixes that MySQL options accept to their multiple of bytes.
+# See: https://dev.mysql.com/doc/refman/en/command-line-options.html
+mysql_units = {
+    "": 1,
+    "K": 1024,
+    "M": 1024**2,
+    "G": 1024**3,
+    "T": 1024**4,
+    "P": 1024**5,
+}
+
+mysql_quantity_re = re.compile(r"(-?\d+(?:\.\d+)?)\s*([a-zA-Z]?)")
+
+mysql_bools = {"true": "on", "false": "off"}
+
+
+def parse_mysql_quantity(value: str) -> tuple[float, str] | None:
+    """
+    Parse a number with an optional size suffix, like "8G", into the number
+    and upper-cased suffix.
+    """
+    match = mysql_quantity_re.fullmatch(value.strip())
+    if match is None or match[2].upper() not in mysql_units:
+        return None
+    return float(match[1]), match[2].upper()
+
+
+class MysqlVariableAssertion(SettingAssertion[str]):
+    """
+    Numbers may have a size suffix, like "8G". Other values are compared
+    case-insensitively, as MariaDB and MySQL read them, with True and False
+    matching ON and OFF.
+    """
+
+    __slots__ = ()
+
+    parse_quantity = staticmethod(parse_mysql_quantity)
+
+    def clause_matches(self, setting: str, comparison: str, expected: str) -> bool:
+        compare = comparison_operators[comparison]
+        quantity = parse_mysql_quantity(expected)
+        actual = parse_mysql_quantity(setting)
+        if quantity is not None and actual is not None and not actual[1]:
+            number, unit = quantity
+            return compare(actual[0], number * mysql_units[unit])
+        elif comparison not in ("==", "!="):
+            return False
+        return compare(
+            mysql_bools.get(setting.lower(), setting.lower()),
+            mysql_bools.get(expected.lower(), expected.lower()),
+        )
+
+
+def compile_setting_assertions(
+    assertion_class: type[A], *, name: str, value: object
+) -> Mapping[str, Mapping[str, A]] | Error:
+    """
+    Compile a dictionary mapping setting names to expected values, for all
+    connections of a vendor, or a dictionary mapping database aliases to
+    such dictionaries.
+    """
+
+    def compile_assertions(assertions: dict[str, object]) -> Mapping[str, A] | Error:
+        compiled = {}
+        for setting_name, expected in assertions.items():
+            assertion = assertion_class.compile(expected)
+            if assertion is None:
+                return bad_type_error(
+                    name=name,
+                    expected="setting value or comparison",
+                    value=expected,
+                )
+            # Setting names are case-insensitive.
+            compiled[setting_name.lower()] = assertion
+        return MappingProxyType(compiled)
+
+    def is_assertion_dict(assertions: object) -> bool:
+        return isinstance(assertions, dict) and all(
+            isinstance(k, str) for k in assertions
+        )
+
+    if (
+        is_assertion_dict(value)
+        and value
+        and all(is_assertion_dict(a) for a in cast(dict[str, object], value).values())
+    ):
+        assertions_dict = {}
+        for alias, assertions in cast(dict[str, dict[str, object]], value).items():
+            compiled = compile_assertions(assertions)
+            if isinstance(compiled, Error):
+                return compiled
+            assertions_dict[alias] = compiled
+        return AliasPatternDict(assertions_dict)
+    elif is_assertion_dict(value) and not any(
+        isinstance(a, dict) for a in cast(dict[str, object], value).values()
+    ):
+        compiled = compile_assertions(cast(dict[str, object], value))
+        if isinstance(compiled, Error):
+            return compiled
+        return AnyDict(compiled)
+    else:
+        return bad_type_error(
+            name=name,
+            expected="dict[str, str] or dict[str, dict[str, str]]",
+            value=value,
+        )
+
+
+def compile_postgresql_settings(
+    *, name: str, value: object
+) -> Mapping[str, Mapping[str, PostgresqlSettingAssertion]] | Error:
+    return compile_setting_assertions(
+        PostgresqlSettingAssertion, name=name, value=value
+    )
+
+
+def compile_mysql_variables(
+    *, name: str, value: object
+) -> Mapping[str, Mapping[str, MysqlVariableAssertion]] | Error:
+    return compile_setting_assertions(MysqlVariableAssertion, name=name, value=value)
+
+
+# Maps each way of comparing versions in a skew group to the number of
+# leading version components compared, or None for all of them.
+version_skew_matches = {"major": 1, "minor": 2, "exact": None}
+
+
+class VersionSkewGroup:
+    """
+    Database aliases, or glob patterns of them, whose servers must all report
+    the same version, up to the given number of components.
+    """
+
+    __slots__ = ("name", "aliases", "match", "components")
+
+    def __init__(self, name: str, aliases: list[str], match: str) -> None:
+        self.name = name
+        self.aliases: Mapping[str, bool] = AliasPatternDict(
+            dict.fromkeys(aliases, True)
+        )
+        self.match = match
+        self.components = version_skew_matches[match]
+
+
+def compile_version_skew(
+    *, name: str, value: object
+) -> Mapping[str, VersionSkewGroup] | Error:
+    def is_alias_list(aliases: object) -> bool:
+        return isinstance(aliases, list) and all(isinstance(a, str) for a in aliases)
+
+    groups = {}
+    if isinstance(value, dict):
+        for group_name, group in value.items():
+            if not isinstance(group_name, str):
+                break
+            if is_alias_list(group):
+                groups[group_name] = VersionSkewGroup(group_name, group, "minor")
             elif (
-                isinstance(specifiers, dict)  # type: ignore [redundant-expr]
-                and all(isinstance(a, str) for a in specifiers)
-                and all(isinstance(s, str) for s in specifiers.values())
+                isinstance(group, dict)
+                and set(group) <= {"aliases", "match"}
+                and is_alias_list(group.get("aliases"))
+                and group.get("match", "minor") in version_skew_matches
             ):
-                specifier_dict = {}
-                for alias, specifier in specifiers.items():
-                    try:
-                        specifier_set = SpecifierSet(specifier)
-                    except InvalidSpecifier:
-                        return [bad_specifier_error(name=name, value=specifier)]
-                    specifier_dict[alias] = specifier_set
+                groups[group_name] = VersionSkewGroup(
+                    group_name, group["aliases"], group.get("match", "minor")
+                )
             else:
-                return [
-                    bad_type_error(
-                        name=name,
-                        expected="str or dict[str, str]",
-                        value=specifiers,
-                    )
-                ]
+                break
+        else:
+            return MappingProxyType(groups)
+
+    return bad_type_error(
+        name=name,
+        expected=(
+            "dict mapping group names to lists of aliases, or to dicts with"
+            + " aliases and match of major, minor, or exact"
+        ),
+        value=value,
+    )
+
+
+# Maps each VERSION_CHECKS key to the function that compiles its value,
+# populated by the parse_* decorators.
+config_compilers: dict[str, Callable[..., object]] = {}
+
+
+@cache
+def get_compiled_config() -> Mapping[str, object]:
+    """
+    Compile every known key of VERSION_CHECKS once, to its specifiers or its
+    configuration Error. The result is reused until the setting changes.
+    """
+    config = get_config()
+    return MappingProxyType(
+        {
+            name: compiler(name=name, value=config[name])
+            for name, compiler in config_compilers.items()
+            if name in config
+        }
+    )
+
 
-            return func(specifier_dict, *args, **kwargs)
+@receiver(setting_changed)
+def clear_compiled_config(*, setting: str, **kwargs: Any) -> None:
+    if setting == "VERSION_CHECKS":
+        get_compiled_config.cache_clear()
+
+
+def parse_config(
+    *, name: str, compiler: Callable[..., object]
+) -> Callable[[CheckFunc], CheckFunc]:
+    config_compilers[name] = compiler
+
+    def decorator(func: CheckFunc) -> CheckFunc:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> list[CheckMessage]:
+            compiled = get_compiled_config().get(name)
+            if compiled is None:
+                return []
+            if isinstance(compiled, Error):
+                return [compiled]
+            return func(compiled, *args, **kwargs)
 
         return cast(CheckFunc, wrapper)
 
     return decorator
 
 
+def parse_specifier_str(*, name: str) -> Callable[[CheckFunc], CheckFunc]:
+    return parse_config(name=name, compiler=compile_specifier_str)
+
+
+def parse_specifier_str_or_dict(*, name: str) -> Callable[[CheckFunc], CheckFunc]:
+    return parse_config(name=name, compiler=compile_specifier_str_or_dict)
+
+
+def parse_specifier_dict(*, name: str) -> Callable[[CheckFunc], CheckFunc]:
+    return parse_config(name=name, compiler=compile_specifier_dict)
+
+
 def db_connections_matching(
-    databases: list[str] | None,
-    vendor: str,
+    databases: Sequence[str] | None,
+    *vendors: str,
 ) -> Generator[tuple[str, BaseDatabaseWrapper]]:
     if databases is None:
         databases_set = set()
@@ -148,28 +817,29 @@ def db_connections_matching(
         if alias not in databases_set:
             continue
         connection = connections[alias]
-        if connection.vendor != vendor:
+        if connection.vendor not in vendors:
             continue
         yield alias, connection
 
 
+python_version = f"{sys.version_info[0]}.{sys.version_info[1]}.{sys.version_info[2]}"
+
+
+@timed_check
 @parse_specifier_str(name="python")
 def check_python_version(
     specifier_set: SpecifierSet, **kwargs: Any
 ) -> list[CheckMessage]:
     errors: list[CheckMessage] = []
 
-    version_string = (
-        f"{sys.version_info[0]}.{sys.version_info[1]}.{sys.version_info[2]}"
-    )
-    current_version = Version(version_string)
+    current_version = Version(python_version)
 
     if current_version not in specifier_set:
         errors.append(
             Error(
                 id="dvc.E003",
                 msg=(
-                    f"The current version of Python ({version_string}) does"
+                    f"The current version of Python ({python_version}) does"
                     + f" not match the specified range ({specifier_set})."
                 ),
             )
@@ -178,74 +848,632 @@ def check_python_version(
     return errors
 
 
-@parse_specifier_str_or_dict(name="postgresql")
-def check_postgresql_version(
-    specifier_dict: dict[str, str],
-    databases: list[str] | None,
-    **kwargs: Any,
+def get_python_build() -> dict[str, bool | None]:
+    """
+    Detect how the running interpreter was built. None means unknown, such as
+    for compiler flags on Windows, where sysconfig doesn't record them.
+    """
+    config_args = sysconfig.get_config_var("CONFIG_ARGS")
+    options = None if config_args is None else shlex.split(config_args)
+    cflags = " ".join(
+        sysconfig.get_config_var(name) or ""
+        for name in ["PY_CFLAGS_NODIST", "PY_LDFLAGS_NODIST"]
+    )
+
+    def enabled(option: str) -> bool | None:
+        if options is None:
+            return None
+        # As in configure, any value but "no" enables the option.
+        return any(
+            arg == option or (arg.startswith(f"{option}=") and arg != f"{option}=no")
+            for arg in options
+        )
+
+    def configured(option: str, flag: str) -> bool | None:
+        if options is None:
+            return None
+        return enabled(option) or flag in cflags
+
+    jit: bool | None
+    sys_jit = getattr(sys, "_jit", None)
+    if sys_jit is not None:
+        jit = sys_jit.is_available()
+    else:
+        jit = enabled("--enable-experimental-jit")
+
+    return {
+        "free_threaded": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+        "jit": jit,
+        "pgo": configured("--enable-optimizations", "-fprofile-use"),
+        "lto": configured("--with-lto", "-flto"),
+        "64bit": sys.maxsize > 2**32,
+        "debug": hasattr(sys, "gettotalrefcount"),
+    }
+
+
+# Computed once, as the interpreter can't change.
+python_build = get_python_build()
+
+
+def compile_python_build(*, name: str, value: object) -> Mapping[str, bool] | Error:
+    if not (
+        isinstance(value, dict)
+        and all(k in python_build for k in value)
+        and all(isinstance(v, bool) for v in value.values())
+    ):
+        return bad_type_error(
+            name=name,
+            expected=f"dict mapping any of {', '.join(python_build)} to bool",
+            value=value,
+        )
+    return MappingProxyType(value.copy())
+
+
+@timed_check
+@parse_config(name="python_build", compiler=compile_python_build)
+def check_python_build(
+    build_dict: Mapping[str, bool], **kwargs: Any
 ) -> list[CheckMessage]:
     errors: list[CheckMessage] = []
-    for alias, connection in db_connections_matching(databases, "postgresql"):
-        try:
-            specifier_set = specifier_dict[alias]
-        except KeyError:
+
+    for name, expected in build_dict.items():
+        actual = python_build[name]
+        if actual is not expected:
+            errors.append(
+                Error(
+                    id="dvc.E009",
+                    msg=(
+                        f"The current Python build property {name}"
+                        + f" ({'unknown' if actual is None else actual}) does"
+                        + f" not match the specified value ({expected})."
+                    ),
+                )
+            )
+
+    return errors
+
+
+@cache
+def get_installed_versions() -> Mapping[str, str]:
+    """
+    Index the installed distributions by normalized name, in a single scan of
+    sys.path, mapping to their version strings. Where a distribution is
+    installed more than once, the first found wins, as for imports.
+    """
+    versions: dict[str, str] = {}
+    for distribution in importlib.metadata.distributions():
+        metadata = distribution.metadata
+        # Broken installs may lack metadata.
+        name = cast("str | None", metadata["Name"])
+        version = cast("str | None", metadata["Version"])
+        if name is None or version is None:
             continue
+        versions.setdefault(canonicalize_name(name), version)
+    return MappingProxyType(versions)
 
-        # See: https://www.postgresql.org/docs/current/libpq-status.html#LIBPQ-PQSERVERVERSION  # noqa: E501
-        pg_version = connection.pg_version  # type: ignore [attr-defined]
-        major = (pg_version // 10_000) % 100
-        if major < 10:
-            minor = (pg_version // 100) % 100
-            patch = pg_version % 100
-            version_string = f"{major}.{minor}.{patch}"
-        else:
-            minor = pg_version % 10_000
-            version_string = f"{major}.{minor}"
-        postgresql_version = Version(version_string)
 
-        if postgresql_version not in specifier_set:
+@timed_check
+@parse_specifier_dict(name="packages")
+def check_package_versions(
+    specifier_dict: Mapping[str, SpecifierSet], **kwargs: Any
+) -> list[CheckMessage]:
+    errors: list[CheckMessage] = []
+    installed_versions = get_installed_versions()
+
+    for package, specifier_set in specifier_dict.items():
+        version_string = installed_versions.get(canonicalize_name(package))
+        if version_string is None:
             errors.append(
                 Error(
-                    id="dvc.E004",
+                    id="dvc.E008",
                     msg=(
-                        f"The current version of PostgreSQL ({version_string})"
-                        + f" for the {alias} database connection does not match"
-                        + f" the specified range ({specifier_set})."
+                        f"The package {package} is not installed, so its version"
+                        + f" cannot match the specified range ({specifier_set})."
                     ),
                 )
             )
+            continue
+
+        try:
+            matched = Version(version_string) in specifier_set
+        except InvalidVersion:
+            matched = False
+        if not matched:
+            errors.append(
+                Error(
+                    id="dvc.E007",
+                    msg=(
+                        f"The current version of {package} ({version_string})"
+                        + " does not match the specified range"
+                        + f" ({specifier_set})."
+                    ),
+                )
+            )
+
+    return errors
+
+
+def postgresql_version_error(
+    alias: str, version: VersionTuple, specifier_set: SpecifierSet
+) -> Error | None:
+    if version_matches(version, specifier_set):
+        return None
+    version_string = format_version(version)
+    return Error(
+        id="dvc.E004",
+        msg=(
+            f"The current version of PostgreSQL ({version_string})"
+            + f" for the {alias} database connection does not match"
+            + f" the specified range ({specifier_set})."
+        ),
+    )
+
+
+def mysql_version_error(
+    alias: str, version: VersionTuple, specifier_set: SpecifierSet
+) -> Error | None:
+    if version_matches(version, specifier_set):
+        return None
+    version_string = format_version(version)
+    return Error(
+        id="dvc.E005",
+        msg=(
+            "The current version of MariaDB/MySQL"
+            + f" ({version_string}) for the {alias} database"
+            + " connection does not match the specified range"
+            + f" ({specifier_set})."
+        ),
+    )
+
+
+def mariadb_version_error(
+    alias: str, version: VersionTuple, specifier_set: SpecifierSet
+) -> Error | None:
+    if version_matches(version, specifier_set):
+        return None
+    version_string = format_version(version)
+    return Error(
+        id="dvc.E005",
+        msg=(
+            f"The current version of MariaDB ({version_string}) for the"
+            + f" {alias} database connection does not match the specified"
+            + f" range ({specifier_set})."
+        ),
+    )
+
+
+def sqlite_version_error(
+    alias: str, version: VersionTuple, specifier_set: SpecifierSet
+) -> Error | None:
+    if version_matches(version, specifier_set):
+        return None
+    version_string = format_version(version)
+    return Error(
+        id="dvc.E006",
+        msg=(
+            f"The current version of SQLite ({version_string})"
+            + f" for the {alias} database connection does not match"
+            + f" the specified range ({specifier_set})."
+        ),
+    )
+
+
+# Maps each database vendor or flavor, which is also its VERSION_CHECKS key,
+# to the function building its out-of-range error.
+database_version_errors: dict[
+    str, Callable[[str, VersionTuple, SpecifierSet], Error | None]
+] = {
+    "postgresql": postgresql_version_error,
+    "mysql": mysql_version_error,
+    "mariadb": mariadb_version_error,
+    "sqlite": sqlite_version_error,
+}
+
+# Maps flavors of a vendor's servers that have their own VERSION_CHECKS key,
+# taking precedence over the vendor's, to their vendor.
+database_flavors = {"mariadb": "mysql"}
+
+# The mysql and mariadb keys are checked together by check_mysql_version(),
+# so register their compilers here rather than with a parse_* decorator.
+config_compilers["mysql"] = compile_specifier_str_or_dict
+config_compilers["mariadb"] = compile_specifier_str_or_dict
+
+
+# Each alias with its connection, and the specifiers from each VERSION_CHECKS
+# key of its vendor and flavors that cover it.
+DatabaseMatch = tuple[str, BaseDatabaseWrapper, Mapping[str, SpecifierSet]]
+
+
+def alias_specifiers(
+    specifier_dicts: Mapping[str, Mapping[str, SpecifierSet]], vendor: str, alias: str
+) -> dict[str, SpecifierSet]:
+    specifiers = {}
+    for key, specifier_dict in specifier_dicts.items():
+        if database_flavors.get(key, key) != vendor:
+            continue
+        try:
+            specifiers[key] = specifier_dict[alias]
+        except KeyError:
+            pass
+    return specifiers
+
+
+def resolve_specifier(
+    specifiers: Mapping[str, SpecifierSet], vendor: str, flavor: str | None
+) -> SpecifierSet | None:
+    if flavor is not None and flavor in specifiers:
+        return specifiers[flavor]
+    return specifiers.get(vendor)
+
+
+def match_database_specifiers(
+    specifier_dicts: Mapping[str, Mapping[str, SpecifierSet]],
+    databases: Sequence[str] | None,
+) -> list[DatabaseMatch]:
+    vendors = {database_flavors.get(key, key) for key in specifier_dicts}
+    matches: list[DatabaseMatch] = []
+    for alias, connection in db_connections_matching(databases, *vendors):
+        specifiers = alias_specifiers(specifier_dicts, connection.vendor, alias)
+        if specifiers:
+            matches.append((alias, connection, specifiers))
+    return matches
+
+
+class DatabaseVersion:
+    """
+    The detected server version of one database connection, compared to its
+    configured specifier.
+    """
 
+    __slots__ = (
+        "alias",
+        "vendor",
+        "flavor",
+        "version",
+        "specifier",
+        "matched",
+        "duration",
+        "source",
+    )
+
+    def __init__(
+        self,
+        *,
+        alias: str,
+        vendor: str,
+        version: VersionTuple | None,
+        specifier: SpecifierSet | None,
+        duration: float,
+        source: str,
+        flavor: str | None = None,
+    ) -> None:
+        self.alias = alias
+        self.vendor = vendor
+        # "mariadb" or "mysql" for MySQL backend connections, where known.
+        self.flavor = flavor
+        # None if detection timed out.
+        self.version = version
+        # None if no specifier applies to the alias.
+        self.specifier = specifier
+        # None if either of the above is None.
+        self.matched: bool | None = None
+        if version is not None and specifier is not None:
+            self.matched = version_matches(version, specifier)
+        self.duration = duration
+        self.source = source
+
+    def __repr__(self) -> str:
+        return (
+            f"<DatabaseVersion alias={self.alias!r} vendor={self.vendor!r}"
+            + f" version={self.version!r} specifier={self.specifier!r}"
+            + f" matched={self.matched!r}>"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DatabaseVersion):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+def build_version_report(
+    matches: Sequence[DatabaseMatch],
+    results: list[ProbeResult],
+) -> list[DatabaseVersion]:
+    # The flavor is only known once detected, so pick the specifier now.
+    return [
+        DatabaseVersion(
+            alias=alias,
+            vendor=connection.vendor,
+            version=result.version,
+            specifier=resolve_specifier(specifiers, connection.vendor, result.flavor),
+            duration=result.duration,
+            source=result.source,
+            flavor=result.flavor,
+        )
+        for (alias, connection, specifiers), result in zip(
+            matches, results, strict=True
+        )
+    ]
+
+
+def version_report_matches(
+    databases: Sequence[str] | None,
+) -> list[DatabaseMatch]:
+    if databases is None:
+        databases = list(connections)
+    _, specifier_dicts = compiled_database_specifiers()
+    return [
+        (alias, connection, alias_specifiers(specifier_dicts, connection.vendor, alias))
+        for alias, connection in db_connections_matching(
+            databases, *database_version_errors
+        )
+    ]
+
+
+def get_version_report(
+    databases: Sequence[str] | None = None, *, refresh: bool = False
+) -> list[DatabaseVersion]:
+    """
+    Return the detected server version of every PostgreSQL, MySQL, and SQLite
+    database connection, in DATABASES order, along with whether it matches the
+    VERSION_CHECKS setting. Pass databases to limit the aliases, which
+    otherwise default to all. Versions are detected once per process, and
+    shared with the checks, unless refresh is True.
+    """
+    if refresh:
+        clear_detected_versions()
+    matches = version_report_matches(databases)
+    results = get_detected_versions(
+        [connection for _, connection, _ in matches], detect_version
+    )
+    return build_version_report(matches, results)
+
+
+def lookup_specifier(
+    specifier_dicts: Mapping[str, Mapping[str, SpecifierSet]],
+    vendor: str,
+    alias: str,
+    flavor: str | None = None,
+) -> SpecifierSet | None:
+    return resolve_specifier(
+        alias_specifiers(specifier_dicts, vendor, alias), vendor, flavor
+    )
+
+
+def database_version_messages(report: list[DatabaseVersion]) -> list[CheckMessage]:
+    errors: list[CheckMessage] = []
+    for entry in report:
+        if entry.version is None:
+            name = vendor_display_name(entry.vendor, entry.flavor)
+            errors.append(
+                Warning(
+                    id="dvc.W001",
+                    msg=(
+                        f"Timed out detecting the version of {name}"
+                        + f" for the {entry.alias} database connection."
+                    ),
+                )
+            )
+            continue
+        if entry.specifier is not None:
+            key = entry.flavor if entry.flavor in database_version_errors else None
+            error = database_version_errors[key or entry.vendor](
+                entry.alias, entry.version, entry.specifier
+            )
+            if error is not None:
+                errors.append(error)
+        if timing_messages_enabled():
+            errors.append(
+                probe_message(
+                    entry.alias,
+                    entry.vendor,
+                    entry.duration,
+                    entry.source,
+                    entry.flavor,
+                )
+            )
     return errors
 
 
-@parse_specifier_str_or_dict(name="mysql")
+def database_version_report(
+    specifier_dicts: Mapping[str, Mapping[str, SpecifierSet]],
+    databases: Sequence[str] | None,
+) -> list[DatabaseVersion]:
+    matches = match_database_specifiers(specifier_dicts, databases)
+    results = get_detected_versions(
+        [connection for _, connection, _ in matches], detect_version_and_settings
+    )
+    return build_version_report(matches, results)
+
+
+def check_database_versions(
+    specifier_dicts: Mapping[str, Mapping[str, SpecifierSet]],
+    databases: Sequence[str] | None,
+) -> list[CheckMessage]:
+    """
+    Check the server versions of all connections, given specifiers per vendor,
+    in a single pass over the database aliases.
+    """
+    return database_version_messages(
+        database_version_report(specifier_dicts, databases)
+    )
+
+
+@timed_check
+@parse_specifier_str_or_dict(name="postgresql")
+def check_postgresql_version(
+    specifier_dict: Mapping[str, SpecifierSet],
+    databases: list[str] | None,
+    **kwargs: Any,
+) -> list[CheckMessage]:
+    return check_database_versions({"postgresql": specifier_dict}, databases)
+
+
+@timed_check
 def check_mysql_version(
-    specifier_dict: dict[str, str],
+    *, databases: Sequence[str] | None = None, **kwargs: Any
+) -> list[CheckMessage]:
+    errors, specifier_dicts = compiled_database_specifiers(["mysql", "mariadb"])
+    errors.extend(check_database_versions(specifier_dicts, databases))
+    return errors
+
+
+@timed_check
+@parse_specifier_str_or_dict(name="sqlite")
+def check_sqlite_version(
+    specifier_dict: Mapping[str, SpecifierSet],
+    databases: list[str] | None,
+    **kwargs: Any,
+) -> list[CheckMessage]:
+    return check_database_versions({"sqlite": specifier_dict}, databases)
+
+
+@timed_check
+@parse_config(name="sqlite_compile_options", compiler=compile_options_list_or_dict)
+def check_sqlite_compile_options(
+    options_dict: Mapping[str, frozenset[str]],
     databases: list[str] | None,
     **kwargs: Any,
 ) -> list[CheckMessage]:
     errors: list[CheckMessage] = []
-    for alias, connection in db_connections_matching(databases, "mysql"):
+
+    for alias, connection in db_connections_matching(databases, "sqlite"):
         try:
-            specifier_set = specifier_dict[alias]
+            required_options = options_dict[alias]
         except KeyError:
             continue
+        compile_options = get_sqlite_compile_options(connection)
+        # Options without a value, like "THREADSAFE", match any value.
+        compile_options |= {o.partition("=")[0] for o in compile_options}
+        missing_options = sorted(required_options - compile_options)
+        if missing_options:
+            errors.append(
+                Error(
+                    id="dvc.E010",
+                    msg=(
+                        f"The SQLite library for the {alias} database connection"
+                        + " was not compiled with the required options:"
+                        + f" {', '.join(missing_options)}."
+                    ),
+                )
+            )
+
+    return errors
+
+
+class SettingGetter(NamedTuple):
+    # The VERSION_CHECKS key asserting the settings, the connection attribute
+    # caching them, and the function fetching them.
+    key: str
+    cache: str
+    get: Callable[[BaseDatabaseWrapper, list[str]], Mapping[str, object]]
+
+
+# Maps each database vendor to how to fetch its asserted server settings.
+setting_getters: dict[str, SettingGetter] = {
+    "postgresql": SettingGetter(
+        "postgresql_settings", "pg_settings", get_postgresql_settings
+    ),
+    "mysql": SettingGetter("mysql_variables", "mysql_variables", get_mysql_variables),
+}
+
+
+def asserted_setting_names(connection: BaseDatabaseWrapper) -> list[str]:
+    try:
+        getter = setting_getters[connection.vendor]
+    except KeyError:
+        return []
+    assertions_dict = get_compiled_config().get(getter.key)
+    if not isinstance(assertions_dict, Mapping):
+        return []
+    try:
+        return list(assertions_dict[connection.alias])
+    except KeyError:
+        return []
+
+
+def detect_version_and_settings(connection: BaseDatabaseWrapper) -> VersionTuple:
+    """
+    Detect the server version, also fetching any server settings that
+    VERSION_CHECKS asserts over the same connection, so that checking them
+    needn't connect again.
+    """
+    names = asserted_setting_names(connection)
+    if not names:
+        return detect_version(connection)
+    getter = setting_getters[connection.vendor]
+    cached = connection.__dict__.get(getter.cache, {})
+    if all(name in cached for name in names):
+        return detect_version(connection)
+    with raw_connection(connection):
+        version = detect_version(connection)
+        getter.get(connection, names)
+    return version
 
-        version_string = ".".join(
-            str(i)
-            for i in connection.mysql_version  # type: ignore [attr-defined]
-        )
-        mysql_version = Version(version_string)
 
-        if mysql_version not in specifier_set:
+def check_setting_assertions(
+    assertions_dict: Mapping[str, Mapping[str, SettingAssertion[S]]],
+    databases: Sequence[str] | None,
+    *,
+    vendor: str,
+    versions: Mapping[str, VersionTuple | None] | None,
+    get_settings: Callable[[BaseDatabaseWrapper, list[str]], Mapping[str, S | None]],
+    format_setting: Callable[[S], str],
+    error_id: str,
+    label: str,
+) -> list[CheckMessage]:
+    """
+    Check the asserted server settings of each connection. Pass versions, the
+    detected versions of aliases, to reuse those of an earlier check; others
+    are detected, fetching the settings on the same connection.
+    """
+    matches = []
+    for alias, connection in db_connections_matching(databases, vendor):
+        try:
+            assertions = assertions_dict[alias]
+        except KeyError:
+            continue
+        if assertions:
+            matches.append((alias, connection, assertions))
+    known = {} if versions is None else versions
+    missing = [(alias, c) for alias, c, _ in matches if alias not in known]
+    results = get_detected_versions(
+        [connection for _, connection in missing], detect_version_and_settings
+    )
+    versions = {
+        **known,
+        **{
+            alias: result.version
+            for (alias, _), result in zip(missing, results, strict=True)
+        },
+    }
+    timeout = get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT")
+
+    errors: list[CheckMessage] = []
+    for alias, connection, assertions in matches:
+        # dvc.W001 reports the timeout, so don't connect to the server again.
+        if versions[alias] is None:
+            continue
+        names = list(assertions)
+        server_settings = detect_within(
+            lambda c: get_settings(c, names),  # noqa: B023
+            connection,
+            timeout,
+        )
+        for name, assertion in assertions.items():
+            setting = server_settings[name]
+            if setting is not None and assertion.matches(setting):
+                continue
+            actual = "unknown" if setting is None else format_setting(setting)
             errors.append(
                 Error(
-                    id="dvc.E005",
+                    id=error_id,
                     msg=(
-                        "The current version of MariaDB/MySQL"
-                        + f" ({version_string}) for the {alias} database"
-                        + " connection does not match the specified range"
-                        + f" ({specifier_set})."
+                        f"The {label} {name} ({actual}) for the {alias} database"
+                        + " connection does not match the specified value"
+                        + f" ({assertion})."
                     ),
                 )
             )
@@ -253,26 +1481,168 @@ def check_mysql_version(
     return errors
 
 
-@parse_specifier_str(name="sqlite")
-def check_sqlite_version(
-    specifier_set: SpecifierSet, **kwargs: Any
+@timed_check
+@parse_config(name="postgresql_settings", compiler=compile_postgresql_settings)
+def check_postgresql_settings(
+    assertions_dict: Mapping[str, Mapping[str, PostgresqlSettingAssertion]],
+    databases: list[str] | None,
+    versions: Mapping[str, VersionTuple | None] | None = None,
+    **kwargs: Any,
 ) -> list[CheckMessage]:
-    from sqlite3.dbapi2 import sqlite_version_info
+    return check_setting_assertions(
+        assertions_dict,
+        databases,
+        versions=versions,
+        vendor="postgresql",
+        get_settings=get_postgresql_settings,
+        format_setting=format_postgresql_setting,
+        error_id="dvc.E011",
+        label="PostgreSQL setting",
+    )
 
-    errors: list[CheckMessage] = []
 
-    version_string = ".".join(str(i) for i in sqlite_version_info)
-    sqlite_version = Version(version_string)
+@timed_check
+@parse_config(name="mysql_variables", compiler=compile_mysql_variables)
+def check_mysql_variables(
+    assertions_dict: Mapping[str, Mapping[str, MysqlVariableAssertion]],
+    databases: list[str] | None,
+    versions: Mapping[str, VersionTuple | None] | None = None,
+    **kwargs: Any,
+) -> list[CheckMessage]:
+    return check_setting_assertions(
+        assertions_dict,
+        databases,
+        versions=versions,
+        vendor="mysql",
+        get_settings=get_mysql_variables,
+        format_setting=str,
+        error_id="dvc.E012",
+        label="MariaDB/MySQL variable",
+    )
+
+
+def format_alias_list(aliases: list[str], limit: int = 3) -> str:
+    if len(aliases) <= limit:
+        return ", ".join(aliases)
+    return ", ".join(aliases[:limit]) + f", and {len(aliases) - limit} more"
 
-    if sqlite_version not in specifier_set:
+
+@timed_check
+@parse_config(name="version_skew", compiler=compile_version_skew)
+def check_version_skew(
+    groups: Mapping[str, VersionSkewGroup],
+    databases: list[str] | None,
+    **kwargs: Any,
+) -> list[CheckMessage]:
+    """
+    Check that the connections in each group report the same version,
+    reusing the versions detected for the other database checks.
+    """
+    members = []
+    for alias, connection in db_connections_matching(databases, *version_detectors):
+        alias_groups = [group for group in groups.values() if alias in group.aliases]
+        if alias_groups:
+            members.append((alias, connection, alias_groups))
+    results = get_detected_versions(
+        [connection for _, connection, _ in members], detect_version
+    )
+
+    # Maps group names to their members' distinct versions, each to its
+    # aliases, in DATABASES order.
+    group_versions: dict[str, dict[VersionTuple, list[str]]] = {}
+    for (alias, _, alias_groups), result in zip(members, results, strict=True):
+        if result.version is None:
+            continue
+        for group in alias_groups:
+            version = result.version[: group.components]
+            group_versions.setdefault(group.name, {}).setdefault(version, []).append(
+                alias
+            )
+
+    errors: list[CheckMessage] = []
+    for name, versions in group_versions.items():
+        if len(versions) <= 1:
+            continue
+        group = groups[name]
+        # The most common version first, as likely the intended one.
+        details = ", ".join(
+            f"{format_version(version)} ({format_alias_list(aliases)})"
+            for version, aliases in sorted(
+                versions.items(), key=lambda item: -len(item[1])
+            )
+        )
         errors.append(
             Error(
-                id="dvc.E006",
+                id="dvc.E013",
                 msg=(
-                    f"The current version of SQLite ({version_string}) does"
-                    + f" not match the specified range ({specifier_set})."
+                    f"The database connections in the {name} version skew group"
+                    + " report different"
+                    + ("" if group.match == "exact" else f" {group.match}")
+                    + f" versions: {details}."
                 ),
             )
         )
+    return errors
+
 
+@timed_check
+def check_versions(
+    *, databases: Sequence[str] | None = None, **kwargs: Any
+) -> list[CheckMessage]:
+    """
+    Run all the above checks together, making a single pass over the
+    database connections for every database vendor.
+    """
+    errors = check_config()
+    errors.extend(check_python_version())
+    errors.extend(check_python_build())
+    errors.extend(check_package_versions())
+
+    config_errors, specifier_dicts = compiled_database_specifiers()
+    errors.extend(config_errors)
+    report = database_version_report(specifier_dicts, databases)
+    errors.extend(database_version_messages(report))
+    # Reuse the versions, to skip connections that timed out, and the
+    # settings fetched alongside them.
+    versions = {entry.alias: entry.version for entry in report}
+    errors.extend(check_postgresql_settings(databases=databases, versions=versions))
+    errors.extend(check_mysql_variables(databases=databases, versions=versions))
+    errors.extend(check_version_skew(databases=databases))
+    errors.extend(check_sqlite_compile_options(databases=databases))
+
+    return errors
+
+
+def compiled_database_specifiers(
+    keys: Sequence[str] | None = None,
+) -> tuple[list[CheckMessage], dict[str, Mapping[str, SpecifierSet]]]:
+    errors: list[CheckMessage] = []
+    specifier_dicts = {}
+    compiled_config = get_compiled_config()
+    for vendor in database_version_errors if keys is None else keys:
+        compiled = compiled_config.get(vendor)
+        if isinstance(compiled, Error):
+            errors.append(compiled)
+        elif compiled is not None:
+            specifier_dicts[vendor] = cast(Mapping[str, SpecifierSet], compiled)
+    return errors, specifier_dicts
+
+
+async def acheck_versions(
+    databases: Sequence[str] | None = None,
+) -> list[CheckMessage]:
+    """
+    Check the PostgreSQL, MySQL, and SQLite versions without blocking the
+    event loop, probing all matching connections concurrently. Returns the
+    same messages as check_postgresql_version(), check_mysql_version(), and
+    check_sqlite_version(). Checks every database alias by default.
+    """
+    if databases is None:
+        databases = list(connections)
+    errors, specifier_dicts = compiled_database_specifiers()
+    matches = match_database_specifiers(specifier_dicts, databases)
+    results = await aget_detected_versions(
+        [connection for _, connection, _ in matches], detect_version
+    )
+    errors.extend(database_version_messages(build_version_report(matches, results)))
     return errors
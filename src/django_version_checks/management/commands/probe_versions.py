@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import sys
+from collections.abc import Generator, Iterable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.utils import ConnectionHandler, load_backend
+
+from django_version_checks.checks import (
+    DatabaseVersion,
+    compiled_database_specifiers,
+    lookup_specifier,
+)
+from django_version_checks.probing import (
+    ProbeResult,
+    detect_version,
+    format_version,
+    get_probe_timeout,
+    get_probe_workers,
+    stream_versions,
+    version_detectors,
+)
+
+
+def build_connection(alias: str, settings_dict: dict[str, Any]) -> BaseDatabaseWrapper:
+    """
+    Create a connection from a DATABASES entry, filling in defaults like
+    Django does, without adding it to django.db.connections.
+    """
+    handler = ConnectionHandler({DEFAULT_DB_ALIAS: settings_dict})
+    configured = handler.settings[DEFAULT_DB_ALIAS]
+    backend = load_backend(configured["ENGINE"])
+    connection: BaseDatabaseWrapper = backend.DatabaseWrapper(configured, alias)
+    return connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Probe the server versions of databases listed as JSON lines, each a"
+        + " DATABASES entry with an alias key, streaming a JSON line for each"
+        + " as it finishes."
+    )
+
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default="-",
+            help="File of connection definitions, or - for standard input.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help=(
+                "Databases to probe at once. Defaults to"
+                + " VERSION_CHECKS_PROBE_WORKERS."
+            ),
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            help=(
+                "Seconds to wait for each database. Defaults to"
+                + " VERSION_CHECKS_PROBE_TIMEOUT."
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        workers = options["workers"]
+        if workers is None:
+            workers = get_probe_workers()
+        elif workers < 1:
+            raise CommandError("--workers must be at least 1.")
+        timeout = options["timeout"]
+        if timeout is None:
+            timeout = get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT")
+        elif timeout <= 0:
+            raise CommandError("--timeout must be greater than 0.")
+
+        errors, self.specifier_dicts = compiled_database_specifiers()
+        if errors:
+            raise CommandError("\n".join(str(error.msg) for error in errors))
+
+        if options["path"] == "-":
+            self.probe_lines(sys.stdin, workers, timeout)
+        else:
+            with open(options["path"]) as lines:
+                self.probe_lines(lines, workers, timeout)
+
+    def probe_lines(
+        self, lines: Iterable[str], workers: int, timeout: float | None
+    ) -> None:
+        results = stream_versions(
+            self.parse_lines(lines), detect_version, workers=workers, timeout=timeout
+        )
+        for connection, outcome in results:
+            self.write_line(self.describe(connection, outcome))
+
+    def parse_lines(self, lines: Iterable[str]) -> Generator[BaseDatabaseWrapper]:
+        """
+        Yield a connection for each line, writing an error line in its place
+        for those that can't be probed.
+        """
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            alias = None
+            try:
+                settings_dict = json.loads(line)
+                if not isinstance(settings_dict, dict):
+                    raise ValueError("Expected a JSON object.")
+                alias = settings_dict.pop("alias", None)
+                if not isinstance(alias, str):
+                    raise ValueError("Expected a str alias.")
+                connection = build_connection(alias, settings_dict)
+                if connection.vendor not in version_detectors:
+                    raise ValueError(f"Unsupported vendor {connection.vendor!r}.")
+            except Exception as exc:
+                self.write_line({"line": number, "alias": alias, "error": str(exc)})
+                continue
+            yield connection
+
+    def describe(
+        self,
+        connection: BaseDatabaseWrapper,
+        outcome: ProbeResult | Exception,
+    ) -> dict[str, Any]:
+        if isinstance(outcome, Exception):
+            return {
+                "alias": connection.alias,
+                "vendor": connection.vendor,
+                "error": str(outcome),
+            }
+        entry = DatabaseVersion(
+            alias=connection.alias,
+            vendor=connection.vendor,
+            version=outcome.version,
+            specifier=lookup_specifier(
+                self.specifier_dicts,
+                connection.vendor,
+                connection.alias,
+                outcome.flavor,
+            ),
+            duration=outcome.duration,
+            source=outcome.source,
+            flavor=outcome.flavor,
+        )
+        return {
+            "alias": entry.alias,
+            "vendor": entry.vendor,
+            "flavor": entry.flavor,
+            "version": None if entry.version is None else format_version(entry.version),
+            "specifier": None if entry.specifier is None else str(entry.specifier),
+            "matched": entry.matched,
+            "duration": round(entry.duration, 6),
+            "source": entry.source,
+        }
+
+    def write_line(self, data: dict[str, Any]) -> None:
+        self.stdout.write(json.dumps(data))
+        self.stdout.flush()
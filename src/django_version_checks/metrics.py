@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Collection, Iterable
+from typing import Any, cast
+
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from django_version_checks.cache import get_cache
+from django_version_checks.probing import (
+    ProbeResult,
+    format_version,
+    get_detected_versions_memo,
+    read_cached_versions,
+    version_detectors,
+)
+from django_version_checks.typing import VersionTuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Probe duration histogram buckets, in seconds, as Prometheus client defaults.
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    math.inf,
+)
+
+
+class ProbeMetrics:
+    """
+    Detected database versions and probe statistics, collected from the
+    version_probed signal, so rendering them never touches a database.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        # Latest detected version, by alias.
+        self.versions: dict[str, tuple[str, ProbeResult]] = {}
+        # Probe counts by (vendor, source).
+        self.probes: dict[tuple[str, str], int] = {}
+        # Bucket counts, sum, and count of live probe durations, by vendor.
+        self.durations: dict[str, tuple[list[int], float, int]] = {}
+
+    def observe(
+        self,
+        *,
+        alias: str,
+        vendor: str,
+        version: VersionTuple | None,
+        duration: float,
+        source: str,
+        flavor: str | None = None,
+    ) -> None:
+        with self.lock:
+            key = (vendor, source)
+            self.probes[key] = self.probes.get(key, 0) + 1
+            if version is not None:
+                self.versions[alias] = (
+                    vendor,
+                    ProbeResult(version, duration, source, flavor),
+                )
+            if source != "cache":
+                buckets, total, count = self.durations.get(
+                    vendor, ([0] * len(DURATION_BUCKETS), 0.0, 0)
+                )
+                for i, bound in enumerate(DURATION_BUCKETS):
+                    if duration <= bound:
+                        buckets[i] += 1
+                self.durations[vendor] = (buckets, total + duration, count + 1)
+
+    def render(self) -> str:
+        # Import checks on the first render, rather than with this module,
+        # which URLconfs import at startup.
+        from django_version_checks.checks import (
+            DatabaseVersion,
+            compiled_database_specifiers,
+            lookup_specifier,
+        )
+
+        with self.lock:
+            observed = dict(self.versions)
+            probes = dict(self.probes)
+            durations = {
+                vendor: (list(buckets), total, count)
+                for vendor, (buckets, total, count) in self.durations.items()
+            }
+
+        versions = {**stored_versions(exclude=observed), **observed}
+        _, specifier_dicts = compiled_database_specifiers()
+        lines = [
+            "# HELP django_version_checks_database_version_info Detected database"
+            + " server version, and whether it matches VERSION_CHECKS.",
+            "# TYPE django_version_checks_database_version_info gauge",
+        ]
+        for alias, (vendor, result) in versions.items():
+            version = cast(VersionTuple, result.version)
+            entry = DatabaseVersion(
+                alias=alias,
+                vendor=vendor,
+                version=version,
+                specifier=lookup_specifier(
+                    specifier_dicts, vendor, alias, result.flavor
+                ),
+                duration=result.duration,
+                source=result.source,
+                flavor=result.flavor,
+            )
+            matched = {True: "true", False: "false", None: "unknown"}[entry.matched]
+            lines.append(
+                sample(
+                    "django_version_checks_database_version_info",
+                    {
+                        "alias": alias,
+                        "vendor": vendor,
+                        "version": format_version(version),
+                        "matched": matched,
+                    },
+                    1,
+                )
+            )
+
+        lines += [
+            "# HELP django_version_checks_probes_total Database version probes,"
+            + " by source: live, cache, or timeout.",
+            "# TYPE django_version_checks_probes_total counter",
+        ]
+        for (vendor, source), count in sorted(probes.items()):
+            lines.append(
+                sample(
+                    "django_version_checks_probes_total",
+                    {"vendor": vendor, "source": source},
+                    count,
+                )
+            )
+
+        lines += [
+            "# HELP django_version_checks_probe_duration_seconds Time taken by"
+            + " database version probes that weren't served from the cache.",
+            "# TYPE django_version_checks_probe_duration_seconds histogram",
+        ]
+        for vendor, (buckets, total, count) in sorted(durations.items()):
+            name = "django_version_checks_probe_duration_seconds"
+            for bound, bucket_count in zip(DURATION_BUCKETS, buckets, strict=True):
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(
+                    sample(f"{name}_bucket", {"vendor": vendor, "le": le}, bucket_count)
+                )
+            lines.append(sample(f"{name}_sum", {"vendor": vendor}, total))
+            lines.append(sample(f"{name}_count", {"vendor": vendor}, count))
+
+        return "\n".join(lines) + "\n"
+
+
+def stored_versions(
+    exclude: Collection[str] = (),
+) -> dict[str, tuple[str, ProbeResult]]:
+    """
+    Return the versions of aliases, other than those excluded, that this
+    process memoized, or that any process stored in the version cache. Checks
+    often run in another process, such as a management command, so a web
+    process serving metrics may have observed no probes itself. Neither
+    source connects to a database.
+    """
+    memo = get_detected_versions_memo()
+    versions: dict[str, tuple[str, ProbeResult]] = {}
+    missing = []
+    for alias in connections:
+        if alias in exclude:
+            continue
+        connection = connections[alias]
+        if connection.vendor not in version_detectors:
+            continue
+        result = memo.get(alias)
+        if result is None:
+            missing.append(connection)
+        else:
+            versions[alias] = (connection.vendor, result)
+
+    cache = get_cache()
+    if cache is not None and missing:
+        cached = read_cached_versions(cache, missing)
+        for connection, cached_result in zip(missing, cached, strict=True):
+            if cached_result is not None:
+                versions[connection.alias] = (connection.vendor, cached_result)
+    return versions
+
+
+def sample(name: str, labels: dict[str, str], value: float) -> str:
+    return f"{name}{{{format_labels(labels.items())}}} {value}"
+
+
+def format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels
+    )
+
+
+probe_metrics = ProbeMetrics()
+
+
+def observe_probe(**kwargs: Any) -> None:
+    """
+    Record a version_probed signal, connected when the app is ready.
+    """
+    probe_metrics.observe(
+        alias=kwargs["alias"],
+        vendor=kwargs["vendor"],
+        version=kwargs["version"],
+        duration=kwargs["duration"],
+        source=kwargs["source"],
+        flavor=kwargs.get("flavor"),
+    )
+
+
+def render_metrics() -> str:
+    """
+    Return the current metrics in the Prometheus text exposition format.
+    """
+    return probe_metrics.render()
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Serve the metrics, for a Prometheus server to scrape.
+    """
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
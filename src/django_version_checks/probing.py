@@ -0,0 +1,819 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import queue
+import threading
+import time
+import weakref
+from collections.abc import Callable, Collection, Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, NamedTuple, TypeVar, cast
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.dispatch import receiver
+
+from django_version_checks.cache import VersionCache, connection_fingerprint, get_cache
+from django_version_checks.timing import record_probe
+from django_version_checks.typing import VersionTuple
+
+Detector = Callable[[BaseDatabaseWrapper], VersionTuple]
+
+T = TypeVar("T")
+
+
+def get_probe_workers() -> int:
+    workers: Any = getattr(settings, "VERSION_CHECKS_PROBE_WORKERS", 1)
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+        return 1
+    return workers
+
+
+# Connections that probes leave open once opened, for their owner to reuse
+# and to close, as the rechecker does with its thread's connections.
+reused_connections: weakref.WeakSet[BaseDatabaseWrapper] = weakref.WeakSet()
+
+
+@contextmanager
+def raw_connection(connection: BaseDatabaseWrapper) -> Generator[Any]:
+    """
+    Yield the driver connection, reusing it if already open, or else opening
+    it and closing it afterwards, unless it's in reused_connections.
+    """
+    must_open = connection.connection is None
+    must_close = must_open and connection not in reused_connections
+    try:
+        if must_open:
+            connection.ensure_connection()
+        yield connection.connection
+    finally:
+        if must_close:
+            connection.close()
+
+
+def read_pg_version(connection: BaseDatabaseWrapper) -> int:
+    # Django caches pg_version, so prefer it if already fetched. Otherwise,
+    # read the version that the driver received in the connection handshake,
+    # avoiding Django's cursor creation, and fill Django's cache with it.
+    if "pg_version" not in connection.__dict__:
+        with raw_connection(connection) as raw:
+            server_version = getattr(getattr(raw, "info", None), "server_version", None)
+            if isinstance(server_version, int):
+                connection.__dict__["pg_version"] = server_version
+            # Otherwise, Django's pg_version reuses the open connection.
+            return connection.pg_version  # type: ignore [attr-defined,no-any-return]
+    return connection.pg_version  # type: ignore [attr-defined,no-any-return]
+
+
+def detect_postgresql_version(connection: BaseDatabaseWrapper) -> VersionTuple:
+    pg_version = read_pg_version(connection)
+    # See: https://www.postgresql.org/docs/current/libpq-status.html#LIBPQ-PQSERVERVERSION  # noqa: E501
+    major = (pg_version // 10_000) % 100
+    if major < 10:
+        minor = (pg_version // 100) % 100
+        patch = pg_version % 100
+        return (major, minor, patch)
+    return (major, pg_version % 10_000)
+
+
+def read_mysql_server_info(connection: BaseDatabaseWrapper) -> str | None:
+    # Django's ensure_connection() runs init_connection_state(), which itself
+    # queries the server info, so open the driver connection directly to
+    # read the handshake alone, unless one is already open, or is to be
+    # kept open for reuse.
+    if connection in reused_connections:
+        connection.ensure_connection()
+    raw = connection.connection
+    must_close = raw is None
+    if must_close:
+        raw = connection.get_new_connection(connection.get_connection_params())
+    try:
+        get_server_info = getattr(raw, "get_server_info", None)
+        if get_server_info is None:
+            return None
+        server_info: str = get_server_info()
+    finally:
+        if must_close:
+            raw.close()
+    # Before version 11, MariaDB prefixes its handshake version with 5.5.5-
+    # for compatibility with old MySQL replicas.
+    if server_info.startswith("5.5.5-") and "mariadb" in server_info.lower():
+        server_info = server_info.removeprefix("5.5.5-")
+    return server_info
+
+
+def detect_mysql_version(connection: BaseDatabaseWrapper) -> VersionTuple:
+    # Django derives mysql_version from mysql_server_info, which it fetches
+    # with a query. mysqlclient has the same string from the connection
+    # handshake, so use that to fill Django's cache instead.
+    if (
+        "mysql_version" not in connection.__dict__
+        and "mysql_server_info" not in connection.__dict__
+    ):
+        server_info = read_mysql_server_info(connection)
+        if server_info is not None:
+            connection.__dict__["mysql_server_info"] = server_info
+        # Otherwise, Django's mysql_version queries for it.
+    return tuple(connection.mysql_version)  # type: ignore [attr-defined]
+
+
+def read_sqlite_info(connection: BaseDatabaseWrapper) -> None:
+    # The sqlite3 module's sqlite_version_info describes the library it was
+    # built against, which may differ from the one a backend actually uses,
+    # such as with pysqlite3. Ask the connection instead, fetching the
+    # compile options on the same trip.
+    if "sqlite_version" in connection.__dict__:
+        return
+    with raw_connection(connection) as raw:
+        cursor = raw.cursor()
+        try:
+            cursor.execute("SELECT sqlite_version()")
+            version = cursor.fetchone()[0]
+            cursor.execute("PRAGMA compile_options")
+            compile_options = frozenset(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    connection.__dict__["sqlite_compile_options"] = compile_options
+    connection.__dict__["sqlite_version"] = version
+
+
+def detect_sqlite_version(connection: BaseDatabaseWrapper) -> VersionTuple:
+    read_sqlite_info(connection)
+    return tuple(int(i) for i in connection.__dict__["sqlite_version"].split("."))
+
+
+def get_sqlite_compile_options(connection: BaseDatabaseWrapper) -> frozenset[str]:
+    read_sqlite_info(connection)
+    return connection.__dict__["sqlite_compile_options"]  # type: ignore [no-any-return]
+
+
+class PostgresqlSetting(NamedTuple):
+    # The columns of pg_settings, where setting is in multiples of unit, such
+    # as "16384" and "8kB" for 128MB.
+    setting: str
+    unit: str | None
+    vartype: str
+
+
+def get_postgresql_settings(
+    connection: BaseDatabaseWrapper, names: Collection[str]
+) -> dict[str, PostgresqlSetting | None]:
+    """
+    Return the named server settings, or None for those the server doesn't
+    have. Settings are cached on the connection, and any not yet cached are
+    fetched together in one query.
+    """
+    cached = connection.__dict__.setdefault("pg_settings", {})
+    missing = [name for name in names if name not in cached]
+    if missing:
+        with raw_connection(connection) as raw:
+            cursor = raw.cursor()
+            try:
+                cursor.execute(
+                    "SELECT name, setting, unit, vartype FROM pg_settings"
+                    + " WHERE name = ANY(%s)",
+                    [missing],
+                )
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        found = {row[0]: PostgresqlSetting(*row[1:]) for row in rows}
+        for name in missing:
+            cached[name] = found.get(name)
+    return {name: cached[name] for name in names}
+
+
+def get_mysql_variables(
+    connection: BaseDatabaseWrapper, names: Collection[str]
+) -> dict[str, str | None]:
+    """
+    Return the named server variables, or None for those the server doesn't
+    have. Variables are cached on the connection, and any not yet cached are
+    fetched together in one query.
+    """
+    cached = connection.__dict__.setdefault("mysql_variables", {})
+    missing = [name for name in names if name not in cached]
+    if missing:
+        with raw_connection(connection) as raw:
+            cursor = raw.cursor()
+            try:
+                cursor.execute(
+                    "SHOW VARIABLES WHERE Variable_name IN ("
+                    + ", ".join(["%s"] * len(missing))
+                    + ")",
+                    missing,
+                )
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        found = {name.lower(): value for name, value in rows}
+        for name in missing:
+            cached[name] = found.get(name)
+    return {name: cached[name] for name in names}
+
+
+# Maps each database vendor to the function that detects its server version.
+version_detectors: dict[str, Detector] = {
+    "postgresql": detect_postgresql_version,
+    "mysql": detect_mysql_version,
+    "sqlite": detect_sqlite_version,
+}
+
+
+def detect_version(connection: BaseDatabaseWrapper) -> VersionTuple:
+    return version_detectors[connection.vendor](connection)
+
+
+def format_version(version: VersionTuple) -> str:
+    return ".".join(str(i) for i in version)
+
+
+class ProbeResult(NamedTuple):
+    # None if the probe timed out.
+    version: VersionTuple | None
+    duration: float
+    # "live" if detected from the server, "cache" if read from the cache, or
+    # "timeout" if the probe did not finish in time.
+    source: str
+    # "mariadb" or "mysql" for MySQL backend connections, where known.
+    flavor: str | None = None
+
+
+# Maps each database vendor to its driver's option for bounding the time to
+# connect, in whole seconds.
+connect_timeout_options = {
+    "postgresql": "connect_timeout",
+    "mysql": "connect_timeout",
+}
+
+
+def detect_within(
+    detect: Callable[[BaseDatabaseWrapper], T],
+    connection: BaseDatabaseWrapper,
+    timeout: float | None,
+) -> T:
+    """
+    Detect the version, or fetch anything else from the server, making any
+    new connection with the driver's connect timeout set, so an unreachable
+    server fails rather than blocking for the driver's default timeout.
+    """
+    option = connect_timeout_options.get(connection.vendor)
+    if timeout is None or option is None or connection.connection is not None:
+        return detect(connection)
+
+    probe_connection = connection.copy()
+    probe_connection.settings_dict["OPTIONS"].setdefault(
+        option, max(1, math.ceil(timeout))
+    )
+    # Share what's already cached, and keep what detection caches, so neither
+    # connection needs to fetch it again.
+    for name in version_attributes:
+        if name in connection.__dict__:
+            probe_connection.__dict__[name] = connection.__dict__[name]
+    try:
+        result = detect(probe_connection)
+    finally:
+        probe_connection.close()
+    for name in version_attributes:
+        if name in probe_connection.__dict__:
+            connection.__dict__[name] = probe_connection.__dict__[name]
+    return result
+
+
+def detect_flavor(connection: BaseDatabaseWrapper) -> str | None:
+    """
+    Tell MariaDB from MySQL, which share Django's backend, by the server info
+    that detecting the version cached. None for other vendors, or if unknown.
+    """
+    if connection.vendor != "mysql":
+        return None
+    server_info = connection.__dict__.get("mysql_server_info")
+    if not isinstance(server_info, str):
+        return None
+    return "mariadb" if "mariadb" in server_info.lower() else "mysql"
+
+
+def timed_detect(
+    detect: Detector, connection: BaseDatabaseWrapper, timeout: float | None = None
+) -> ProbeResult:
+    start = time.perf_counter()
+    version = detect_within(detect, connection, timeout)
+    return ProbeResult(
+        version, time.perf_counter() - start, "live", detect_flavor(connection)
+    )
+
+
+def probe_versions(
+    connections: list[BaseDatabaseWrapper],
+    detect: Detector,
+    *,
+    workers: int = 1,
+    timeout: float | None = None,
+    deadline: float | None = None,
+) -> list[ProbeResult]:
+    """
+    Detect the server version of each connection, returned in the same order.
+    With more than one worker, connections are probed concurrently on a
+    thread pool, so that their round trips overlap.
+    """
+    if timeout is not None or deadline is not None:
+        return probe_versions_bounded(
+            connections, detect, workers=workers, timeout=timeout, deadline=deadline
+        )
+
+    if workers <= 1 or len(connections) <= 1:
+        return [timed_detect(detect, connection) for connection in connections]
+
+    def probe(connection: BaseDatabaseWrapper) -> ProbeResult:
+        # Each wrapper is only touched by one worker while the calling thread
+        # waits, so it's safe to lift Django's same-thread restriction.
+        connection.inc_thread_sharing()
+        try:
+            return timed_detect(detect, connection)
+        finally:
+            connection.dec_thread_sharing()
+
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(connections)),
+        thread_name_prefix="django-version-checks",
+    ) as executor:
+        return list(executor.map(probe, connections))
+
+
+def probe_versions_bounded(
+    connections: list[BaseDatabaseWrapper],
+    detect: Detector,
+    *,
+    workers: int,
+    timeout: float | None,
+    deadline: float | None,
+) -> list[ProbeResult]:
+    """
+    Like probe_versions(), but give up on each probe after timeout seconds,
+    and on all probes after deadline seconds, marking them as timed out.
+    """
+    results: list[ProbeResult | None] = [None] * len(connections)
+    for index, _, outcome in schedule_probes(
+        connections, detect, workers=workers, timeout=timeout, deadline=deadline
+    ):
+        if isinstance(outcome, Exception):
+            raise outcome
+        results[index] = outcome
+    return cast(list[ProbeResult], results)
+
+
+def stream_versions(
+    connections: Iterable[BaseDatabaseWrapper],
+    detect: Detector,
+    *,
+    workers: int,
+    timeout: float | None,
+) -> Generator[tuple[BaseDatabaseWrapper, ProbeResult | Exception]]:
+    """
+    Detect the server version of each connection, yielding each with its
+    result, or the exception detection raised, as soon as it finishes. Only
+    as many connections as there are workers are taken from the iterable at
+    once, so memory use doesn't grow with their number.
+    """
+    for _, connection, outcome in schedule_probes(
+        connections, detect, workers=workers, timeout=timeout, deadline=None
+    ):
+        yield connection, outcome
+
+
+def schedule_probes(
+    connections: Iterable[BaseDatabaseWrapper],
+    detect: Detector,
+    *,
+    workers: int,
+    timeout: float | None,
+    deadline: float | None,
+) -> Generator[tuple[int, BaseDatabaseWrapper, ProbeResult | Exception]]:
+    """
+    Detect the server version of each connection, with at most workers
+    probes running at once, yielding each connection's index, the
+    connection, and its result, or the exception detection raised, as soon
+    as it finishes. Probes run on daemon threads, which are abandoned if they
+    take longer than timeout seconds, or run past deadline seconds from the
+    start, so a hung connection attempt can't block the process from
+    exiting. Abandoned probes, and those not started by the deadline, are
+    yielded as timed out. Abandoned threads still count toward workers until
+    they finish, such as when the driver's connect timeout expires.
+    """
+    start = time.perf_counter()
+    deadline_at = None if deadline is None else start + deadline
+    finished: queue.SimpleQueue[tuple[int, ProbeResult | Exception]] = (
+        queue.SimpleQueue()
+    )
+    running: dict[int, tuple[BaseDatabaseWrapper, float]] = {}
+    # Indexes of probes yielded as timed out whose threads are still alive.
+    # They keep their workers, so hung probes can't pile up past workers.
+    abandoned: set[int] = set()
+    pending = enumerate(connections)
+    exhausted = False
+
+    def probe(index: int, connection: BaseDatabaseWrapper) -> None:
+        outcome: ProbeResult | Exception
+        try:
+            outcome = timed_detect(detect, connection, timeout)
+        except Exception as exc:
+            outcome = exc
+        finally:
+            connection.dec_thread_sharing()
+        finished.put((index, outcome))
+
+    while True:
+        now = time.perf_counter()
+        starting = deadline_at is None or now < deadline_at
+        while not exhausted and starting and len(running) + len(abandoned) < workers:
+            item = next(pending, None)
+            if item is None:
+                exhausted = True
+                break
+            index, connection = item
+            connection.inc_thread_sharing()
+            threading.Thread(
+                target=probe,
+                args=(index, connection),
+                name=f"django-version-checks-{connection.alias}",
+                daemon=True,
+            ).start()
+            running[index] = (connection, now)
+        # Otherwise, wait for running probes, or abandoned ones to free their
+        # workers for the pending connections.
+        if not running and (exhausted or not starting):
+            break
+
+        expiries: list[float] = []
+        if timeout is not None:
+            expiries.extend(started + timeout for _, started in running.values())
+        if deadline_at is not None:
+            expiries.append(deadline_at)
+        wait = max(0.0, min(expiries) - now) if expiries else None
+        try:
+            index, outcome = finished.get(timeout=wait)
+        except queue.Empty:
+            now = time.perf_counter()
+            for index, (connection, started) in list(running.items()):
+                if (timeout is not None and now - started >= timeout) or (
+                    deadline_at is not None and now >= deadline_at
+                ):
+                    del running[index]
+                    abandoned.add(index)
+                    yield index, connection, ProbeResult(None, now - started, "timeout")
+        else:
+            if index in running:
+                connection, _ = running.pop(index)
+                yield index, connection, outcome
+            else:
+                # An abandoned probe finished late, after being yielded as
+                # timed out, so ignore its outcome, but free its worker.
+                abandoned.discard(index)
+
+    # Only connections left when the deadline passed remain.
+    for index, connection in pending:
+        yield index, connection, ProbeResult(None, 0.0, "timeout")
+
+
+def get_probe_timeout(name: str) -> float | None:
+    value: Any = getattr(settings, name, None)
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+        return None
+    return value
+
+
+def read_cached_versions(
+    cache: VersionCache, connections: list[BaseDatabaseWrapper]
+) -> list[ProbeResult | None]:
+    """
+    Return the cached version of each connection, or None where missing.
+    """
+    cached = cache.load_entries()
+    results: list[ProbeResult | None] = []
+    for connection in connections:
+        entry = cached.get(connection_fingerprint(connection.settings_dict))
+        if entry is None:
+            results.append(None)
+        else:
+            version, flavor = entry
+            results.append(ProbeResult(version, 0.0, "cache", flavor))
+    return results
+
+
+def store_versions(
+    cache: VersionCache,
+    connections: list[BaseDatabaseWrapper],
+    results: list[ProbeResult],
+) -> None:
+    live = [
+        (connection_fingerprint(connection.settings_dict), result)
+        for connection, result in zip(connections, results, strict=True)
+        if result.source == "live" and result.version is not None
+    ]
+    cache.store(
+        {
+            fingerprint: cast(VersionTuple, result.version)
+            for fingerprint, result in live
+        },
+        flavors={
+            fingerprint: result.flavor
+            for fingerprint, result in live
+            if result.flavor is not None
+        },
+    )
+
+
+def merge_results(
+    results: list[ProbeResult | None], detected: list[ProbeResult]
+) -> list[ProbeResult]:
+    """
+    Fill in the missing results, in order, from the detected ones.
+    """
+    iter_detected = iter(detected)
+    return [next(iter_detected) if r is None else r for r in results]
+
+
+# Connection attributes that Django, or this package, caches from the server.
+version_attributes = [
+    "pg_version",
+    "mysql_server_data",
+    "mysql_server_info",
+    "mysql_version",
+    "mysql_is_mariadb",
+    "display_name",
+    "sqlite_version",
+    "sqlite_compile_options",
+    "pg_settings",
+    "mysql_variables",
+]
+
+
+def refresh_versions(
+    connections: list[BaseDatabaseWrapper], detect: Detector
+) -> list[ProbeResult]:
+    """
+    Probe each connection afresh, bypassing the version cache and versions
+    Django cached on the connections, then update both caches. Overridden
+    versions are still reported as overridden.
+    """
+    overridden = [get_overridden_version(c) for c in connections]
+    connections = [c for c, r in zip(connections, overridden, strict=True) if r is None]
+    for connection in connections:
+        for name in version_attributes:
+            connection.__dict__.pop(name, None)
+    results = probe_versions(
+        connections,
+        detect,
+        workers=get_probe_workers(),
+        timeout=get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT"),
+        deadline=get_probe_timeout("VERSION_CHECKS_PROBE_DEADLINE"),
+    )
+    cache = get_cache()
+    if cache is not None:
+        store_versions(cache, connections, results)
+    memoize_versions([None] * len(connections), connections, results)
+    for connection, result in zip(connections, results, strict=True):
+        record_probe(connection, *result)
+    return merge_results(overridden, results)
+
+
+def get_versions(
+    connections: list[BaseDatabaseWrapper], detect: Detector
+) -> list[ProbeResult]:
+    """
+    Return the server version of each connection, in the same order, reading
+    from the version cache where configured and probing the rest.
+    """
+
+    def probe(connections: list[BaseDatabaseWrapper]) -> list[ProbeResult]:
+        return probe_versions(
+            connections,
+            detect,
+            workers=get_probe_workers(),
+            timeout=get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT"),
+            deadline=get_probe_timeout("VERSION_CHECKS_PROBE_DEADLINE"),
+        )
+
+    cache = get_cache()
+    if cache is None:
+        results = probe(connections)
+    else:
+        cached = read_cached_versions(cache, connections)
+        if None in cached:
+            # Probe under the cache lock, so concurrent processes on the host
+            # wait for one of them to probe, then read its results.
+            with cache.lock():
+                cached = read_cached_versions(cache, connections)
+                missing = [c for c, r in zip(connections, cached) if r is None]
+                results = merge_results(cached, probe(missing))
+                store_versions(cache, connections, results)
+        else:
+            results = cast(list[ProbeResult], cached)
+
+    for connection, result in zip(connections, results, strict=True):
+        record_probe(connection, *result)
+    return results
+
+
+def run_in_daemon_thread(
+    func: Callable[..., ProbeResult], *args: Any
+) -> asyncio.Future[ProbeResult]:
+    """
+    Run func on a new daemon thread, returning a future for its result. Unlike
+    the event loop's default executor, a hung thread doesn't block the
+    process from exiting.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[ProbeResult] = loop.create_future()
+
+    def set_outcome(result: ProbeResult | None, exc: Exception | None) -> None:
+        if future.cancelled():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(cast(ProbeResult, result))
+
+    def run() -> None:
+        result = None
+        exc = None
+        try:
+            result = func(*args)
+        except Exception as error:
+            exc = error
+        try:
+            loop.call_soon_threadsafe(set_outcome, result, exc)
+        except RuntimeError:
+            # The event loop closed while the probe ran.
+            pass
+
+    threading.Thread(target=run, name="django-version-checks", daemon=True).start()
+    return future
+
+
+async def aprobe_versions(
+    connections: list[BaseDatabaseWrapper],
+    detect: Detector,
+    *,
+    timeout: float | None = None,
+    deadline: float | None = None,
+) -> list[ProbeResult]:
+    """
+    Async version of probe_versions(), running every probe concurrently on
+    its own daemon thread. Since all probes start together, the deadline
+    bounds each one like a tighter timeout.
+    """
+    wait = timeout
+    if deadline is not None:
+        wait = deadline if timeout is None else min(timeout, deadline)
+
+    def probe(connection: BaseDatabaseWrapper) -> ProbeResult:
+        try:
+            return timed_detect(detect, connection, timeout)
+        finally:
+            connection.dec_thread_sharing()
+
+    async def aprobe(connection: BaseDatabaseWrapper) -> ProbeResult:
+        start = time.perf_counter()
+        # The wrapper belongs to the event loop's thread, which only waits.
+        connection.inc_thread_sharing()
+        try:
+            return await asyncio.wait_for(run_in_daemon_thread(probe, connection), wait)
+        except asyncio.TimeoutError:
+            return ProbeResult(None, time.perf_counter() - start, "timeout")
+
+    return list(await asyncio.gather(*(aprobe(c) for c in connections)))
+
+
+async def aget_versions(
+    connections: list[BaseDatabaseWrapper], detect: Detector
+) -> list[ProbeResult]:
+    """
+    Async version of get_versions().
+    """
+
+    async def aprobe(connections: list[BaseDatabaseWrapper]) -> list[ProbeResult]:
+        return await aprobe_versions(
+            connections,
+            detect,
+            timeout=get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT"),
+            deadline=get_probe_timeout("VERSION_CHECKS_PROBE_DEADLINE"),
+        )
+
+    cache = get_cache()
+    if cache is None:
+        results = await aprobe(connections)
+    else:
+        cached = read_cached_versions(cache, connections)
+        if None in cached:
+            lock = cache.lock()
+            acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+            try:
+                await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                acquiring.add_done_callback(lambda _: lock.release())
+                raise
+            try:
+                cached = read_cached_versions(cache, connections)
+                missing = [c for c, r in zip(connections, cached) if r is None]
+                results = merge_results(cached, await aprobe(missing))
+                store_versions(cache, connections, results)
+            finally:
+                lock.release()
+        else:
+            results = cast(list[ProbeResult], cached)
+
+    for connection, result in zip(connections, results, strict=True):
+        record_probe(connection, *result)
+    return results
+
+
+# Versions detected by this process, by database alias, so that the checks and
+# version reports share probes. Cleared in forked children, which may connect
+# elsewhere, and when DATABASES changes.
+detected_versions: dict[str, ProbeResult] = {}
+detected_versions_pid = os.getpid()
+
+# Versions reported instead of detecting them, keyed by alias or vendor, as
+# set by django_version_checks.testing.override_detected_versions.
+overridden_versions: dict[str, ProbeResult] = {}
+
+
+def get_overridden_version(connection: BaseDatabaseWrapper) -> ProbeResult | None:
+    """
+    Return the overridden version for the connection's alias, else for its
+    vendor, if any.
+    """
+    if not overridden_versions:
+        return None
+    return overridden_versions.get(connection.alias) or overridden_versions.get(
+        connection.vendor
+    )
+
+
+def clear_detected_versions() -> None:
+    global detected_versions_pid
+    detected_versions.clear()
+    detected_versions_pid = os.getpid()
+
+
+@receiver(setting_changed)
+def clear_detected_versions_on_change(*, setting: str, **kwargs: Any) -> None:
+    if setting == "DATABASES":
+        clear_detected_versions()
+
+
+def get_detected_versions_memo() -> dict[str, ProbeResult]:
+    if detected_versions_pid != os.getpid():
+        clear_detected_versions()
+    return detected_versions
+
+
+def read_detected_versions(
+    connections: list[BaseDatabaseWrapper],
+) -> tuple[list[ProbeResult | None], list[BaseDatabaseWrapper]]:
+    """
+    Return the overridden or memoized result for each connection, or None
+    where missing, along with the connections missing results.
+    """
+    memo = get_detected_versions_memo()
+    results = [get_overridden_version(c) or memo.get(c.alias) for c in connections]
+    missing = [c for c, r in zip(connections, results, strict=True) if r is None]
+    return results, missing
+
+
+def memoize_versions(
+    results: list[ProbeResult | None],
+    connections: list[BaseDatabaseWrapper],
+    detected: list[ProbeResult],
+) -> list[ProbeResult]:
+    memo = get_detected_versions_memo()
+    for connection, result in zip(connections, detected, strict=True):
+        # Retry timed out probes next time.
+        if result.version is not None:
+            memo[connection.alias] = result
+    return merge_results(results, detected)
+
+
+def get_detected_versions(
+    connections: list[BaseDatabaseWrapper], detect: Detector
+) -> list[ProbeResult]:
+    """
+    Memoized version of get_versions(), probing each alias once per process.
+    """
+    results, missing = read_detected_versions(connections)
+    return memoize_versions(results, missing, get_versions(missing, detect))
+
+
+async def aget_detected_versions(
+    connections: list[BaseDatabaseWrapper], detect: Detector
+) -> list[ProbeResult]:
+    """
+    Async version of get_detected_versions().
+    """
+    results, missing = read_detected_versions(connections)
+    return memoize_versions(results, missing, await aget_versions(missing, detect))
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Generator
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.core import checks as django_checks
+from django.core.checks import CheckMessage
+from django.core.checks import registry as registry_module
+from django.core.checks.registry import CheckRegistry
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from django_version_checks.timing import format_duration
+
+
+class CheckProfile(NamedTuple):
+    name: str
+    duration: float
+    queries: int
+    connections_opened: int
+
+
+def check_name(check: Callable[..., Any]) -> str:
+    module = getattr(check, "__module__", None)
+    qualname = getattr(check, "__qualname__", None)
+    if module is None or qualname is None:
+        return repr(check)
+    return f"{module}.{qualname}"
+
+
+class CheckProfiler:
+    """
+    Record the wall time of each wrapped check, along with the queries it
+    runs through Django’s cursors and the database connections it opens.
+    """
+
+    def __init__(self) -> None:
+        self.profiles: list[CheckProfile] = []
+        self.queries = 0
+        self.connections_opened = 0
+
+    def count_query(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def count_connection(self, **kwargs: Any) -> None:
+        self.connections_opened += 1
+
+    def wrap(self, check: Callable[..., Any]) -> Callable[..., Any]:
+        name = check_name(check)
+
+        # wraps() also copies the tags that the registry filters on.
+        @wraps(check)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            queries = self.queries
+            connections_opened = self.connections_opened
+            start = time.perf_counter()
+            try:
+                return check(*args, **kwargs)
+            finally:
+                self.profiles.append(
+                    CheckProfile(
+                        name,
+                        time.perf_counter() - start,
+                        self.queries - queries,
+                        self.connections_opened - connections_opened,
+                    )
+                )
+
+        return wrapper
+
+
+@contextmanager
+def profile_checks(
+    registry: CheckRegistry = registry_module.registry,
+) -> Generator[list[CheckProfile]]:
+    """
+    Profile each check the registry runs within the block, yielding the list
+    that the profiles are appended to.
+    """
+    profiler = CheckProfiler()
+    get_checks = registry.get_checks
+
+    def profiled_get_checks(include_deployment_checks: bool = False) -> list[Any]:
+        return [profiler.wrap(check) for check in get_checks(include_deployment_checks)]
+
+    with ExitStack() as stack:
+        registry.get_checks = profiled_get_checks  # type: ignore[method-assign]
+        stack.callback(vars(registry).pop, "get_checks", None)
+        connection_created.connect(profiler.count_connection, weak=False)
+        stack.callback(connection_created.disconnect, profiler.count_connection)
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profiler.count_query))
+        yield profiler.profiles
+
+
+def get_profile_setting() -> bool | str | os.PathLike[str]:
+    profile = getattr(settings, "VERSION_CHECKS_PROFILE", False)
+    if profile is True or isinstance(profile, (str, os.PathLike)):
+        return profile
+    return False
+
+
+def format_profiles(profiles: list[CheckProfile]) -> str:
+    """
+    Format profiles as a table, slowest check first.
+    """
+    total = sum(profile.duration for profile in profiles)
+    lines = [
+        f"Ran {len(profiles)} system check{'' if len(profiles) == 1 else 's'} in"
+        + f" {format_duration(total)}.",
+        f"{'Duration':>10} {'Queries':>8} {'Connections':>12}  Check",
+    ]
+    for profile in sorted(profiles, key=lambda p: p.duration, reverse=True):
+        lines.append(
+            f"{format_duration(profile.duration):>10} {profile.queries:>8}"
+            + f" {profile.connections_opened:>12}  {profile.name}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def report_profiles(profiles: list[CheckProfile]) -> None:
+    """
+    Write the profiles to standard error, or as JSON to the path in the
+    VERSION_CHECKS_PROFILE setting.
+    """
+    profile = get_profile_setting()
+    if profile is False:
+        return
+    if profile is True:
+        sys.stderr.write(format_profiles(profiles))
+        return
+    ordered = sorted(profiles, key=lambda p: p.duration, reverse=True)
+    with open(profile, "w") as profile_file:
+        json.dump(
+            {
+                "duration": sum(p.duration for p in profiles),
+                "checks": [p._asdict() for p in ordered],
+            },
+            profile_file,
+            indent=2,
+        )
+
+
+def install_profiler() -> None:
+    """
+    Profile every run of the system checks, by replacing run_checks() on
+    Django’s check registry, and where django.core.checks re-exports it.
+    """
+    run_checks = registry_module.registry.run_checks
+    if getattr(run_checks, "profiled", False):
+        return
+
+    @wraps(run_checks)
+    def profiled_run_checks(*args: Any, **kwargs: Any) -> list[CheckMessage]:
+        with profile_checks(registry_module.registry) as profiles:
+            errors = run_checks(*args, **kwargs)
+        report_profiles(profiles)
+        return errors
+
+    profiled_run_checks.profiled = True  # type: ignore[attr-defined]
+    registry_module.registry.run_checks = profiled_run_checks  # type: ignore[method-assign]
+    registry_module.run_checks = profiled_run_checks
+    django_checks.run_checks = profiled_run_checks
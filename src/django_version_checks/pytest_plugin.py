@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Generator, Mapping
+
+import pytest
+
+from django_version_checks.testing import override_detected_versions
+
+
+@pytest.fixture
+def detected_versions() -> Generator[Callable[..., None]]:
+    """
+    Call with the arguments of override_detected_versions() to override
+    versions for the rest of the test.
+    """
+    overrides: list[override_detected_versions] = []
+
+    def override(
+        versions: Mapping[str, str] | None = None, *, python: str | None = None
+    ) -> None:
+        overrider = override_detected_versions(versions, python=python)
+        overrider.enable()
+        overrides.append(overrider)
+
+    yield override
+
+    for overrider in reversed(overrides):
+        overrider.disable()
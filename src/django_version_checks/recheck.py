@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import random
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+from django.conf import settings
+from django.db import connections
+
+from django_version_checks.checks import (
+    DatabaseVersion,
+    build_version_report,
+    version_report_matches,
+)
+from django_version_checks.probing import (
+    detect_version,
+    format_version,
+    get_detected_versions_memo,
+    refresh_versions,
+    reused_connections,
+)
+from django_version_checks.signals import version_drifted
+from django_version_checks.timing import logger
+
+DEFAULT_JITTER = 0.1
+
+# Whether each alias matched its specifier at the last recheck.
+last_matched: dict[str, bool | None] = {}
+
+
+def recheck_versions(
+    databases: Sequence[str] | None = None,
+) -> list[DatabaseVersion]:
+    """
+    Detect the server version of every PostgreSQL, MySQL, and SQLite database
+    connection afresh, and report any that have left their specified range
+    since the last recheck. Call this from a scheduler, or let
+    VERSION_CHECKS_RECHECK_INTERVAL run it on a background thread.
+    """
+    matches = version_report_matches(databases)
+    memo = get_detected_versions_memo()
+    previous = {alias: memo.get(alias) for alias, _, _ in matches}
+    results = refresh_versions(
+        [connection for _, connection, _ in matches], detect_version
+    )
+    report = build_version_report(matches, results)
+
+    for (_, connection, _), entry in zip(matches, report, strict=True):
+        if entry.version is None:
+            continue
+        if entry.matched is False and last_matched.get(entry.alias) is not False:
+            previous_result = previous[entry.alias]
+            previous_version = (
+                None if previous_result is None else previous_result.version
+            )
+            logger.warning(
+                "The %s version of the %s database connection changed from %s to"
+                + " %s, which does not match the specified range (%s).",
+                entry.vendor,
+                entry.alias,
+                "unknown"
+                if previous_version is None
+                else format_version(previous_version),
+                format_version(entry.version),
+                entry.specifier,
+            )
+            version_drifted.send(
+                sender=type(connection),
+                alias=entry.alias,
+                vendor=entry.vendor,
+                version=entry.version,
+                previous_version=previous_version,
+                specifier=entry.specifier,
+            )
+        last_matched[entry.alias] = entry.matched
+    return report
+
+
+class VersionRechecker:
+    """
+    Periodically run recheck_versions() on a daemon thread. The thread uses
+    its own database connections, so it never blocks request threads.
+    """
+
+    def __init__(self, interval: float, jitter: float = DEFAULT_JITTER) -> None:
+        self.interval = interval
+        self.jitter = jitter
+        self.stopped = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            target=self.run, name="django-version-checks-recheck", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def next_delay(self) -> float:
+        # Jitter spreads rechecks from many processes started together.
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def run(self) -> None:
+        try:
+            while not self.stopped.wait(self.next_delay()):
+                self.close_old_connections()
+                try:
+                    recheck_versions()
+                except Exception:
+                    logger.exception("Error rechecking database versions.")
+                self.close_old_connections()
+        finally:
+            connections.close_all()
+
+    def close_old_connections(self) -> None:
+        # Keep this thread's connections open between rechecks, closing them
+        # like Django does around requests: once broken, or older than
+        # CONN_MAX_AGE.
+        for connection in connections.all():
+            reused_connections.add(connection)
+            connection.close_if_unusable_or_obsolete()
+
+
+rechecker: VersionRechecker | None = None
+
+
+def get_recheck_settings() -> tuple[float | None, float]:
+    interval: Any = getattr(settings, "VERSION_CHECKS_RECHECK_INTERVAL", None)
+    if (
+        not isinstance(interval, (int, float))
+        or isinstance(interval, bool)
+        or interval <= 0
+    ):
+        interval = None
+    jitter: Any = getattr(settings, "VERSION_CHECKS_RECHECK_JITTER", DEFAULT_JITTER)
+    if (
+        not isinstance(jitter, (int, float))
+        or isinstance(jitter, bool)
+        or not 0 <= jitter < 1
+    ):
+        jitter = DEFAULT_JITTER
+    return interval, jitter
+
+
+def start_rechecker() -> None:
+    """
+    Start the background rechecker if VERSION_CHECKS_RECHECK_INTERVAL is set.
+    """
+    global rechecker
+    interval, jitter = get_recheck_settings()
+    if interval is None or rechecker is not None:
+        return
+    rechecker = VersionRechecker(interval, jitter)
+    rechecker.start()
+
+
+def stop_rechecker() -> None:
+    global rechecker
+    if rechecker is not None:
+        rechecker.stop()
+        rechecker = None
+
+
+def restart_rechecker_in_child() -> None:
+    """
+    Start a new rechecker in a forked child, if the parent was running one.
+    Threads don't survive fork(), so call this from a pre-forking server's
+    post-fork hook, for workers to recheck too. It isn't called on every
+    fork, to keep threads out of other children, such as multiprocessing
+    workers.
+    """
+    global rechecker
+    if rechecker is not None:
+        rechecker = VersionRechecker(rechecker.interval, rechecker.jitter)
+        rechecker.start()
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from django.dispatch import Signal
+
+# Sent after each check function runs, with the sender being the check
+# function, and arguments name and duration (in seconds).
+check_timed = Signal()
+
+# Sent after each database server version is detected, with the sender being
+# the connection class, and arguments alias, vendor, version, duration (in
+# seconds), and source ("live", "cache", or "timeout").
+version_probed = Signal()
+
+# Sent when a periodic recheck finds a database server version outside its
+# specified range, having been in range, or unknown, before. The sender is the
+# connection class, and arguments are alias, vendor, version, previous_version
+# (None if unknown), and specifier.
+version_drifted = Signal()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from packaging.specifiers import Specifier, SpecifierSet
+from packaging.version import Version
+
+from django_version_checks.probing import format_version
+from django_version_checks.typing import VersionTuple
+
+
+class Interval(NamedTuple):
+    # Bounds are release tuples without trailing zeros, or None if unbounded.
+    lower: VersionTuple | None
+    lower_inclusive: bool
+    upper: VersionTuple | None
+    upper_inclusive: bool
+
+    def contains(self, version: VersionTuple) -> bool:
+        # The version must also be without trailing zeros.
+        below = self.lower is not None and (
+            version < self.lower or (version == self.lower and not self.lower_inclusive)
+        )
+        above = self.upper is not None and (
+            version > self.upper or (version == self.upper and not self.upper_inclusive)
+        )
+        return not (below or above)
+
+
+def strip_zeros(release: VersionTuple) -> VersionTuple:
+    """
+    Drop trailing zeros, as PEP 440 ignores them, so that comparing tuples
+    orders versions like comparing Versions does.
+    """
+    end = len(release)
+    while end and release[end - 1] == 0:
+        end -= 1
+    return release[:end]
+
+
+def prefix_interval(prefix: VersionTuple) -> Interval:
+    # The versions starting with the prefix, such as 1.2 up to 1.3 for 1.2.*.
+    successor = (*prefix[:-1], prefix[-1] + 1)
+    return Interval(strip_zeros(prefix), True, strip_zeros(successor), False)
+
+
+def specifier_intervals(specifier: Specifier) -> list[Interval] | None:
+    """
+    Return the intervals of final release versions that the specifier
+    matches, or None if it needs packaging's rules: for arbitrary equality,
+    or versions with an epoch, pre-, post-, or development release, or local
+    part.
+    """
+    operator = specifier.operator
+    spec = specifier.version
+    wildcard = spec.endswith(".*")
+    version = Version(spec[:-2] if wildcard else spec)
+    if (
+        operator == "==="
+        or version.epoch
+        or version.pre is not None
+        or version.post is not None
+        or version.dev is not None
+        or version.local is not None
+    ):
+        return None
+    release = version.release
+    bound = strip_zeros(release)
+
+    if operator == "==":
+        if wildcard:
+            return [prefix_interval(release)]
+        return [Interval(bound, True, bound, True)]
+    if operator == "!=":
+        if wildcard:
+            matched = prefix_interval(release)
+            return [
+                Interval(None, False, matched.lower, False),
+                Interval(matched.upper, True, None, False),
+            ]
+        return [
+            Interval(None, False, bound, False),
+            Interval(bound, False, None, False),
+        ]
+    if operator == "~=":
+        return intersect(
+            [Interval(bound, True, None, False)], [prefix_interval(release[:-1])]
+        )
+    if operator == ">=":
+        return [Interval(bound, True, None, False)]
+    if operator == ">":
+        return [Interval(bound, False, None, False)]
+    if operator == "<=":
+        return [Interval(None, False, bound, True)]
+    if operator == "<":
+        return [Interval(None, False, bound, False)]
+    return None
+
+
+def intersect_pair(a: Interval, b: Interval) -> Interval | None:
+    lower, lower_inclusive = a.lower, a.lower_inclusive
+    if b.lower is not None and (
+        lower is None or b.lower > lower or (b.lower == lower and not b.lower_inclusive)
+    ):
+        lower, lower_inclusive = b.lower, b.lower_inclusive
+    upper, upper_inclusive = a.upper, a.upper_inclusive
+    if b.upper is not None and (
+        upper is None or b.upper < upper or (b.upper == upper and not b.upper_inclusive)
+    ):
+        upper, upper_inclusive = b.upper, b.upper_inclusive
+    if (
+        lower is not None
+        and upper is not None
+        and (
+            lower > upper
+            or (lower == upper and not (lower_inclusive and upper_inclusive))
+        )
+    ):
+        return None
+    return Interval(lower, lower_inclusive, upper, upper_inclusive)
+
+
+def intersect(a: list[Interval], b: list[Interval]) -> list[Interval]:
+    intersections = (intersect_pair(x, y) for x in a for y in b)
+    return [interval for interval in intersections if interval is not None]
+
+
+def compile_intervals(specifier_set: SpecifierSet) -> list[Interval] | None:
+    """
+    Return the intervals of final release versions that all the specifiers
+    match, or None if any needs packaging's rules.
+    """
+    intervals = [Interval(None, False, None, False)]
+    for specifier in specifier_set:
+        # Before packaging 22, LegacySpecifier may appear too.
+        if specifier.__class__ is not Specifier:
+            return None
+        specifier_ranges = specifier_intervals(specifier)
+        if specifier_ranges is None:
+            return None
+        intervals = intersect(intervals, specifier_ranges)
+    return intervals
+
+
+class CompiledSpecifierSet(SpecifierSet):
+    """
+    A SpecifierSet that also compiles itself to intervals, so that integer
+    version tuples can be tested without building and comparing Versions.
+    """
+
+    __slots__ = ("intervals",)
+
+    def __init__(self, specifiers: str = "", prereleases: bool | None = None) -> None:
+        super().__init__(specifiers, prereleases)
+        self.intervals = compile_intervals(self)
+
+    def __repr__(self) -> str:
+        # Present as the plain SpecifierSet it behaves as.
+        return repr(SpecifierSet(str(self), self._prereleases))
+
+
+def version_matches(version: VersionTuple, specifier_set: SpecifierSet) -> bool:
+    """
+    Return whether the release version is in the specifier set, testing the
+    compiled intervals where possible, else falling back to packaging.
+    """
+    intervals = getattr(specifier_set, "intervals", None)
+    if intervals is None:
+        return Version(format_version(version)) in specifier_set
+    stripped = strip_zeros(version)
+    return any(interval.contains(stripped) for interval in intervals)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+
+from django.test.utils import TestContextDecorator
+from packaging.version import Version
+
+from django_version_checks import checks, probing
+from django_version_checks.probing import ProbeResult
+
+version_re = re.compile(r"\d+(?:\.\d+)*")
+
+
+def parse_version(version: str) -> ProbeResult:
+    """
+    Parse a version as a server reports it, such as "16.2" or
+    "10.11.6-MariaDB", into the result of probing it.
+    """
+    match = version_re.match(version)
+    if match is None:
+        raise ValueError(f"Invalid version {version!r}")
+    flavor = "mariadb" if "mariadb" in version.lower() else None
+    return ProbeResult(
+        tuple(int(part) for part in match[0].split(".")), 0.0, "override", flavor
+    )
+
+
+class override_detected_versions(TestContextDecorator):
+    """
+    Report the given versions instead of detecting them, so that checks
+    touch no database connections. Keys are database aliases, or vendors to
+    cover every alias of that vendor, and values are versions like "16.2" or
+    "10.11.6-MariaDB". The Python version may be overridden too.
+
+    Use as a context manager, or to decorate a test function or TestCase
+    class, like Django's override_settings.
+    """
+
+    def __init__(
+        self,
+        versions: Mapping[str, str] | None = None,
+        *,
+        python: str | None = None,
+    ) -> None:
+        self.versions = {
+            key: parse_version(version) for key, version in (versions or {}).items()
+        }
+        if python is not None:
+            Version(python)
+        self.python = python
+        super().__init__()
+
+    def enable(self) -> None:
+        self.old_versions = probing.overridden_versions.copy()
+        self.old_python = checks.python_version
+        probing.overridden_versions.update(self.versions)
+        if self.python is not None:
+            checks.python_version = self.python
+
+    def disable(self) -> None:
+        probing.overridden_versions.clear()
+        probing.overridden_versions.update(self.old_versions)
+        checks.python_version = self.old_python
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, cast
+
+from django.conf import settings
+from django.core.checks import CheckMessage, Debug
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.utils.module_loading import import_string
+
+from django_version_checks.signals import check_timed, version_probed
+from django_version_checks.typing import CheckFunc, VersionTuple
+
+logger = logging.getLogger("django_version_checks")
+
+
+def get_timing_hook() -> Callable[..., object] | None:
+    hook = getattr(settings, "VERSION_CHECKS_TIMING_HOOK", None)
+    if isinstance(hook, str):
+        hook = import_string(hook)
+    if not callable(hook):
+        return None
+    return cast(Callable[..., object], hook)
+
+
+def timing_messages_enabled() -> bool:
+    return getattr(settings, "VERSION_CHECKS_TIMING_MESSAGES", False) is True
+
+
+def format_duration(duration: float) -> str:
+    return f"{duration * 1000:.1f}ms"
+
+
+def record_check(func: CheckFunc, duration: float) -> None:
+    name = func.__name__
+    logger.debug("Check %s took %s.", name, format_duration(duration))
+    check_timed.send(sender=func, name=name, duration=duration)
+    hook = get_timing_hook()
+    if hook is not None:
+        hook("check", name=name, duration=duration)
+
+
+def record_probe(
+    connection: BaseDatabaseWrapper,
+    version: VersionTuple | None,
+    duration: float,
+    source: str,
+    flavor: str | None = None,
+) -> None:
+    details = {
+        "alias": connection.alias,
+        "vendor": connection.vendor,
+        "version": version,
+        "duration": duration,
+        "source": source,
+        "flavor": flavor,
+    }
+    if version is None:
+        logger.warning(
+            "Timed out detecting %s version for the %s database connection"
+            + " after %s.",
+            connection.vendor,
+            connection.alias,
+            format_duration(duration),
+        )
+    else:
+        logger.debug(
+            "Detected %s version %s for the %s database connection in %s (%s).",
+            connection.vendor,
+            ".".join(str(i) for i in version),
+            connection.alias,
+            format_duration(duration),
+            source,
+        )
+    version_probed.send(sender=type(connection), **details)
+    hook = get_timing_hook()
+    if hook is not None:
+        hook("probe", **details)
+
+
+# Display names of vendors and flavors, used in messages about connections
+# rather than BaseDatabaseWrapper.display_name, which MySQL's backend looks up
+# with a query.
+vendor_display_names = {
+    "postgresql": "PostgreSQL",
+    "mysql": "MariaDB/MySQL",
+    "mariadb": "MariaDB",
+    "sqlite": "SQLite",
+}
+
+
+def vendor_display_name(vendor: str, flavor: str | None = None) -> str:
+    if flavor == "mysql":
+        return "MySQL"
+    return vendor_display_names.get(flavor or vendor, vendor)
+
+
+def probe_message(
+    alias: str, vendor: str, duration: float, source: str, flavor: str | None = None
+) -> Debug:
+    return Debug(
+        id="dvc.D002",
+        msg=(
+            f"Detected the {vendor_display_name(vendor, flavor)} version for the"
+            + f" {alias} database connection in"
+            + f" {format_duration(duration)} ({source})."
+        ),
+    )
+
+
+# Whether a timed check is running, in this thread or task.
+timing_check: ContextVar[bool] = ContextVar("timing_check", default=False)
+
+
+def timed_check(func: CheckFunc) -> CheckFunc:
+    """
+    Time each run of a check function, reporting to the logger, signal, and
+    hook, and optionally appending a Debug message with the duration. Checks
+    called from within another timed check, such as check_versions(), aren't
+    timed separately, as the outer check's time includes theirs.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> list[CheckMessage]:
+        if timing_check.get():
+            return func(*args, **kwargs)
+        token = timing_check.set(True)
+        start = time.perf_counter()
+        try:
+            messages = func(*args, **kwargs)
+        finally:
+            timing_check.reset(token)
+        duration = time.perf_counter() - start
+        record_check(func, duration)
+        if timing_messages_enabled():
+            messages = [
+                *messages,
+                Debug(
+                    id="dvc.D001",
+                    msg=f"Check {func.__name__} took {format_duration(duration)}.",
+                ),
+            ]
+        return messages
+
+    return cast(CheckFunc, wrapper)
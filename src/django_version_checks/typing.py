@@ -5,3 +5,5 @@ from collections.abc import Callable
 from django.core.checks import CheckMessage
 
 CheckFunc = Callable[..., list[CheckMessage]]
+
+VersionTuple = tuple[int, ...]
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+
+from django_version_checks.probing import clear_detected_versions
+
+pytest_plugins = ["django_version_checks.pytest_plugin"]
+
+
+@pytest.fixture(autouse=True)
+def clear_versions() -> Generator[None]:
+    # Tests fake different versions for the same aliases.
+    clear_detected_versions()
+    yield
+    clear_detected_versions()
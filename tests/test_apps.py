@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from unittest import mock
+
+from django.apps import apps
+from django.core.checks import Tags
+from django.test import SimpleTestCase, override_settings
+
+from django_version_checks import apps as dvc_apps
+from django_version_checks import checks
+
+
+class DjangoVersionChecksAppConfigTests(SimpleTestCase):
+    def run_ready(self) -> list[tuple[tuple[str, ...], str]]:
+        app_config = apps.get_app_config("django_version_checks")
+        with mock.patch("django_version_checks.apps.register") as mock_register:
+            app_config.ready()
+        return [
+            (c.args, c_next.args[0].__name__)
+            for c, c_next in zip(
+                mock_register.call_args_list,
+                mock_register.return_value.call_args_list,
+                strict=True,
+            )
+        ]
+
+    def test_ready(self):
+        registered = self.run_ready()
+
+        assert registered == [
+            ((Tags.compatibility,), "check_config"),
+            ((Tags.compatibility,), "check_python_version"),
+            ((Tags.compatibility,), "check_python_build"),
+            ((Tags.compatibility,), "check_package_versions"),
+            ((Tags.database,), "check_postgresql_version"),
+            ((Tags.database,), "check_postgresql_settings"),
+            ((Tags.database,), "check_mysql_version"),
+            ((Tags.database,), "check_mysql_variables"),
+            ((Tags.database,), "check_sqlite_version"),
+            ((Tags.database,), "check_sqlite_compile_options"),
+            ((Tags.database,), "check_version_skew"),
+        ]
+
+    @override_settings(VERSION_CHECKS_UNIFIED=True)
+    def test_ready_unified(self):
+        registered = self.run_ready()
+
+        assert registered == [
+            ((Tags.compatibility, Tags.database), "check_versions"),
+        ]
+
+    @override_settings(VERSION_CHECKS_RECHECK_INTERVAL=300)
+    def test_ready_recheck(self):
+        with mock.patch(
+            "django_version_checks.recheck.start_rechecker"
+        ) as mock_start_rechecker:
+            self.run_ready()
+
+        mock_start_rechecker.assert_called_once_with()
+
+    @override_settings(VERSION_CHECKS_PROFILE=True)
+    def test_ready_profile(self):
+        with mock.patch(
+            "django_version_checks.profiling.install_profiler"
+        ) as mock_install_profiler:
+            self.run_ready()
+
+        mock_install_profiler.assert_called_once_with()
+
+
+class LazyCheckTests(SimpleTestCase):
+    def test_runs_check(self):
+        check = dvc_apps.lazy_check("check_config")
+
+        with mock.patch.object(
+            checks, "check_config", return_value=[]
+        ) as mock_check_config:
+            errors = check(app_configs=None, databases=None)
+
+        assert errors == []
+        mock_check_config.assert_called_once_with(app_configs=None, databases=None)
+
+    def test_name(self):
+        check = dvc_apps.lazy_check("check_config")
+
+        assert check.__module__ == "django_version_checks.checks"
+        assert check.__qualname__ == "check_config"
+
+
+class ImportTimeTests(SimpleTestCase):
+    # Imported by the checks, and so deferred until they run.
+    deferred_modules = [
+        "django_version_checks.checks",
+        "django_version_checks.metrics",
+        "django_version_checks.probing",
+        "importlib.metadata",
+        "packaging",
+    ]
+
+    def test_startup(self):
+        code = "\n".join(
+            [
+                "import json, sys",
+                "import django, django.apps, django.core.checks",
+                "from django.conf import settings",
+                "settings.configure(INSTALLED_APPS=['django_version_checks'])",
+                "import django_version_checks.apps",
+                "django.setup()",
+                "print(json.dumps(sorted(sys.modules)))",
+            ]
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+
+        modules = json.loads(result.stdout)
+        for name in self.deferred_modules:
+            assert name not in modules
+        # Lines are: "import time: <self us> | <cumulative us> | <module>".
+        self_times = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "django_version_checks" in line:
+                self_us, _, name = line.removeprefix("import time:").split("|")
+                self_times[name.strip()] = int(self_us)
+        assert sorted(self_times) == [
+            "django_version_checks",
+            "django_version_checks.apps",
+            "django_version_checks.signals",
+            "django_version_checks.typing",
+        ]
+        # A generous budget, for slow machines.
+        assert sum(self_times.values()) < 50_000
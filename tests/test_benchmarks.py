@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from benchmarks import bench_checks
+
+
+class RunBenchmarksTests(SimpleTestCase):
+    databases = {"default"}
+
+    def test_results(self):
+        results = bench_checks.run_benchmarks(
+            aliases=[3], latency=0.0, repeat=1, workers=2
+        )
+
+        by_key = {bench_checks.result_key(r): r for r in results}
+        assert len(by_key) == 10
+        assert by_key["postgresql", 3, "single"]["connections_opened"] == 1
+        assert by_key["mysql", 3, "per_alias"]["connections_opened"] == 1
+        assert by_key["sqlite", 3, "single"]["connections_opened"] == 1
+        assert by_key["unified", 3, "single"]["connections_opened"] == 3
+        assert by_key["python", 3, "single"]["connections_opened"] == 0
+        assert all(r["allocated_blocks"] > 0 for r in results)
+
+
+class CompareTests(SimpleTestCase):
+    def result(self, wall_time: float, opened: int = 1) -> dict[str, object]:
+        return {
+            "check": "postgresql",
+            "aliases": 10,
+            "config": "single",
+            "wall_time_min": wall_time,
+            "connections_opened": opened,
+        }
+
+    def test_no_regression(self):
+        assert (
+            bench_checks.compare([self.result(0.01)], [self.result(0.011)], 1.25) == []
+        )
+
+    def test_slower(self):
+        regressions = bench_checks.compare(
+            [self.result(0.01)], [self.result(0.02)], 1.25
+        )
+
+        assert regressions == [
+            "postgresql aliases=10 config=single: wall time 0.010000s -> 0.020000s"
+        ]
+
+    def test_too_fast_to_measure(self):
+        assert (
+            bench_checks.compare([self.result(1e-5)], [self.result(1e-4)], 1.25) == []
+        )
+
+    def test_more_connections(self):
+        regressions = bench_checks.compare(
+            [self.result(0.01)], [self.result(0.01, opened=2)], 1.25
+        )
+
+        assert regressions == [
+            "postgresql aliases=10 config=single: connections opened 1 -> 2"
+        ]
+
+    def test_new_case(self):
+        assert bench_checks.compare([], [self.result(0.01)], 1.25) == []
+
+
+class MainTests(SimpleTestCase):
+    databases = {"default"}
+
+    def test_output_and_compare(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "results.json"
+
+            with redirect_stdout(StringIO()):
+                returncode = bench_checks.main(
+                    ["--aliases", "2", "--repeat", "1", "--output", str(output)]
+                )
+                assert returncode == 0
+                data = json.loads(output.read_text())
+
+                returncode = bench_checks.main(
+                    [
+                        "--aliases",
+                        "2",
+                        "--repeat",
+                        "1",
+                        "--compare",
+                        str(output),
+                        "--threshold",
+                        "1000",
+                    ]
+                )
+
+        assert returncode == 0
+        assert {"commit", "python", "django", "results"} <= set(data)
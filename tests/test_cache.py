@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from django_version_checks import cache
+
+
+class ConnectionFingerprintTests(SimpleTestCase):
+    def test_stable(self):
+        settings_dict = {"ENGINE": "x", "HOST": "db", "PORT": 5432, "NAME": "app"}
+
+        fingerprint = cache.connection_fingerprint(settings_dict)
+
+        assert fingerprint == cache.connection_fingerprint(dict(settings_dict))
+        assert fingerprint == cache.connection_fingerprint(
+            {**settings_dict, "PORT": "5432"}
+        )
+
+    def test_changes_with_host(self):
+        settings_dict = {"ENGINE": "x", "HOST": "db", "PORT": "", "NAME": "app"}
+
+        fingerprint = cache.connection_fingerprint(settings_dict)
+
+        assert fingerprint != cache.connection_fingerprint(
+            {**settings_dict, "HOST": "db2"}
+        )
+
+    def test_ignores_other_keys(self):
+        settings_dict = {"ENGINE": "x", "HOST": "db", "PORT": "", "NAME": "app"}
+
+        fingerprint = cache.connection_fingerprint(settings_dict)
+
+        assert fingerprint == cache.connection_fingerprint(
+            {**settings_dict, "PASSWORD": "hunter2"}
+        )
+
+
+class VersionCacheTests(SimpleTestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "sub" / "versions.json"
+
+    def test_load_missing(self):
+        version_cache = cache.VersionCache(self.path, 60)
+
+        assert version_cache.load_entries() == {}
+
+    def test_store_and_load(self):
+        version_cache = cache.VersionCache(self.path, 60)
+
+        version_cache.store({"abc": (13, 2)})
+
+        assert version_cache.load_entries() == {"abc": ((13, 2), None)}
+        assert [p.name for p in self.path.parent.iterdir()] == ["versions.json"]
+
+    def test_store_and_load_flavors(self):
+        version_cache = cache.VersionCache(self.path, 60)
+
+        version_cache.store(
+            {"abc": (10, 11, 6), "def": (13, 2)}, flavors={"abc": "mariadb"}
+        )
+
+        assert version_cache.load_entries() == {
+            "abc": ((10, 11, 6), "mariadb"),
+            "def": ((13, 2), None),
+        }
+
+    def test_store_merges(self):
+        version_cache = cache.VersionCache(self.path, 60)
+        version_cache.store({"abc": (13, 2)})
+
+        version_cache.store({"def": (10, 5, 8)})
+
+        assert version_cache.load_entries() == {
+            "abc": ((13, 2), None),
+            "def": ((10, 5, 8), None),
+        }
+
+    def test_store_nothing(self):
+        version_cache = cache.VersionCache(self.path, 60)
+
+        version_cache.store({})
+
+        assert not self.path.exists()
+
+    def test_load_expired(self):
+        self.path.parent.mkdir()
+        self.path.write_text(
+            json.dumps(
+                {
+                    "old": {"version": [9, 6], "detected_at": time.time() - 120},
+                    "new": {"version": [13, 2], "detected_at": time.time()},
+                }
+            )
+        )
+        version_cache = cache.VersionCache(self.path, 60)
+
+        assert version_cache.load_entries() == {"new": ((13, 2), None)}
+
+    def test_store_prunes_expired(self):
+        self.path.parent.mkdir()
+        self.path.write_text(
+            json.dumps({"old": {"version": [9, 6], "detected_at": time.time() - 120}})
+        )
+        version_cache = cache.VersionCache(self.path, 60)
+
+        version_cache.store({"new": (13, 2)})
+
+        assert list(json.loads(self.path.read_text())) == ["new"]
+
+    def test_load_corrupt(self):
+        self.path.parent.mkdir()
+        self.path.write_text("{not json")
+        version_cache = cache.VersionCache(self.path, 60)
+
+        assert version_cache.load_entries() == {}
+
+    def test_load_not_dict(self):
+        self.path.parent.mkdir()
+        self.path.write_text("[]")
+        version_cache = cache.VersionCache(self.path, 60)
+
+        assert version_cache.load_entries() == {}
+
+    def test_load_bad_entries(self):
+        self.path.parent.mkdir()
+        self.path.write_text(
+            json.dumps(
+                {
+                    "a": [],
+                    "b": {"version": ["13"], "detected_at": time.time()},
+                    "c": {"version": [13], "detected_at": "now"},
+                }
+            )
+        )
+        version_cache = cache.VersionCache(self.path, 60)
+
+        assert version_cache.load_entries() == {}
+
+    def test_store_unwritable(self):
+        self.path.parent.mkdir()
+        self.path.mkdir()
+        version_cache = cache.VersionCache(self.path, 60)
+
+        version_cache.store({"abc": (13, 2)})
+
+        assert [p.name for p in self.path.parent.iterdir()] == ["versions.json"]
+
+    def test_lock_exclusive(self):
+        version_cache = cache.VersionCache(self.path, 60)
+        acquired = threading.Event()
+
+        def acquire():
+            with version_cache.lock():
+                acquired.set()
+
+        with version_cache.lock():
+            thread = threading.Thread(target=acquire)
+            thread.start()
+            assert not acquired.wait(0.1)
+
+        thread.join(5)
+        assert acquired.is_set()
+        assert self.path.with_name("versions.json.lock").exists()
+
+    def test_lock_unavailable(self):
+        self.path.parent.mkdir()
+        self.path.with_name("versions.json.lock").mkdir()
+        lock = cache.VersionCache(self.path, 60).lock()
+
+        with lock:
+            assert lock.lock_file is None
+
+
+class GetCacheTests(SimpleTestCase):
+    def test_default(self):
+        assert cache.get_cache() is None
+
+    @override_settings(VERSION_CHECKS_CACHE_PATH="/tmp/versions.json")
+    def test_path(self):
+        version_cache = cache.get_cache()
+
+        assert version_cache is not None
+        assert version_cache.path == Path("/tmp/versions.json")
+        assert version_cache.ttl == cache.DEFAULT_TTL
+
+    @override_settings(
+        VERSION_CHECKS_CACHE_PATH=Path("/tmp/versions.json"),
+        VERSION_CHECKS_CACHE_TTL=60,
+    )
+    def test_ttl(self):
+        version_cache = cache.get_cache()
+
+        assert version_cache is not None
+        assert version_cache.ttl == 60
+
+    @override_settings(
+        VERSION_CHECKS_CACHE_PATH="/tmp/versions.json",
+        VERSION_CHECKS_CACHE_TTL=-1,
+    )
+    def test_bad_ttl(self):
+        version_cache = cache.get_cache()
+
+        assert version_cache is not None
+        assert version_cache.ttl == cache.DEFAULT_TTL
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
+import asyncio
+import importlib.metadata
+import sqlite3
+import sys
+import sysconfig
+import threading
+from collections.abc import Generator, Mapping
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Any
 from unittest import mock
 
-from django.db import connection
+import django
+import pytest
+from django.core.checks import CheckMessage
+from django.db import connection, connections
+from django.db.utils import ConnectionHandler
 from django.test import SimpleTestCase, override_settings
+from packaging.specifiers import SpecifierSet
 
-from django_version_checks import checks
+from django_version_checks import checks, probing
 
 
 class CheckConfigTests(SimpleTestCase):
@@ -32,6 +46,146 @@ class CheckConfigTests(SimpleTestCase):
 
         assert errors == []
 
+    @override_settings(VERSION_CHECKS_PROBE_WORKERS=4)
+    def test_success_probe_workers(self):
+        errors = checks.check_config()
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS_PROBE_WORKERS="4")
+    def test_fail_probe_workers_bad_type(self):
+        errors = checks.check_config()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS_PROBE_WORKERS is misconfigured. Expected a"
+            + " positive int but got '4'."
+        )
+
+    @override_settings(VERSION_CHECKS_CACHE_PATH="/tmp/versions.json")
+    def test_success_cache_path(self):
+        errors = checks.check_config()
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS_CACHE_PATH=1)
+    def test_fail_cache_path_bad_type(self):
+        errors = checks.check_config()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS_CACHE_PATH is misconfigured. Expected a"
+            + " str, Path, or None but got 1."
+        )
+
+    @override_settings(VERSION_CHECKS_CACHE_TTL=600)
+    def test_success_cache_ttl(self):
+        errors = checks.check_config()
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS_CACHE_TTL=-1)
+    def test_fail_cache_ttl_negative(self):
+        errors = checks.check_config()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS_CACHE_TTL is misconfigured. Expected a"
+            + " non-negative number but got -1."
+        )
+
+    @override_settings(VERSION_CHECKS_TIMING_HOOK="logging.info")
+    def test_success_timing_hook(self):
+        errors = checks.check_config()
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS_TIMING_HOOK=1)
+    def test_fail_timing_hook_bad_type(self):
+        errors = checks.check_config()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS_TIMING_HOOK is misconfigured. Expected a"
+            + " callable, import string, or None but got 1."
+        )
+
+    @override_settings(VERSION_CHECKS_TIMING_MESSAGES=True)
+    def test_success_timing_messages(self):
+        errors = checks.check_config()
+
+        assert [e.id for e in errors] == ["dvc.D001"]
+
+    @override_settings(VERSION_CHECKS_TIMING_MESSAGES="yes")
+    def test_fail_timing_messages_bad_type(self):
+        errors = checks.check_config()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS_TIMING_MESSAGES is misconfigured. Expected a"
+            + " bool but got 'yes'."
+        )
+
+    @override_settings(VERSION_CHECKS_PROFILE="check-profile.json")
+    def test_success_profile_path(self):
+        errors = checks.check_config()
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS_PROFILE=1)
+    def test_fail_profile_bad_type(self):
+        errors = checks.check_config()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS_PROFILE is misconfigured. Expected a"
+            + " bool, str, Path, or None but got 1."
+        )
+
+    @override_settings(VERSION_CHECKS_PROBE_TIMEOUT=5, VERSION_CHECKS_PROBE_DEADLINE=30)
+    def test_success_probe_timeouts(self):
+        errors = checks.check_config()
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS_PROBE_DEADLINE=0)
+    def test_fail_probe_deadline_bad_value(self):
+        errors = checks.check_config()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS_PROBE_DEADLINE is misconfigured. Expected a"
+            + " positive number or None but got 0."
+        )
+
+    @override_settings(
+        VERSION_CHECKS_RECHECK_INTERVAL=300, VERSION_CHECKS_RECHECK_JITTER=0.25
+    )
+    def test_success_recheck(self):
+        errors = checks.check_config()
+
+        assert errors == []
+
+    @override_settings(
+        VERSION_CHECKS_RECHECK_INTERVAL=-1, VERSION_CHECKS_RECHECK_JITTER=1
+    )
+    def test_fail_recheck_bad_values(self):
+        errors = checks.check_config()
+
+        assert [e.msg for e in errors] == [
+            "settings.VERSION_CHECKS_RECHECK_INTERVAL is misconfigured. Expected a"
+            + " positive number or None but got -1.",
+            "settings.VERSION_CHECKS_RECHECK_JITTER is misconfigured. Expected a"
+            + " number from 0 up to 1 but got 1.",
+        ]
+
 
 class GetConfigTests(SimpleTestCase):
     def test_no_setting(self):
@@ -52,6 +206,97 @@ class GetConfigTests(SimpleTestCase):
         assert config == {}
 
 
+class GetCompiledConfigTests(SimpleTestCase):
+    def test_no_setting(self):
+        config = checks.get_compiled_config()
+
+        assert dict(config) == {}
+
+    @override_settings(VERSION_CHECKS={"python": ">=3", "unknown": "x"})
+    def test_setting(self):
+        config = checks.get_compiled_config()
+
+        assert dict(config) == {"python": SpecifierSet(">=3")}
+
+    @override_settings(VERSION_CHECKS={"python": ">=3"})
+    def test_reused(self):
+        assert checks.get_compiled_config() is checks.get_compiled_config()
+
+    @override_settings(VERSION_CHECKS={"python": "3"})
+    def test_errors_reused(self):
+        errors1 = checks.check_python_version()
+        errors2 = checks.check_python_version()
+
+        assert errors1[0] is errors2[0]
+
+    def test_override_settings_invalidates(self):
+        with override_settings(VERSION_CHECKS={"python": "<1.0"}):
+            assert len(checks.check_python_version()) == 1
+        with override_settings(VERSION_CHECKS={"python": ">=1.0"}):
+            assert checks.check_python_version() == []
+
+    @override_settings(VERSION_CHECKS={"postgresql": {"default": "~=13.1"}})
+    def test_dict_immutable(self):
+        config = checks.get_compiled_config()
+
+        with pytest.raises(TypeError):
+            config["postgresql"]["other"] = SpecifierSet("~=13.1")  # type: ignore [index]
+
+
+class AliasPatternDictTests(SimpleTestCase):
+    def make(self, value: dict[str, str]) -> checks.AliasPatternDict[SpecifierSet]:
+        return checks.AliasPatternDict({k: SpecifierSet(v) for k, v in value.items()})
+
+    def test_exact(self):
+        specifiers = self.make({"default": ">=13"})
+
+        assert specifiers["default"] == SpecifierSet(">=13")
+        with pytest.raises(KeyError):
+            specifiers["other"]
+
+    def test_pattern(self):
+        specifiers = self.make({"shard_*": ">=13", "replica_?": ">=14"})
+
+        assert specifiers["shard_001"] == SpecifierSet(">=13")
+        assert specifiers["replica_1"] == SpecifierSet(">=14")
+        assert "replica_10" not in specifiers
+        assert "default" not in specifiers
+
+    def test_exact_beats_pattern(self):
+        specifiers = self.make({"shard_*": ">=13", "shard_001": ">=14"})
+
+        assert specifiers["shard_001"] == SpecifierSet(">=14")
+        assert specifiers["shard_002"] == SpecifierSet(">=13")
+
+    def test_first_pattern_wins(self):
+        specifiers = self.make({"shard_0*": ">=14", "shard_*": ">=13"})
+
+        assert specifiers["shard_001"] == SpecifierSet(">=14")
+        assert specifiers["shard_101"] == SpecifierSet(">=13")
+
+    def test_case_sensitive(self):
+        specifiers = self.make({"shard_*": ">=13"})
+
+        assert "SHARD_001" not in specifiers
+
+    def test_memoized(self):
+        specifiers = self.make({"shard_*": ">=13"})
+        assert "shard_001" in specifiers
+        assert "other" not in specifiers
+
+        with mock.patch.object(specifiers, "regex") as regex:
+            assert specifiers["shard_001"] == SpecifierSet(">=13")
+            assert "other" not in specifiers
+
+        regex.match.assert_not_called()
+
+    def test_mapping(self):
+        specifiers = self.make({"default": ">=13", "shard_*": ">=14"})
+
+        assert list(specifiers) == ["default", "shard_*"]
+        assert len(specifiers) == 2
+
+
 class CheckPythonVersionTests(SimpleTestCase):
     @override_settings(VERSION_CHECKS={"python": 3})
     def test_fail_bad_type(self):
@@ -97,6 +342,252 @@ class CheckPythonVersionTests(SimpleTestCase):
         assert errors == []
 
 
+class CheckPythonBuildTests(SimpleTestCase):
+    @override_settings(VERSION_CHECKS={"python_build": {"pgo": "yes"}})
+    def test_fail_bad_type(self):
+        errors = checks.check_python_build()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['python_build'] is misconfigured. Expected a"
+            + " dict mapping any of free_threaded, jit, pgo, lto, 64bit, debug to"
+            + " bool but got {'pgo': 'yes'}."
+        )
+
+    @override_settings(VERSION_CHECKS={"python_build": {"fast": True}})
+    def test_fail_unknown_property(self):
+        errors = checks.check_python_build()
+
+        assert [e.id for e in errors] == ["dvc.E001"]
+
+    @override_settings(
+        VERSION_CHECKS={"python_build": {"debug": False, "pgo": True, "lto": True}}
+    )
+    def test_fail_mismatch(self):
+        with mock.patch.dict(
+            checks.python_build, {"debug": True, "pgo": None, "lto": True}
+        ):
+            errors = checks.check_python_build()
+
+        assert [(e.id, e.msg) for e in errors] == [
+            (
+                "dvc.E009",
+                "The current Python build property debug (True) does not match"
+                + " the specified value (False).",
+            ),
+            (
+                "dvc.E009",
+                "The current Python build property pgo (unknown) does not match"
+                + " the specified value (True).",
+            ),
+        ]
+
+    @override_settings(VERSION_CHECKS={"python_build": {"64bit": True}})
+    def test_success(self):
+        with mock.patch.dict(checks.python_build, {"64bit": True}):
+            errors = checks.check_python_build()
+
+        assert errors == []
+
+    def test_success_unspecified(self):
+        errors = checks.check_python_build()
+
+        assert errors == []
+
+
+class GetPythonBuildTests(SimpleTestCase):
+    def get_python_build(
+        self, config_vars: dict[str, object]
+    ) -> dict[str, bool | None]:
+        with (
+            mock.patch.object(sysconfig, "get_config_var", side_effect=config_vars.get),
+            mock.patch.object(sys, "_jit", None, create=True),
+        ):
+            return checks.get_python_build()
+
+    def test_optimized(self):
+        build = self.get_python_build(
+            {
+                "CONFIG_ARGS": "'--enable-optimizations' '--with-lto'",
+                "Py_GIL_DISABLED": 1,
+            }
+        )
+
+        assert build["free_threaded"] is True
+        assert build["pgo"] is True
+        assert build["lto"] is True
+        assert build["jit"] is False
+
+    def test_flags(self):
+        build = self.get_python_build(
+            {
+                "CONFIG_ARGS": "'--enable-experimental-jit'",
+                "PY_CFLAGS_NODIST": "-fprofile-use",
+                "PY_LDFLAGS_NODIST": "-flto=auto",
+            }
+        )
+
+        assert build["free_threaded"] is False
+        assert build["pgo"] is True
+        assert build["lto"] is True
+        assert build["jit"] is True
+
+    def test_disabled(self):
+        build = self.get_python_build(
+            {
+                "CONFIG_ARGS": (
+                    "'--enable-optimizations=no' '--with-lto=no'"
+                    + " '--enable-experimental-jit=no'"
+                ),
+            }
+        )
+
+        assert build["pgo"] is False
+        assert build["lto"] is False
+        assert build["jit"] is False
+
+    def test_option_values(self):
+        build = self.get_python_build(
+            {
+                "CONFIG_ARGS": (
+                    "'--enable-optimizations=yes' '--with-lto=full'"
+                    + " '--enable-experimental-jit=yes-off'"
+                ),
+            }
+        )
+
+        assert build["pgo"] is True
+        assert build["lto"] is True
+        assert build["jit"] is True
+
+    def test_similar_options(self):
+        build = self.get_python_build(
+            {"CONFIG_ARGS": "'--with-lto-x' 'CFLAGS=--enable-optimizations'"}
+        )
+
+        assert build["pgo"] is False
+        assert build["lto"] is False
+
+    def test_unknown(self):
+        build = self.get_python_build({})
+
+        assert build["pgo"] is None
+        assert build["lto"] is None
+        assert build["jit"] is None
+
+    def test_runtime_jit(self):
+        sys_jit = SimpleNamespace(is_available=lambda: True)
+
+        with mock.patch.object(sys, "_jit", sys_jit, create=True):
+            build = checks.get_python_build()
+
+        assert build["jit"] is True
+
+    def test_current(self):
+        build = checks.get_python_build()
+
+        assert build == checks.python_build
+        assert build["64bit"] is (sys.maxsize > 2**32)
+        assert build["debug"] is hasattr(sys, "gettotalrefcount")
+
+
+class CheckPackageVersionsTests(SimpleTestCase):
+    @override_settings(VERSION_CHECKS={"packages": ">=1"})
+    def test_fail_bad_type(self):
+        errors = checks.check_package_versions()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['packages'] is misconfigured. Expected a"
+            + " dict[str, str] but got '>=1'."
+        )
+
+    @override_settings(VERSION_CHECKS={"packages": {"django": "x"}})
+    def test_fail_bad_specifier(self):
+        errors = checks.check_package_versions()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E002"
+
+    @override_settings(VERSION_CHECKS={"packages": {"Django": "<1.0"}})
+    def test_fail_out_of_range(self):
+        errors = checks.check_package_versions()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E007"
+        assert errors[0].msg == (
+            f"The current version of Django ({django.__version__}) does not match"
+            + " the specified range (<1.0)."
+        )
+
+    @override_settings(VERSION_CHECKS={"packages": {"not-a-real-package": ">=1"}})
+    def test_fail_not_installed(self):
+        errors = checks.check_package_versions()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E008"
+        assert errors[0].msg == (
+            "The package not-a-real-package is not installed, so its version"
+            + " cannot match the specified range (>=1)."
+        )
+
+    @override_settings(VERSION_CHECKS={"packages": {"example": ">=1"}})
+    def test_fail_invalid_version(self):
+        with mock.patch.object(
+            checks, "get_installed_versions", return_value={"example": "unknown"}
+        ):
+            errors = checks.check_package_versions()
+
+        assert [e.id for e in errors] == ["dvc.E007"]
+
+    @override_settings(
+        VERSION_CHECKS={"packages": {"DJANGO": ">=1.0", "Django_Version.Checks": ">=0"}}
+    )
+    def test_success_normalized_names(self):
+        errors = checks.check_package_versions()
+
+        assert errors == []
+
+    def test_success_unspecified(self):
+        errors = checks.check_package_versions()
+
+        assert errors == []
+
+
+class GetInstalledVersionsTests(SimpleTestCase):
+    def setUp(self):
+        checks.get_installed_versions.cache_clear()
+        self.addCleanup(checks.get_installed_versions.cache_clear)
+
+    def test_single_scan(self):
+        with mock.patch.object(
+            importlib.metadata,
+            "distributions",
+            wraps=importlib.metadata.distributions,
+        ) as mock_distributions:
+            versions = checks.get_installed_versions()
+            checks.get_installed_versions()
+
+        assert mock_distributions.call_count == 1
+        assert versions["django"] == django.__version__
+
+    def test_first_wins(self):
+        distributions = [
+            SimpleNamespace(metadata={"Name": "Example_Pkg", "Version": "2.0"}),
+            SimpleNamespace(metadata={"Name": "example-pkg", "Version": "1.0"}),
+            SimpleNamespace(metadata={"Name": None, "Version": "1.0"}),
+        ]
+
+        with mock.patch.object(
+            importlib.metadata, "distributions", return_value=distributions
+        ):
+            versions = checks.get_installed_versions()
+
+        assert dict(versions) == {"example-pkg": "2.0"}
+
+
 @contextmanager
 def fake_postgresql(*, pg_version):
     mock_vendor = mock.patch.object(connection, "vendor", "postgresql")
@@ -194,6 +685,56 @@ class CheckPostgresqlVersionTests(SimpleTestCase):
 
         assert errors == []
 
+    @override_settings(
+        VERSION_CHECKS={"postgresql": "~=13.1"},
+        VERSION_CHECKS_PROBE_WORKERS=4,
+    )
+    def test_fail_out_of_range_concurrent(self):
+        with fake_postgresql(pg_version=13_00_00):
+            errors = checks.check_postgresql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E004"
+
+    @override_settings(
+        VERSION_CHECKS={"postgresql": "~=13.1"},
+        VERSION_CHECKS_TIMING_MESSAGES=True,
+    )
+    def test_timing_messages(self):
+        with fake_postgresql(pg_version=13_00_00):
+            errors = checks.check_postgresql_version(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E004", "dvc.D002", "dvc.D001"]
+        assert errors[1].msg.startswith(
+            "Detected the PostgreSQL version for the default database connection in "
+        )
+        assert errors[1].msg.endswith(" (live).")
+
+    @override_settings(
+        VERSION_CHECKS={"postgresql": "~=13.1"},
+        VERSION_CHECKS_PROBE_DEADLINE=0.05,
+    )
+    def test_warning_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def detect(connection):
+            release.wait(5)
+            return (13, 2)
+
+        with (
+            fake_postgresql(pg_version=13_02_00),
+            mock.patch.dict(probing.version_detectors, {"postgresql": detect}),
+        ):
+            errors = checks.check_postgresql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.W001"
+        assert errors[0].msg == (
+            "Timed out detecting the version of PostgreSQL for the default database"
+            + " connection."
+        )
+
     @override_settings(VERSION_CHECKS={"postgresql": {"default": "~=13.1"}})
     def test_success_in_range_specific_alias(self):
         with fake_postgresql(pg_version=13_02_00):
@@ -208,6 +749,13 @@ class CheckPostgresqlVersionTests(SimpleTestCase):
 
         assert errors == []
 
+    @override_settings(VERSION_CHECKS={"postgresql": {"def*": "~=13.1"}})
+    def test_fail_out_of_range_alias_pattern(self):
+        with fake_postgresql(pg_version=13_00_00):
+            errors = checks.check_postgresql_version(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E004"]
+
     @override_settings(VERSION_CHECKS={})
     def test_success_unspecified(self):
         errors = checks.check_postgresql_version(databases=["default"])
@@ -216,53 +764,441 @@ class CheckPostgresqlVersionTests(SimpleTestCase):
 
 
 @contextmanager
-def fake_mysql(*, mysql_version):
-    mock_vendor = mock.patch.object(connection, "vendor", "mysql")
-    mock_mysql_version = mock.patch.object(
-        connection, "mysql_version", mysql_version, create=True
-    )
-    with mock_vendor, mock_mysql_version:
+def fake_postgresql_settings(**pg_settings):
+    # Fill the settings cache, so no query is made.
+    settings_cache = {
+        name: None if setting is None else probing.PostgresqlSetting(*setting)
+        for name, setting in pg_settings.items()
+    }
+    with (
+        mock.patch.object(connection, "vendor", "postgresql"),
+        mock.patch.dict(
+            connections["default"].__dict__,
+            pg_settings=settings_cache,
+            pg_version=16_00_02,
+        ),
+    ):
         yield
 
 
-class CheckMysqlVersionTests(SimpleTestCase):
-    @override_settings(VERSION_CHECKS={"mysql": 10})
+# The function fetching each vendor's settings, by its name in checks.
+setting_getter_names = {
+    "postgresql": "get_postgresql_settings",
+    "mysql": "get_mysql_variables",
+}
+
+
+@contextmanager
+def fake_setting_probe(
+    vendor: str, detect: Any, server_settings: Mapping[str, object]
+) -> Generator[list[object]]:
+    """
+    Fake the default connection as the vendor, detecting its version with
+    detect, and fetching its settings from server_settings. Yield the list
+    of connections opened and settings fetched, in order.
+    """
+    events: list[object] = []
+
+    @contextmanager
+    def raw_connection(conn):
+        events.append("connect")
+        try:
+            yield None
+        finally:
+            events.append("close")
+
+    # Cached across fetches, like the real functions do on the connection.
+    cached: dict[str, object] = {}
+
+    def get_settings(conn, names):
+        missing = [name for name in names if name not in cached]
+        if missing:
+            events.append(("fetch", missing))
+            cached.update({name: server_settings.get(name) for name in missing})
+        return {name: cached[name] for name in names}
+
+    getter = checks.setting_getters[vendor]._replace(get=get_settings)
+    with (
+        mock.patch.object(connection, "vendor", vendor),
+        mock.patch.dict(probing.version_detectors, {vendor: detect}),
+        mock.patch.dict(checks.setting_getters, {vendor: getter}),
+        mock.patch.object(checks, setting_getter_names[vendor], get_settings),
+        mock.patch.object(checks, "raw_connection", raw_connection),
+    ):
+        yield events
+
+
+class CheckPostgresqlSettingsTests(SimpleTestCase):
+    @override_settings(VERSION_CHECKS={"postgresql_settings": ["jit"]})
     def test_fail_bad_type(self):
-        errors = checks.check_mysql_version(databases=["default"])
+        errors = checks.check_postgresql_settings(databases=["default"])
 
         assert len(errors) == 1
         assert errors[0].id == "dvc.E001"
         assert errors[0].msg == (
-            "settings.VERSION_CHECKS['mysql'] is misconfigured."
-            + " Expected a str or dict[str, str] but got 10."
+            "settings.VERSION_CHECKS['postgresql_settings'] is misconfigured."
+            + " Expected a dict[str, str] or dict[str, dict[str, str]] but got"
+            + " ['jit']."
         )
 
-    @override_settings(VERSION_CHECKS={"mysql": "10.5.8"})
-    def test_fail_bad_specifier(self):
-        errors = checks.check_mysql_version(databases=["default"])
+    @override_settings(
+        VERSION_CHECKS={"postgresql_settings": {"jit": "off", "default": {}}}
+    )
+    def test_fail_bad_type_mixed(self):
+        errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E001"]
+
+    @override_settings(
+        VERSION_CHECKS={"postgresql_settings": {"shared_buffers": ">=lots"}}
+    )
+    def test_fail_bad_comparison(self):
+        errors = checks.check_postgresql_settings(databases=["default"])
 
         assert len(errors) == 1
-        assert errors[0].id == "dvc.E002"
+        assert errors[0].id == "dvc.E001"
         assert errors[0].msg == (
-            "settings.VERSION_CHECKS['mysql'] is misconfigured. '10.5.8' is "
-            + "not a valid PEP440 specifier."
+            "settings.VERSION_CHECKS['postgresql_settings'] is misconfigured."
+            + " Expected a setting value or comparison but got '>=lots'."
         )
 
-    @override_settings(VERSION_CHECKS={"mysql": {"default": "10.5.8"}})
-    def test_fail_bad_specifier_in_dict(self):
-        errors = checks.check_mysql_version(databases=["default"])
+    @override_settings(
+        VERSION_CHECKS={"postgresql_settings": {"default": {"max_connections": []}}}
+    )
+    def test_fail_bad_value_in_dict(self):
+        errors = checks.check_postgresql_settings(databases=["default"])
 
         assert len(errors) == 1
-        assert errors[0].id == "dvc.E002"
         assert errors[0].msg == (
-            "settings.VERSION_CHECKS['mysql'] is misconfigured. '10.5.8' is "
-            + "not a valid PEP440 specifier."
+            "settings.VERSION_CHECKS['postgresql_settings'] is misconfigured."
+            + " Expected a setting value or comparison but got []."
         )
 
-    @override_settings(VERSION_CHECKS={"mysql": "~=10.5.8"})
-    def test_fail_out_of_range(self):
-        with fake_mysql(mysql_version=(10, 5, 7)):
-            errors = checks.check_mysql_version(databases=["default"])
+    @override_settings(
+        VERSION_CHECKS={
+            "postgresql_settings": {
+                "jit": False,
+                "shared_buffers": ">=1GB",
+                "max_connections": "<=200",
+                "Synchronous_Commit": "on",
+                "made_up": "1",
+            }
+        }
+    )
+    def test_fail_mismatch(self):
+        with fake_postgresql_settings(
+            jit=("on", None, "bool"),
+            shared_buffers=("16384", "8kB", "integer"),
+            max_connections=("500", None, "integer"),
+            synchronous_commit=("off", None, "enum"),
+            made_up=None,
+        ):
+            errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E011"] * 5
+        assert [e.msg for e in errors] == [
+            "The PostgreSQL setting jit (on) for the default database"
+            + " connection does not match the specified value (off).",
+            "The PostgreSQL setting shared_buffers (128MB) for the default"
+            + " database connection does not match the specified value (>=1GB).",
+            "The PostgreSQL setting max_connections (500) for the default"
+            + " database connection does not match the specified value (<=200).",
+            "The PostgreSQL setting synchronous_commit (off) for the default"
+            + " database connection does not match the specified value (on).",
+            "The PostgreSQL setting made_up (unknown) for the default database"
+            + " connection does not match the specified value (1).",
+        ]
+
+    @override_settings(VERSION_CHECKS={"postgresql_settings": {"jit": "off"}})
+    def test_fetched_with_version(self):
+        jit = probing.PostgresqlSetting("on", None, "bool")
+
+        def detect(conn):
+            events.append("detect")
+            return (16, 2)
+
+        with fake_setting_probe("postgresql", detect, {"jit": jit}) as events:
+            errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E011"]
+        assert events == ["connect", "detect", ("fetch", ["jit"]), "close"]
+
+    @override_settings(
+        VERSION_CHECKS={"postgresql_settings": {"jit": "off"}},
+        VERSION_CHECKS_PROBE_DEADLINE=0.05,
+    )
+    def test_skip_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def detect(conn):
+            release.wait(5)
+            return (16, 2)
+
+        with fake_setting_probe("postgresql", detect, {}) as events:
+            errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert errors == []
+        assert ("fetch", ["jit"]) not in events
+
+    @override_settings(
+        VERSION_CHECKS={
+            "postgresql_settings": {
+                "jit": "false",
+                "shared_buffers": ">=128MB,<1GB",
+                "max_connections": 100,
+                "synchronous_commit": "ON",
+                "statement_timeout": ">=30s",
+                "work_mem": "4096",
+                "search_path": '"$user", public',
+            }
+        }
+    )
+    def test_success(self):
+        with fake_postgresql_settings(
+            jit=("off", None, "bool"),
+            shared_buffers=("16384", "8kB", "integer"),
+            max_connections=("100", None, "integer"),
+            synchronous_commit=("on", None, "enum"),
+            statement_timeout=("60000", "ms", "integer"),
+            work_mem=("4096", "kB", "integer"),
+            search_path=('"$user", public', None, "string"),
+        ):
+            errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(
+        VERSION_CHECKS={
+            "postgresql_settings": {
+                "other": {"jit": "on"},
+                "def*": {"jit": "off"},
+            }
+        }
+    )
+    def test_success_pattern(self):
+        with fake_postgresql_settings(jit=("off", None, "bool")):
+            errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"postgresql_settings": {"jit": "on"}})
+    def test_success_databases_none(self):
+        with fake_postgresql_settings(jit=("off", None, "bool")):
+            errors = checks.check_postgresql_settings(databases=None)
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"postgresql_settings": {"jit": "on"}})
+    def test_success_other_vendor(self):
+        errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"postgresql_settings": {}})
+    def test_success_empty(self):
+        with fake_postgresql_settings():
+            errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert errors == []
+
+    def test_success_unspecified(self):
+        errors = checks.check_postgresql_settings(databases=["default"])
+
+        assert errors == []
+
+
+class SettingAssertionTests(SimpleTestCase):
+    def test_abstract(self):
+        with pytest.raises(TypeError, match="abstract"):
+            checks.SettingAssertion("on", [("==", "on")])  # type: ignore [abstract]
+
+
+class PostgresqlSettingAssertionTests(SimpleTestCase):
+    def matches(self, value: object, setting: tuple[str, str | None, str]) -> bool:
+        assertion = checks.PostgresqlSettingAssertion.compile(value)
+        assert assertion is not None
+        return assertion.matches(probing.PostgresqlSetting(*setting))
+
+    def test_units(self):
+        setting = ("16384", "8kB", "integer")
+        assert self.matches("128MB", setting)
+        assert self.matches("==131072kB", setting)
+        assert self.matches("16384", setting)
+        assert self.matches(">0.1GB,<0.2GB", setting)
+        assert not self.matches("!=128MB", setting)
+
+    def test_time_units(self):
+        setting = ("5", "min", "integer")
+        assert self.matches("300s", setting)
+        assert self.matches(">=300000ms", setting)
+        assert not self.matches(">1h", setting)
+
+    def test_real(self):
+        setting = ("0.5", None, "real")
+        assert self.matches(0.5, setting)
+        assert self.matches(">0.25,<=0.5", setting)
+
+    def test_wrong_unit_kind(self):
+        assert not self.matches(">=1s", ("16384", "8kB", "integer"))
+
+    def test_unit_for_unitless(self):
+        assert not self.matches(">=1MB", ("100", None, "integer"))
+
+    def test_non_numeric_for_numeric(self):
+        assert not self.matches("lots", ("100", None, "integer"))
+
+    def test_ordering_non_numeric(self):
+        assert not self.matches(">=1", ("on", None, "bool"))
+
+    def test_bool(self):
+        assert self.matches(True, ("on", None, "bool"))
+        assert self.matches("yes", ("on", None, "bool"))
+        assert self.matches("!=off", ("on", None, "bool"))
+
+    def test_string_case_sensitive(self):
+        assert not self.matches("UTC", ("Etc/UTC", None, "string"))
+        assert not self.matches("etc/utc", ("Etc/UTC", None, "string"))
+
+    def test_compile_invalid(self):
+        assert checks.PostgresqlSettingAssertion.compile(">=") is None
+        assert checks.PostgresqlSettingAssertion.compile(">=1XB") is None
+        assert checks.PostgresqlSettingAssertion.compile(">=1,lots") is None
+        assert checks.PostgresqlSettingAssertion.compile(None) is None
+
+    def test_format(self):
+        def format_setting(setting: tuple[str, str | None, str]) -> str:
+            return checks.format_postgresql_setting(probing.PostgresqlSetting(*setting))
+
+        assert format_setting(("16384", "8kB", "integer")) == "128MB"
+        assert format_setting(("1000", "8kB", "integer")) == "8000kB"
+        assert format_setting(("60000", "ms", "integer")) == "1min"
+        assert format_setting(("-1", "8kB", "integer")) == "-1"
+        assert format_setting(("2", "ms", "real")) == "2ms"
+        assert format_setting(("on", None, "bool")) == "on"
+
+
+class GetVersionReportTests(SimpleTestCase):
+    def test_no_database_connections(self):
+        with mock.patch.object(connection, "vendor", "other"):
+            assert checks.get_version_report() == []
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_matched(self):
+        with fake_postgresql(pg_version=13_00_02):
+            report = checks.get_version_report()
+
+        assert report == [
+            checks.DatabaseVersion(
+                alias="default",
+                vendor="postgresql",
+                version=(13, 2),
+                specifier=SpecifierSet("~=13.1"),
+                duration=report[0].duration,
+                source="live",
+            )
+        ]
+        assert report[0].matched is True
+        assert not hasattr(report[0], "__dict__")
+        assert repr(report[0]) == (
+            "<DatabaseVersion alias='default' vendor='postgresql' version=(13, 2)"
+            + " specifier=<SpecifierSet('~=13.1')> matched=True>"
+        )
+
+    @override_settings(VERSION_CHECKS={"postgresql": {"other": "~=13.1"}})
+    def test_unspecified(self):
+        with fake_postgresql(pg_version=13_00_00):
+            report = checks.get_version_report(databases=["default"])
+
+        assert [(r.version, r.specifier, r.matched) for r in report] == [
+            ((13, 0), None, None)
+        ]
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_not_matched(self):
+        with fake_postgresql(pg_version=13_00_00):
+            report = checks.get_version_report()
+
+        assert report[0].matched is False
+
+    def test_databases(self):
+        with fake_postgresql(pg_version=13_00_00):
+            assert checks.get_version_report(databases=[]) == []
+
+    def test_memoized(self):
+        with fake_postgresql(pg_version=13_00_00):
+            first = checks.get_version_report()
+        with fake_postgresql(pg_version=14_00_00):
+            second = checks.get_version_report()
+            refreshed = checks.get_version_report(refresh=True)
+
+        assert first == second
+        assert refreshed[0].version == (14, 0)
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_shared_with_checks(self):
+        detect = mock.Mock(return_value=(13, 0))
+
+        with (
+            fake_postgresql(pg_version=13_00_00),
+            mock.patch.dict(probing.version_detectors, {"postgresql": detect}),
+        ):
+            report = checks.get_version_report()
+            errors = checks.check_postgresql_version(databases=["default"])
+
+        assert report[0].matched is False
+        assert [e.id for e in errors] == ["dvc.E004"]
+        assert detect.call_count == 1
+
+
+@contextmanager
+def fake_mysql(*, mysql_version):
+    mock_vendor = mock.patch.object(connection, "vendor", "mysql")
+    mock_mysql_version = mock.patch.object(
+        connection, "mysql_version", mysql_version, create=True
+    )
+    with mock_vendor, mock_mysql_version:
+        yield
+
+
+class CheckMysqlVersionTests(SimpleTestCase):
+    @override_settings(VERSION_CHECKS={"mysql": 10})
+    def test_fail_bad_type(self):
+        errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['mysql'] is misconfigured."
+            + " Expected a str or dict[str, str] but got 10."
+        )
+
+    @override_settings(VERSION_CHECKS={"mysql": "10.5.8"})
+    def test_fail_bad_specifier(self):
+        errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E002"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['mysql'] is misconfigured. '10.5.8' is "
+            + "not a valid PEP440 specifier."
+        )
+
+    @override_settings(VERSION_CHECKS={"mysql": {"default": "10.5.8"}})
+    def test_fail_bad_specifier_in_dict(self):
+        errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E002"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['mysql'] is misconfigured. '10.5.8' is "
+            + "not a valid PEP440 specifier."
+        )
+
+    @override_settings(VERSION_CHECKS={"mysql": "~=10.5.8"})
+    def test_fail_out_of_range(self):
+        with fake_mysql(mysql_version=(10, 5, 7)):
+            errors = checks.check_mysql_version(databases=["default"])
 
         assert len(errors) == 1
         assert errors[0].id == "dvc.E005"
@@ -313,21 +1249,300 @@ class CheckMysqlVersionTests(SimpleTestCase):
         assert errors == []
 
 
+@contextmanager
+def fake_mariadb(*, mysql_version, server_info="10.11.6-MariaDB"):
+    with (
+        fake_mysql(mysql_version=mysql_version),
+        mock.patch.dict(connections["default"].__dict__, mysql_server_info=server_info),
+    ):
+        yield
+
+    @override_settings(
+        VERSION_CHECKS={"mysql": "~=10.5.8"},
+        VERSION_CHECKS_PROBE_DEADLINE=0.05,
+    )
+    def test_warning_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def detect(connection):
+            release.wait(5)
+            return (10, 5, 8)
+
+        with (
+            fake_mysql(mysql_version=(10, 5, 8)),
+            mock.patch.dict(probing.version_detectors, {"mysql": detect}),
+            # MySQL's backend looks up its display name with a query.
+            mock.patch.object(
+                type(connection),
+                "display_name",
+                new_callable=mock.PropertyMock,
+                side_effect=AssertionError("Queried display_name"),
+            ),
+        ):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.W001"
+        assert errors[0].msg == (
+            "Timed out detecting the version of MariaDB/MySQL for the default"
+            + " database connection."
+        )
+
+
+class CheckMysqlFlavorTests(SimpleTestCase):
+    @override_settings(VERSION_CHECKS={"mariadb": 10})
+    def test_fail_bad_type(self):
+        errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['mariadb'] is misconfigured."
+            + " Expected a str or dict[str, str] but got 10."
+        )
+
+    @override_settings(VERSION_CHECKS={"mysql": ">=8.0", "mariadb": "~=11.4"})
+    def test_fail_mariadb(self):
+        with fake_mariadb(mysql_version=(10, 11, 6)):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E005"
+        assert errors[0].msg == (
+            "The current version of MariaDB (10.11.6) for the default database"
+            + " connection does not match the specified range (~=11.4)."
+        )
+
+    @override_settings(VERSION_CHECKS={"mysql": "~=8.4", "mariadb": ">=10.11"})
+    def test_fail_mysql(self):
+        with fake_mariadb(mysql_version=(8, 0, 36), server_info="8.0.36"):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].msg == (
+            "The current version of MariaDB/MySQL (8.0.36) for the default"
+            + " database connection does not match the specified range (~=8.4)."
+        )
+
+    @override_settings(VERSION_CHECKS={"mysql": "~=8.4"})
+    def test_fail_mariadb_without_key(self):
+        with fake_mariadb(mysql_version=(10, 11, 6)):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].msg == (
+            "The current version of MariaDB (10.11.6) for the default database"
+            + " connection does not match the specified range (~=8.4)."
+        )
+
+    @override_settings(VERSION_CHECKS={"mysql": ">=8.0", "mariadb": "~=10.11"})
+    def test_success_mariadb(self):
+        with fake_mariadb(mysql_version=(10, 11, 6)):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"mariadb": "~=10.11"})
+    def test_success_mysql_with_mariadb_key(self):
+        with fake_mariadb(mysql_version=(8, 0, 36), server_info="8.0.36"):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(
+        VERSION_CHECKS={"mysql": ">=8.0", "mariadb": {"other": "~=11.4"}}
+    )
+    def test_success_mariadb_other_alias(self):
+        with fake_mariadb(mysql_version=(10, 11, 6)):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"mariadb": "~=11.4"})
+    def test_report(self):
+        with fake_mariadb(mysql_version=(10, 11, 6)):
+            report = checks.get_version_report()
+
+        assert [(r.vendor, r.flavor, r.specifier, r.matched) for r in report] == [
+            ("mysql", "mariadb", SpecifierSet("~=11.4"), False)
+        ]
+
+
+@contextmanager
+def fake_mysql_variables(**variables):
+    # Fill the variables cache, so no query is made.
+    with (
+        mock.patch.object(connection, "vendor", "mysql"),
+        mock.patch.dict(
+            connections["default"].__dict__,
+            mysql_variables=variables,
+            mysql_version=(8, 0, 36),
+        ),
+    ):
+        yield
+
+
+class CheckMysqlVariablesTests(SimpleTestCase):
+    @override_settings(VERSION_CHECKS={"mysql_variables": "on"})
+    def test_fail_bad_type(self):
+        errors = checks.check_mysql_variables(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['mysql_variables'] is misconfigured."
+            + " Expected a dict[str, str] or dict[str, dict[str, str]] but got"
+            + " 'on'."
+        )
+
+    @override_settings(
+        VERSION_CHECKS={"mysql_variables": {"innodb_buffer_pool_size": ">=8X"}}
+    )
+    def test_fail_bad_comparison(self):
+        errors = checks.check_mysql_variables(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['mysql_variables'] is misconfigured."
+            + " Expected a setting value or comparison but got '>=8X'."
+        )
+
+    @override_settings(
+        VERSION_CHECKS={
+            "mysql_variables": {
+                "innodb_buffer_pool_size": ">=1G",
+                "transaction_isolation": "READ-COMMITTED",
+                "made_up": "1",
+            }
+        }
+    )
+    def test_fail_mismatch(self):
+        with fake_mysql_variables(
+            innodb_buffer_pool_size="134217728",
+            transaction_isolation="REPEATABLE-READ",
+            made_up=None,
+        ):
+            errors = checks.check_mysql_variables(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E012"] * 3
+        assert [e.msg for e in errors] == [
+            "The MariaDB/MySQL variable innodb_buffer_pool_size (134217728) for"
+            + " the default database connection does not match the specified"
+            + " value (>=1G).",
+            "The MariaDB/MySQL variable transaction_isolation (REPEATABLE-READ)"
+            + " for the default database connection does not match the specified"
+            + " value (READ-COMMITTED).",
+            "The MariaDB/MySQL variable made_up (unknown) for the default"
+            + " database connection does not match the specified value (1).",
+        ]
+
+    @override_settings(VERSION_CHECKS={"mysql_variables": {"sql_mode": "TRADITIONAL"}})
+    def test_fetched_with_version(self):
+        def detect(conn):
+            events.append("detect")
+            return (8, 0, 36)
+
+        with fake_setting_probe("mysql", detect, {"sql_mode": "ANSI"}) as events:
+            errors = checks.check_mysql_variables(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E012"]
+        assert events == ["connect", "detect", ("fetch", ["sql_mode"]), "close"]
+
+    @override_settings(
+        VERSION_CHECKS={"mysql_variables": {"sql_mode": "TRADITIONAL"}},
+        VERSION_CHECKS_PROBE_DEADLINE=0.05,
+    )
+    def test_skip_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def detect(conn):
+            release.wait(5)
+            return (8, 0, 36)
+
+        with fake_setting_probe("mysql", detect, {}) as events:
+            errors = checks.check_mysql_variables(databases=["default"])
+
+        assert errors == []
+        assert ("fetch", ["sql_mode"]) not in events
+
+    @override_settings(
+        VERSION_CHECKS={
+            "mysql_variables": {
+                "default": {
+                    "innodb_buffer_pool_size": ">=128M,<1G",
+                    "transaction_isolation": "repeatable-read",
+                    "performance_schema": False,
+                    "max_connections": 151,
+                }
+            }
+        }
+    )
+    def test_success(self):
+        with fake_mysql_variables(
+            innodb_buffer_pool_size="134217728",
+            transaction_isolation="REPEATABLE-READ",
+            performance_schema="OFF",
+            max_connections="151",
+        ):
+            errors = checks.check_mysql_variables(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"mysql_variables": {"max_connections": 1}})
+    def test_success_other_vendor(self):
+        errors = checks.check_mysql_variables(databases=["default"])
+
+        assert errors == []
+
+    def test_success_unspecified(self):
+        errors = checks.check_mysql_variables(databases=["default"])
+
+        assert errors == []
+
+
+class MysqlVariableAssertionTests(SimpleTestCase):
+    def matches(self, value: object, setting: str) -> bool:
+        assertion = checks.MysqlVariableAssertion.compile(value)
+        assert assertion is not None
+        return assertion.matches(setting)
+
+    def test_sizes(self):
+        assert self.matches("128M", "134217728")
+        assert self.matches(">=131072k", "134217728")
+        assert self.matches("<0.5G", "134217728")
+        assert not self.matches(">128M", "134217728")
+
+    def test_bool(self):
+        assert self.matches(True, "ON")
+        assert self.matches("true", "ON")
+        assert self.matches("!=on", "OFF")
+
+    def test_ordering_non_numeric(self):
+        assert not self.matches(">1", "ON")
+
+    def test_size_suffix_in_value(self):
+        assert not self.matches(">1", "1G")
+
+
 class CheckSqliteVersionTests(SimpleTestCase):
+    databases = {"default"}
+
     @override_settings(VERSION_CHECKS={"sqlite": 3})
     def test_fail_bad_type(self):
-        errors = checks.check_sqlite_version()
+        errors = checks.check_sqlite_version(databases=["default"])
 
         assert len(errors) == 1
         assert errors[0].id == "dvc.E001"
         assert errors[0].msg == (
             "settings.VERSION_CHECKS['sqlite'] is misconfigured. Expected "
-            + "a str but got 3."
+            + "a str or dict[str, str] but got 3."
         )
 
     @override_settings(VERSION_CHECKS={"sqlite": "3"})
     def test_fail_bad_specifier(self):
-        errors = checks.check_sqlite_version()
+        errors = checks.check_sqlite_version(databases=["default"])
 
         assert len(errors) == 1
         assert errors[0].id == "dvc.E002"
@@ -338,21 +1553,423 @@ class CheckSqliteVersionTests(SimpleTestCase):
 
     @override_settings(VERSION_CHECKS={"sqlite": "<1.0"})
     def test_fail_out_of_range(self):
-        errors = checks.check_sqlite_version()
+        errors = checks.check_sqlite_version(databases=["default"])
 
         assert len(errors) == 1
         assert errors[0].id == "dvc.E006"
-        assert errors[0].msg.startswith("The current version of SQLite ")
-        assert errors[0].msg.endswith("does not match the specified range (<1.0).")
+        assert errors[0].msg == (
+            f"The current version of SQLite ({sqlite3.sqlite_version}) for the"
+            + " default database connection does not match the specified range"
+            + " (<1.0)."
+        )
+
+    @override_settings(VERSION_CHECKS={"sqlite": {"default": "<1.0"}})
+    def test_fail_out_of_range_specific_alias(self):
+        errors = checks.check_sqlite_version(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E006"]
 
     @override_settings(VERSION_CHECKS={"sqlite": ">=3.0"})
     def test_success_in_range(self):
-        errors = checks.check_sqlite_version()
+        errors = checks.check_sqlite_version(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"sqlite": {"other": "<1.0"}})
+    def test_success_specified_other_alias(self):
+        errors = checks.check_sqlite_version(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"sqlite": "<1.0"})
+    def test_success_databases_none(self):
+        errors = checks.check_sqlite_version(databases=None)
 
         assert errors == []
 
     @override_settings(VERSION_CHECKS={})
     def test_success_unspecified(self):
-        errors = checks.check_sqlite_version()
+        errors = checks.check_sqlite_version(databases=["default"])
+
+        assert errors == []
+
+
+class CheckSqliteCompileOptionsTests(SimpleTestCase):
+    databases = {"default"}
+
+    @override_settings(VERSION_CHECKS={"sqlite_compile_options": "ENABLE_FTS5"})
+    def test_fail_bad_type(self):
+        errors = checks.check_sqlite_compile_options(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['sqlite_compile_options'] is misconfigured."
+            + " Expected a list[str] or dict[str, list[str]] but got 'ENABLE_FTS5'."
+        )
+
+    @override_settings(
+        VERSION_CHECKS={
+            "sqlite_compile_options": ["SQLITE_THREADSAFE", "ENABLE_MADE_UP", "B"]
+        }
+    )
+    def test_fail_missing(self):
+        errors = checks.check_sqlite_compile_options(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E010"
+        assert errors[0].msg == (
+            "The SQLite library for the default database connection was not"
+            + " compiled with the required options: B, ENABLE_MADE_UP."
+        )
+
+    @override_settings(
+        VERSION_CHECKS={"sqlite_compile_options": {"def*": ["THREADSAFE=999"]}}
+    )
+    def test_fail_missing_value_pattern(self):
+        errors = checks.check_sqlite_compile_options(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E010"]
+
+    def test_success(self):
+        options = sorted(probing.get_sqlite_compile_options(connections["default"]))
+
+        with override_settings(
+            VERSION_CHECKS={
+                "sqlite_compile_options": [f"sqlite_{o.lower()}" for o in options]
+            }
+        ):
+            errors = checks.check_sqlite_compile_options(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(
+        VERSION_CHECKS={"sqlite_compile_options": {"other": ["ENABLE_MADE_UP"]}}
+    )
+    def test_success_other_alias(self):
+        errors = checks.check_sqlite_compile_options(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"sqlite_compile_options": ["ENABLE_MADE_UP"]})
+    def test_success_databases_none(self):
+        errors = checks.check_sqlite_compile_options(databases=None)
+
+        assert errors == []
+
+    def test_success_unspecified(self):
+        errors = checks.check_sqlite_compile_options(databases=["default"])
+
+        assert errors == []
+
+
+@contextmanager
+def fake_sqlite_aliases(
+    versions: Mapping[str, tuple[int, ...]],
+) -> Generator[mock.Mock]:
+    # A handler with an in-memory SQLite alias per version, detecting the
+    # given versions, and recording each detection.
+    handler = ConnectionHandler(
+        {
+            alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+            for alias in ["default", *versions]
+        }
+    )
+    detect = mock.Mock(side_effect=lambda conn: versions[conn.alias])
+    with (
+        mock.patch.object(checks, "connections", handler),
+        mock.patch.dict(probing.version_detectors, {"sqlite": detect}),
+    ):
+        yield detect
+
+
+class CheckVersionSkewTests(SimpleTestCase):
+    @override_settings(VERSION_CHECKS={"version_skew": ["default"]})
+    def test_fail_bad_type(self):
+        errors = checks.check_version_skew(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E001"
+        assert errors[0].msg == (
+            "settings.VERSION_CHECKS['version_skew'] is misconfigured. Expected a"
+            + " dict mapping group names to lists of aliases, or to dicts with"
+            + " aliases and match of major, minor, or exact but got ['default']."
+        )
+
+    @override_settings(
+        VERSION_CHECKS={"version_skew": {"main": {"aliases": ["a"], "match": "x"}}}
+    )
+    def test_fail_bad_match(self):
+        errors = checks.check_version_skew(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E001"]
+
+    @override_settings(
+        VERSION_CHECKS={"version_skew": {"main": ["primary", "replica_*"]}}
+    )
+    def test_fail_skew(self):
+        versions = {
+            "primary": (3, 45, 1),
+            "replica_1": (3, 45, 2),
+            "replica_2": (3, 44, 0),
+            "other": (3, 30, 0),
+        }
+        with fake_sqlite_aliases(versions):
+            errors = checks.check_version_skew(databases=list(versions))
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E013"
+        assert errors[0].msg == (
+            "The database connections in the main version skew group report"
+            + " different minor versions: 3.45 (primary, replica_1), 3.44"
+            + " (replica_2)."
+        )
+
+    @override_settings(
+        VERSION_CHECKS={
+            "version_skew": {"main": {"aliases": ["replica_*"], "match": "exact"}}
+        }
+    )
+    def test_fail_skew_exact_large(self):
+        versions = {f"replica_{i:04}": (3, 45, 1) for i in range(1000)}
+        versions["replica_0500"] = (3, 45, 2)
+        with fake_sqlite_aliases(versions):
+            errors = checks.check_version_skew(databases=list(versions))
+
+        assert [e.msg for e in errors] == [
+            "The database connections in the main version skew group report"
+            + " different versions: 3.45.1 (replica_0000, replica_0001,"
+            + " replica_0002, and 996 more), 3.45.2 (replica_0500)."
+        ]
+
+    @override_settings(
+        VERSION_CHECKS={
+            "version_skew": {
+                "main": {"aliases": ["primary", "replica"], "match": "major"}
+            }
+        }
+    )
+    def test_success_major(self):
+        versions = {"primary": (3, 45, 1), "replica": (3, 30, 0)}
+        with fake_sqlite_aliases(versions):
+            errors = checks.check_version_skew(databases=list(versions))
+
+        assert errors == []
+
+    @override_settings(
+        VERSION_CHECKS={"sqlite": ">=3", "version_skew": {"main": ["a", "b"]}}
+    )
+    def test_success_reuses_versions(self):
+        versions = {"a": (3, 45, 1), "b": (3, 45, 2), "c": (3, 44, 0)}
+        with fake_sqlite_aliases(versions) as detect:
+            checks.check_sqlite_version(databases=list(versions))
+            errors = checks.check_version_skew(databases=list(versions))
+
+        assert errors == []
+        assert detect.call_count == 3
+
+    @override_settings(VERSION_CHECKS={"version_skew": {"main": ["a", "b"]}})
+    def test_success_not_asked_about(self):
+        versions = {"a": (3, 45, 1), "b": (3, 44, 0)}
+        with fake_sqlite_aliases(versions) as detect:
+            errors = checks.check_version_skew(databases=["a"])
+
+        assert errors == []
+        assert detect.call_count == 1
+
+    def test_success_unspecified(self):
+        errors = checks.check_version_skew(databases=["default"])
+
+        assert errors == []
+
+
+class CheckVersionsTests(SimpleTestCase):
+    def test_success_no_setting(self):
+        errors = checks.check_versions(databases=["default"])
 
         assert errors == []
+
+    @override_settings(
+        VERSION_CHECKS={"python": ">=3"},
+        VERSION_CHECKS_TIMING_MESSAGES=True,
+    )
+    def test_timing_messages(self):
+        errors = checks.check_versions(databases=["default"])
+
+        # Only the unified check is timed, not each check it runs.
+        assert [e.id for e in errors if e.id == "dvc.D001"] == ["dvc.D001"]
+        assert errors[-1].msg.startswith("Check check_versions took ")
+
+    @override_settings(VERSION_CHECKS=[])
+    def test_fail_bad_config(self):
+        errors = checks.check_versions(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E001"]
+
+    @override_settings(
+        VERSION_CHECKS={
+            "python": "<1.0",
+            "sqlite": "<1.0",
+            "postgresql": "~=13.1",
+            "mysql": 10,
+        }
+    )
+    def test_fail_all(self):
+        with fake_postgresql(pg_version=13_00_00):
+            errors = checks.check_versions(databases=["default"])
+
+        assert [e.id for e in errors] == [
+            "dvc.E003",
+            "dvc.E001",
+            "dvc.E004",
+        ]
+
+    @override_settings(VERSION_CHECKS={"mysql": {"default": "~=10.5.8"}})
+    def test_fail_mysql(self):
+        with fake_mysql(mysql_version=(10, 5, 7)):
+            errors = checks.check_versions(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E005"
+
+    @override_settings(
+        VERSION_CHECKS={"postgresql": "~=13.1", "postgresql_settings": {"jit": "off"}}
+    )
+    def test_fail_postgresql_settings(self):
+        with (
+            fake_postgresql_settings(jit=("on", None, "bool")),
+            mock.patch.object(connection, "pg_version", 13_00_02, create=True),
+        ):
+            errors = checks.check_versions(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E011"]
+
+    @override_settings(VERSION_CHECKS={"postgresql_settings": {"jit": "off"}})
+    def test_postgresql_settings_only(self):
+        jit = probing.PostgresqlSetting("on", None, "bool")
+
+        def detect(conn):
+            return (16, 2)
+
+        with fake_setting_probe("postgresql", detect, {"jit": jit}) as events:
+            errors = checks.check_versions(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E011"]
+        assert events == ["connect", ("fetch", ["jit"]), "close"]
+
+    @override_settings(VERSION_CHECKS={"mysql_variables": {"sql_mode": "TRADITIONAL"}})
+    def test_mysql_variables_only(self):
+        def detect(conn):
+            return (8, 0, 36)
+
+        with fake_setting_probe("mysql", detect, {"sql_mode": "ANSI"}) as events:
+            errors = checks.check_versions(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E012"]
+        assert events == ["connect", ("fetch", ["sql_mode"]), "close"]
+
+    @override_settings(
+        VERSION_CHECKS={"postgresql": "~=16.0", "postgresql_settings": {"jit": "off"}},
+        VERSION_CHECKS_PROBE_DEADLINE=0.05,
+    )
+    def test_postgresql_settings_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        probed = []
+
+        def detect(conn):
+            probed.append(conn.alias)
+            release.wait(5)
+            return (16, 2)
+
+        with fake_setting_probe("postgresql", detect, {}) as events:
+            errors = checks.check_versions(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.W001"]
+        # Probed once, and not reconnected to fetch settings.
+        assert probed == ["default"]
+        assert ("fetch", ["jit"]) not in events
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1", "mysql": "~=10.5.8"})
+    def test_success_databases_none(self):
+        with fake_postgresql(pg_version=13_00_00):
+            errors = checks.check_versions()
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1", "mysql": "~=10.5.8"})
+    def test_success_in_range(self):
+        with fake_postgresql(pg_version=13_02_00):
+            errors = checks.check_versions(databases=["default"])
+
+        assert errors == []
+
+
+def run_acheck_versions(
+    *fakes: AbstractContextManager[object], **kwargs: Any
+) -> list[CheckMessage]:
+    # Django gives the event loop its own connection wrappers, so fake them
+    # from within it.
+    async def run() -> list[CheckMessage]:
+        with ExitStack() as stack:
+            for fake in fakes:
+                stack.enter_context(fake)
+            return await checks.acheck_versions(**kwargs)
+
+    return asyncio.run(run())
+
+
+class AcheckVersionsTests(SimpleTestCase):
+    def test_success_no_setting(self):
+        errors = run_acheck_versions(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"postgresql": 13, "mysql": "~=10.5.8"})
+    def test_fail_bad_type(self):
+        errors = run_acheck_versions(databases=["default"])
+
+        assert [e.id for e in errors] == ["dvc.E001"]
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_fail_out_of_range(self):
+        errors = run_acheck_versions(
+            fake_postgresql(pg_version=13_00_00), databases=["default"]
+        )
+
+        with fake_postgresql(pg_version=13_00_00):
+            assert errors == checks.check_postgresql_version(databases=["default"])
+        assert [e.id for e in errors] == ["dvc.E004"]
+
+    @override_settings(VERSION_CHECKS={"mysql": {"default": "~=10.5.8"}})
+    def test_fail_mysql_databases_none(self):
+        errors = run_acheck_versions(fake_mysql(mysql_version=(10, 5, 7)))
+
+        assert [e.id for e in errors] == ["dvc.E005"]
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1", "mysql": "~=10.5.8"})
+    def test_success_in_range(self):
+        errors = run_acheck_versions(
+            fake_postgresql(pg_version=13_02_00), databases=["default"]
+        )
+
+        assert errors == []
+
+    @override_settings(
+        VERSION_CHECKS={"postgresql": "~=13.1"},
+        VERSION_CHECKS_PROBE_DEADLINE=0.05,
+    )
+    def test_warning_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def detect(connection):
+            release.wait(5)
+            return (13, 2)
+
+        with mock.patch.dict(probing.version_detectors, {"postgresql": detect}):
+            errors = run_acheck_versions(
+                fake_postgresql(pg_version=13_02_00), databases=["default"]
+            )
+
+        assert [e.id for e in errors] == ["dvc.W001"]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from django_version_checks import metrics, probing
+from django_version_checks.cache import VersionCache, connection_fingerprint
+from django_version_checks.signals import version_probed
+
+
+class ProbeMetricsTests(SimpleTestCase):
+    def setUp(self):
+        self.metrics = metrics.ProbeMetrics()
+
+    def test_empty(self):
+        assert self.metrics.render() == (
+            "# HELP django_version_checks_database_version_info Detected database"
+            + " server version, and whether it matches VERSION_CHECKS.\n"
+            + "# TYPE django_version_checks_database_version_info gauge\n"
+            + "# HELP django_version_checks_probes_total Database version probes,"
+            + " by source: live, cache, or timeout.\n"
+            + "# TYPE django_version_checks_probes_total counter\n"
+            + "# HELP django_version_checks_probe_duration_seconds Time taken by"
+            + " database version probes that weren't served from the cache.\n"
+            + "# TYPE django_version_checks_probe_duration_seconds histogram\n"
+        )
+
+    @override_settings(VERSION_CHECKS={"postgresql": {"default": "~=13.1"}})
+    def test_versions(self):
+        self.metrics.observe(
+            alias="default",
+            vendor="postgresql",
+            version=(13, 0),
+            duration=0.1,
+            source="live",
+        )
+        self.metrics.observe(
+            alias="other",
+            vendor="mysql",
+            version=(8, 0, 36),
+            duration=0.0,
+            source="cache",
+        )
+        self.metrics.observe(
+            alias="default",
+            vendor="postgresql",
+            version=(13, 2),
+            duration=0.0,
+            source="cache",
+        )
+
+        lines = self.metrics.render().splitlines()
+
+        assert (
+            'django_version_checks_database_version_info{alias="default",'
+            + 'vendor="postgresql",version="13.2",matched="true"} 1'
+        ) in lines
+        assert (
+            'django_version_checks_database_version_info{alias="other",'
+            + 'vendor="mysql",version="8.0.36",matched="unknown"} 1'
+        ) in lines
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_version_not_matched(self):
+        self.metrics.observe(
+            alias="default",
+            vendor="postgresql",
+            version=(13, 0),
+            duration=0.1,
+            source="live",
+        )
+
+        assert 'version="13.0",matched="false"} 1' in self.metrics.render()
+
+    def test_probes_and_durations(self):
+        for duration, source in [(0.003, "live"), (0.2, "live"), (5.0, "timeout")]:
+            self.metrics.observe(
+                alias="default",
+                vendor="postgresql",
+                version=None if source == "timeout" else (13, 2),
+                duration=duration,
+                source=source,
+            )
+        self.metrics.observe(
+            alias="default",
+            vendor="postgresql",
+            version=(13, 2),
+            duration=0.0,
+            source="cache",
+        )
+
+        lines = self.metrics.render().splitlines()
+
+        name = "django_version_checks_probe_duration_seconds"
+        assert [line for line in lines if not line.startswith("#")] == [
+            'django_version_checks_database_version_info{alias="default",'
+            + 'vendor="postgresql",version="13.2",matched="unknown"} 1',
+            'django_version_checks_probes_total{vendor="postgresql",source="cache"} 1',
+            'django_version_checks_probes_total{vendor="postgresql",source="live"} 2',
+            'django_version_checks_probes_total{vendor="postgresql",source="timeout"}'
+            + " 1",
+            f'{name}_bucket{{vendor="postgresql",le="0.005"}} 1',
+            f'{name}_bucket{{vendor="postgresql",le="0.01"}} 1',
+            f'{name}_bucket{{vendor="postgresql",le="0.025"}} 1',
+            f'{name}_bucket{{vendor="postgresql",le="0.05"}} 1',
+            f'{name}_bucket{{vendor="postgresql",le="0.1"}} 1',
+            f'{name}_bucket{{vendor="postgresql",le="0.25"}} 2',
+            f'{name}_bucket{{vendor="postgresql",le="0.5"}} 2',
+            f'{name}_bucket{{vendor="postgresql",le="1.0"}} 2',
+            f'{name}_bucket{{vendor="postgresql",le="2.5"}} 2',
+            f'{name}_bucket{{vendor="postgresql",le="5.0"}} 3',
+            f'{name}_bucket{{vendor="postgresql",le="10.0"}} 3',
+            f'{name}_bucket{{vendor="postgresql",le="+Inf"}} 3',
+            f'{name}_sum{{vendor="postgresql"}} 5.203',
+            f'{name}_count{{vendor="postgresql"}} 3',
+        ]
+
+    def test_label_escaping(self):
+        self.metrics.observe(
+            alias='a"b\\c\nd',
+            vendor="mysql",
+            version=(8,),
+            duration=0.0,
+            source="cache",
+        )
+
+        assert 'alias="a\\"b\\\\c\\nd"' in self.metrics.render()
+
+
+class StoredVersionsTests(SimpleTestCase):
+    # No check has run in this process, as in a web process serving metrics.
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "versions.json"
+
+    def test_memo(self):
+        probing.get_detected_versions_memo()["default"] = probing.ProbeResult(
+            (3, 45, 1), 0.01, "live"
+        )
+
+        lines = metrics.ProbeMetrics().render().splitlines()
+
+        assert (
+            'django_version_checks_database_version_info{alias="default",'
+            + 'vendor="sqlite",version="3.45.1",matched="unknown"} 1'
+        ) in lines
+
+    @override_settings(VERSION_CHECKS={"sqlite": ">=3.40"})
+    def test_cache(self):
+        fingerprint = connection_fingerprint(connection.settings_dict)
+        VersionCache(self.path, 60).store({fingerprint: (3, 45, 1)})
+
+        with override_settings(VERSION_CHECKS_CACHE_PATH=str(self.path)):
+            lines = metrics.ProbeMetrics().render().splitlines()
+
+        assert (
+            'django_version_checks_database_version_info{alias="default",'
+            + 'vendor="sqlite",version="3.45.1",matched="true"} 1'
+        ) in lines
+        # Only versions are shared, not other processes' probe counts.
+        assert not any(
+            line.startswith("django_version_checks_probes") for line in lines
+        )
+
+    def test_observed_preferred(self):
+        probing.get_detected_versions_memo()["default"] = probing.ProbeResult(
+            (3, 45, 1), 0.01, "live"
+        )
+        probe_metrics = metrics.ProbeMetrics()
+        probe_metrics.observe(
+            alias="default",
+            vendor="sqlite",
+            version=(3, 46, 0),
+            duration=0.01,
+            source="live",
+        )
+
+        rendered = probe_metrics.render()
+
+        assert 'version="3.46.0"' in rendered
+        assert 'version="3.45.1"' not in rendered
+
+
+class ObserveProbeTests(SimpleTestCase):
+    def test_signal(self):
+        self.addCleanup(metrics.probe_metrics.reset)
+        metrics.probe_metrics.reset()
+
+        probing.get_versions([connection], lambda conn: (3, 45))
+
+        assert metrics.probe_metrics.probes == {("sqlite", "live"): 1}
+
+    def test_receiver_connected(self):
+        assert version_probed.has_listeners()
+
+
+class MetricsViewTests(SimpleTestCase):
+    def test_view(self):
+        response = metrics.metrics_view(RequestFactory().get("/metrics"))
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == metrics.CONTENT_TYPE
+        assert response.content.decode() == metrics.render_metrics()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from django_version_checks import probing
+from django_version_checks.management.commands.probe_versions import (
+    build_connection,
+)
+
+
+def sqlite_line(alias: str) -> str:
+    return json.dumps(
+        {"alias": alias, "ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    )
+
+
+class BuildConnectionTests(SimpleTestCase):
+    def test_defaults(self):
+        conn = build_connection(
+            "tenant_1", {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        )
+
+        assert conn.alias == "tenant_1"
+        assert conn.vendor == "sqlite"
+        assert conn.settings_dict["CONN_MAX_AGE"] == 0
+
+
+class ProbeVersionsCommandTests(SimpleTestCase):
+    # Allow the command to connect to in-memory SQLite databases.
+    databases = {"default"}
+
+    def run_command(self, *lines: str, **options: Any) -> list[dict[str, Any]]:
+        stdout = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO("\n".join(lines) + "\n")):
+            call_command("probe_versions", stdout=stdout, **options)
+        return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    def test_stdin(self):
+        results = self.run_command(sqlite_line("tenant_1"))
+
+        assert results == [
+            {
+                "alias": "tenant_1",
+                "vendor": "sqlite",
+                "flavor": None,
+                "version": sqlite3.sqlite_version,
+                "specifier": None,
+                "matched": None,
+                "duration": mock.ANY,
+                "source": "live",
+            }
+        ]
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "databases.jsonl")
+            with open(path, "w") as databases_file:
+                databases_file.write(sqlite_line("tenant_1") + "\n")
+            stdout = io.StringIO()
+            call_command("probe_versions", path, stdout=stdout)
+
+        assert json.loads(stdout.getvalue())["alias"] == "tenant_1"
+
+    @override_settings(VERSION_CHECKS={"sqlite": {"tenant_1": ">=3", "tenant_*": "<3"}})
+    def test_specifiers(self):
+        results = self.run_command(
+            sqlite_line("tenant_1"), sqlite_line("tenant_2"), sqlite_line("other")
+        )
+
+        assert sorted((r["alias"], r["specifier"], r["matched"]) for r in results) == [
+            ("other", None, None),
+            ("tenant_1", ">=3", True),
+            ("tenant_2", "<3", False),
+        ]
+
+    def test_mariadb(self):
+        def detect(conn):
+            conn.vendor = "mysql"
+            conn.__dict__["mysql_server_info"] = "10.11.6-MariaDB"
+            return (10, 11, 6)
+
+        with (
+            override_settings(VERSION_CHECKS={"mysql": ">=8", "mariadb": "~=11.4"}),
+            mock.patch.dict(probing.version_detectors, {"sqlite": detect}),
+        ):
+            results = self.run_command(sqlite_line("tenant_1"))
+
+        assert results[0]["flavor"] == "mariadb"
+        assert results[0]["version"] == "10.11.6"
+        assert results[0]["specifier"] == "~=11.4"
+        assert results[0]["matched"] is False
+
+    def test_bad_lines(self):
+        results = self.run_command(
+            "nope",
+            "[]",
+            json.dumps({"ENGINE": "django.db.backends.sqlite3"}),
+            json.dumps({"alias": "dummy", "ENGINE": "django.db.backends.dummy"}),
+            "",
+            sqlite_line("tenant_1"),
+        )
+
+        assert results[:4] == [
+            {"line": 1, "alias": None, "error": mock.ANY},
+            {"line": 2, "alias": None, "error": "Expected a JSON object."},
+            {"line": 3, "alias": None, "error": "Expected a str alias."},
+            {"line": 4, "alias": "dummy", "error": "Unsupported vendor 'unknown'."},
+        ]
+        assert results[4]["alias"] == "tenant_1"
+
+    def test_detect_error(self):
+        def detect(conn):
+            raise sqlite3.OperationalError("unable to open database file")
+
+        with mock.patch.dict(probing.version_detectors, {"sqlite": detect}):
+            results = self.run_command(sqlite_line("tenant_1"))
+
+        assert results == [
+            {
+                "alias": "tenant_1",
+                "vendor": "sqlite",
+                "error": "unable to open database file",
+            }
+        ]
+
+    def test_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def detect(conn):
+            if conn.alias == "hang":
+                release.wait(5)
+            return (3, 45)
+
+        with mock.patch.dict(probing.version_detectors, {"sqlite": detect}):
+            results = self.run_command(
+                sqlite_line("hang"), sqlite_line("tenant_1"), workers=2, timeout=0.1
+            )
+
+        assert [(r["alias"], r["version"], r["source"]) for r in results] == [
+            ("tenant_1", "3.45", "live"),
+            ("hang", None, "timeout"),
+        ]
+
+    def test_unreachable_bounded_threads(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        peak = 0
+
+        def detect(conn):
+            nonlocal peak
+            live = [
+                thread
+                for thread in threading.enumerate()
+                if thread.name.startswith("django-version-checks-tenant_")
+            ]
+            peak = max(peak, len(live))
+            # Hang past the timeout, until the connection attempt gives up.
+            release.wait(0.1)
+            raise OSError("Connection timed out")
+
+        lines = [sqlite_line(f"tenant_{i}") for i in range(6)]
+        with mock.patch.dict(probing.version_detectors, {"sqlite": detect}):
+            results = self.run_command(*lines, workers=2, timeout=0.03)
+
+        assert [r["source"] for r in results] == ["timeout"] * 6
+        assert peak <= 2
+
+    def test_bad_workers(self):
+        with pytest.raises(CommandError, match="--workers must be at least 1."):
+            self.run_command(workers=-1)
+
+    @override_settings(VERSION_CHECKS_PROBE_WORKERS=4)
+    def test_zero_workers(self):
+        with pytest.raises(CommandError, match="--workers must be at least 1."):
+            self.run_command(workers=0)
+
+    @override_settings(VERSION_CHECKS_PROBE_TIMEOUT=5)
+    def test_bad_timeout(self):
+        with pytest.raises(CommandError, match="--timeout must be greater than 0."):
+            self.run_command(timeout=-1)
+
+    @override_settings(VERSION_CHECKS_PROBE_TIMEOUT=5)
+    def test_zero_timeout(self):
+        with pytest.raises(CommandError, match="--timeout must be greater than 0."):
+            self.run_command(timeout=0)
+
+    @override_settings(VERSION_CHECKS={"sqlite": 3})
+    def test_bad_config(self):
+        with pytest.raises(CommandError, match="is misconfigured"):
+            self.run_command(sqlite_line("tenant_1"))
@@ -0,0 +1,996 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Generator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.core.signals import setting_changed
+from django.db import connection, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+from django.utils.functional import cached_property
+
+from django_version_checks import probing
+from django_version_checks.signals import version_probed
+
+
+class GetProbeWorkersTests(SimpleTestCase):
+    def test_default(self):
+        assert probing.get_probe_workers() == 1
+
+    @override_settings(VERSION_CHECKS_PROBE_WORKERS=8)
+    def test_setting(self):
+        assert probing.get_probe_workers() == 8
+
+    @override_settings(VERSION_CHECKS_PROBE_WORKERS=0)
+    def test_bad_setting(self):
+        assert probing.get_probe_workers() == 1
+
+
+SQLiteDatabaseWrapper = type(connections["default"])
+
+
+class FakeDriverConnection:
+    def __init__(self, **attrs: object) -> None:
+        self.__dict__.update(attrs)
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_connection(wrapper_class: Any, alias: str) -> Any:
+    # A file database, since SQLite ignores closing in-memory databases.
+    settings_dict = {**connections["default"].settings_dict, "NAME": "fake.sqlite3"}
+    return wrapper_class(settings_dict, alias=alias)
+
+
+class FakePostgreSQLWrapper(SQLiteDatabaseWrapper):  # type: ignore [misc,valid-type]
+    vendor = "postgresql"
+    pg_version_queries = 0
+
+    @cached_property
+    def pg_version(self):
+        self.pg_version_queries += 1
+        return 12_00_05
+
+
+class FakeMySQLWrapper(SQLiteDatabaseWrapper):  # type: ignore [misc,valid-type]
+    vendor = "mysql"
+    mysql_server_info_queries = 0
+
+    @cached_property
+    def mysql_server_info(self):
+        self.mysql_server_info_queries += 1
+        return "8.0.36"
+
+    @cached_property
+    def mysql_version(self):
+        match = re.match(r"(\d+)\.(\d+)\.(\d+)", self.mysql_server_info)
+        assert match is not None
+        return tuple(int(x) for x in match.groups())
+
+
+def fake_connect(conn: Any, raw: FakeDriverConnection) -> Any:
+    def ensure_connection():
+        if conn.connection is None:
+            conn.connection = raw
+
+    return mock.patch.object(conn, "ensure_connection", ensure_connection)
+
+
+class RawConnectionTests(SimpleTestCase):
+    def test_opened_and_closed(self):
+        conn = make_connection(FakePostgreSQLWrapper, "pg")
+        raw = FakeDriverConnection()
+
+        with fake_connect(conn, raw), probing.raw_connection(conn) as yielded:
+            assert yielded is raw
+
+        assert conn.connection is None
+        assert raw.closed
+
+    def test_reused_kept_open(self):
+        conn = make_connection(FakePostgreSQLWrapper, "pg")
+        raw = FakeDriverConnection()
+        probing.reused_connections.add(conn)
+        self.addCleanup(probing.reused_connections.discard, conn)
+
+        with fake_connect(conn, raw), probing.raw_connection(conn):
+            pass
+
+        assert conn.connection is raw
+        assert not raw.closed
+
+
+class DetectPostgresqlVersionTests(SimpleTestCase):
+    def make_connection(self) -> Any:
+        return make_connection(FakePostgreSQLWrapper, "pg")
+
+    def test_old_version(self):
+        conn = self.make_connection()
+        conn.__dict__["pg_version"] = 9_01_05
+
+        version = probing.detect_postgresql_version(conn)
+
+        assert version == (9, 1, 5)
+
+    def test_new_version(self):
+        conn = self.make_connection()
+        conn.__dict__["pg_version"] = 13_00_02
+
+        version = probing.detect_postgresql_version(conn)
+
+        assert version == (13, 2)
+
+    def test_handshake_open_connection(self):
+        conn = self.make_connection()
+        raw = FakeDriverConnection(info=SimpleNamespace(server_version=16_00_02))
+        conn.connection = raw
+
+        version = probing.detect_postgresql_version(conn)
+
+        assert version == (16, 2)
+        assert conn.pg_version_queries == 0
+        assert conn.__dict__["pg_version"] == 16_00_02
+        assert conn.connection is raw
+        assert not raw.closed
+
+    def test_handshake_new_connection(self):
+        conn = self.make_connection()
+        raw = FakeDriverConnection(info=SimpleNamespace(server_version=16_00_02))
+
+        with fake_connect(conn, raw):
+            version = probing.detect_postgresql_version(conn)
+
+        assert version == (16, 2)
+        assert conn.pg_version_queries == 0
+        assert conn.connection is None
+        assert raw.closed
+
+    def test_fallback(self):
+        conn = self.make_connection()
+        raw = FakeDriverConnection()
+
+        with fake_connect(conn, raw):
+            version = probing.detect_postgresql_version(conn)
+
+        assert version == (12, 5)
+        assert conn.pg_version_queries == 1
+        assert raw.closed
+
+
+class QueryingMySQLWrapper(FakeMySQLWrapper):
+    # Like Django's MySQL backend, initializing the connection queries it.
+    def init_connection_state(self):
+        raise AssertionError("Initialized the connection")
+
+
+def fake_new_connection(conn: Any, raw: FakeDriverConnection) -> Any:
+    return mock.patch.object(conn, "get_new_connection", return_value=raw)
+
+
+class DetectMysqlVersionTests(SimpleTestCase):
+    def make_connection(self) -> Any:
+        return make_connection(QueryingMySQLWrapper, "mysql")
+
+    def test_cached(self):
+        conn = self.make_connection()
+        conn.__dict__["mysql_version"] = (10, 5, 8)
+
+        version = probing.detect_mysql_version(conn)
+
+        assert version == (10, 5, 8)
+
+    def test_handshake_open_connection(self):
+        conn = self.make_connection()
+        raw = FakeDriverConnection(get_server_info=lambda: "8.4.2")
+        conn.connection = raw
+
+        version = probing.detect_mysql_version(conn)
+
+        assert version == (8, 4, 2)
+        assert conn.mysql_server_info_queries == 0
+        assert conn.connection is raw
+        assert not raw.closed
+
+    def test_handshake_mariadb_prefix(self):
+        conn = self.make_connection()
+        raw = FakeDriverConnection(
+            get_server_info=lambda: "5.5.5-10.11.6-MariaDB-0+deb12u1"
+        )
+
+        with fake_new_connection(conn, raw):
+            version = probing.detect_mysql_version(conn)
+
+        assert version == (10, 11, 6)
+        assert conn.mysql_server_info_queries == 0
+        assert raw.closed
+        assert conn.connection is None
+
+    def test_handshake_reused_connection(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+        raw = FakeDriverConnection(get_server_info=lambda: "8.4.2")
+        probing.reused_connections.add(conn)
+        self.addCleanup(probing.reused_connections.discard, conn)
+
+        with fake_connect(conn, raw):
+            version = probing.detect_mysql_version(conn)
+
+        assert version == (8, 4, 2)
+        assert conn.connection is raw
+        assert not raw.closed
+
+    def test_fallback(self):
+        conn = self.make_connection()
+        raw = FakeDriverConnection()
+
+        with fake_new_connection(conn, raw):
+            version = probing.detect_mysql_version(conn)
+
+        assert version == (8, 0, 36)
+        assert conn.mysql_server_info_queries == 1
+        assert raw.closed
+
+
+class FakeSettingsCursor:
+    def __init__(self, rows: list[tuple[str, str, str | None, str]]) -> None:
+        self.rows = rows
+        self.queries: list[tuple[str, list[list[str]]]] = []
+        self.closed = False
+
+    def execute(self, sql: str, params: list[list[str]]) -> None:
+        self.queries.append((sql, params))
+
+    def fetchall(self) -> list[tuple[str, str, str | None, str]]:
+        return [row for row in self.rows if row[0] in self.queries[-1][1][0]]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class GetPostgresqlSettingsTests(SimpleTestCase):
+    rows = [
+        ("jit", "off", None, "bool"),
+        ("shared_buffers", "16384", "8kB", "integer"),
+    ]
+
+    def test_batched(self):
+        conn = make_connection(FakePostgreSQLWrapper, "pg")
+        cursor = FakeSettingsCursor(self.rows)
+        raw = FakeDriverConnection(cursor=lambda: cursor)
+
+        with fake_connect(conn, raw):
+            result = probing.get_postgresql_settings(
+                conn, ["jit", "shared_buffers", "made_up"]
+            )
+
+        assert result == {
+            "jit": probing.PostgresqlSetting("off", None, "bool"),
+            "shared_buffers": probing.PostgresqlSetting("16384", "8kB", "integer"),
+            "made_up": None,
+        }
+        assert len(cursor.queries) == 1
+        assert cursor.queries[0][1] == [["jit", "shared_buffers", "made_up"]]
+        assert cursor.closed
+        assert raw.closed
+
+    def test_cached(self):
+        conn = make_connection(FakePostgreSQLWrapper, "pg")
+        cursor = FakeSettingsCursor(self.rows)
+        raw = FakeDriverConnection(cursor=lambda: cursor)
+        conn.connection = raw
+
+        probing.get_postgresql_settings(conn, ["jit", "made_up"])
+        result = probing.get_postgresql_settings(
+            conn, ["made_up", "shared_buffers", "jit"]
+        )
+
+        assert result == {
+            "made_up": None,
+            "shared_buffers": probing.PostgresqlSetting("16384", "8kB", "integer"),
+            "jit": probing.PostgresqlSetting("off", None, "bool"),
+        }
+        assert [params for _, params in cursor.queries] == [
+            [["jit", "made_up"]],
+            [["shared_buffers"]],
+        ]
+
+    def test_all_cached(self):
+        conn = make_connection(FakePostgreSQLWrapper, "pg")
+        conn.__dict__["pg_settings"] = {"jit": None}
+
+        with mock.patch.object(conn, "ensure_connection") as ensure_connection:
+            result = probing.get_postgresql_settings(conn, ["jit"])
+
+        assert result == {"jit": None}
+        ensure_connection.assert_not_called()
+
+
+class DetectFlavorTests(SimpleTestCase):
+    def test_mariadb(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+        conn.__dict__["mysql_server_info"] = "10.11.6-MariaDB-log"
+
+        assert probing.detect_flavor(conn) == "mariadb"
+
+    def test_mysql(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+        conn.__dict__["mysql_server_info"] = "8.0.36"
+
+        assert probing.detect_flavor(conn) == "mysql"
+
+    def test_unknown(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+
+        assert probing.detect_flavor(conn) is None
+        assert conn.mysql_server_info_queries == 0
+
+    def test_other_vendor(self):
+        conn = make_connection(FakePostgreSQLWrapper, "pg")
+
+        assert probing.detect_flavor(conn) is None
+
+    def test_timed_detect(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+        raw = FakeDriverConnection(get_server_info=lambda: "5.5.5-10.5.8-MariaDB")
+        conn.connection = raw
+
+        result = probing.timed_detect(probing.detect_mysql_version, conn)
+
+        assert result.version == (10, 5, 8)
+        assert result.flavor == "mariadb"
+
+
+class FakeVariablesCursor:
+    def __init__(self, rows: list[tuple[str, str]]) -> None:
+        self.rows = rows
+        self.queries: list[tuple[str, list[str]]] = []
+        self.closed = False
+
+    def execute(self, sql: str, params: list[str]) -> None:
+        self.queries.append((sql, params))
+
+    def fetchall(self) -> list[tuple[str, str]]:
+        return self.rows
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class GetMysqlVariablesTests(SimpleTestCase):
+    rows = [
+        ("innodb_buffer_pool_size", "134217728"),
+        ("transaction_isolation", "REPEATABLE-READ"),
+    ]
+
+    def test_batched(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+        cursor = FakeVariablesCursor(self.rows)
+        raw = FakeDriverConnection(cursor=lambda: cursor)
+
+        with fake_connect(conn, raw):
+            result = probing.get_mysql_variables(
+                conn, ["innodb_buffer_pool_size", "transaction_isolation", "made_up"]
+            )
+
+        assert result == {
+            "innodb_buffer_pool_size": "134217728",
+            "transaction_isolation": "REPEATABLE-READ",
+            "made_up": None,
+        }
+        assert cursor.queries == [
+            (
+                "SHOW VARIABLES WHERE Variable_name IN (%s, %s, %s)",
+                ["innodb_buffer_pool_size", "transaction_isolation", "made_up"],
+            )
+        ]
+        assert cursor.closed
+        assert raw.closed
+
+    def test_cached(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+        conn.__dict__["mysql_variables"] = {"made_up": None}
+
+        with mock.patch.object(conn, "ensure_connection") as ensure_connection:
+            result = probing.get_mysql_variables(conn, ["made_up"])
+
+        assert result == {"made_up": None}
+        ensure_connection.assert_not_called()
+
+
+class DetectVersionTests(SimpleTestCase):
+    def test_dispatch(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+        conn.__dict__["mysql_version"] = (8, 0, 36)
+
+        version = probing.detect_version(conn)
+
+        assert version == (8, 0, 36)
+
+
+class FormatVersionTests(SimpleTestCase):
+    def test_format(self):
+        assert probing.format_version((13, 2)) == "13.2"
+
+
+class DetectSqliteVersionTests(SimpleTestCase):
+    databases = {"default"}
+
+    def test_version(self):
+        conn = connection.copy()
+
+        version = probing.detect_sqlite_version(conn)
+
+        assert version == sqlite3.sqlite_version_info
+        assert "THREADSAFE=1" in conn.__dict__["sqlite_compile_options"]
+
+    def test_cached(self):
+        conn = connection.copy()
+        conn.__dict__["sqlite_version"] = "3.99.1"
+
+        version = probing.detect_sqlite_version(conn)
+
+        assert version == (3, 99, 1)
+        assert conn.connection is None
+
+    def test_compile_options_single_trip(self):
+        conn = connection.copy()
+
+        with mock.patch.object(conn, "connect", wraps=conn.connect) as mock_connect:
+            probing.detect_sqlite_version(conn)
+            options = probing.get_sqlite_compile_options(conn)
+
+        assert mock_connect.call_count == 1
+        assert options == conn.__dict__["sqlite_compile_options"]
+
+
+class ProbeVersionsTests(SimpleTestCase):
+    def test_empty(self):
+        assert probing.probe_versions([], lambda c: (1,), workers=4) == []
+
+    def test_sequential(self):
+        threads = set()
+
+        def detect(conn):
+            threads.add(threading.get_ident())
+            return (int(conn.alias),)
+
+        conns = [connection.copy(alias=str(i)) for i in range(3)]
+
+        results = probing.probe_versions(conns, detect)
+
+        assert [r.version for r in results] == [(0,), (1,), (2,)]
+        assert all(r.source == "live" and r.duration >= 0 for r in results)
+        assert threads == {threading.get_ident()}
+
+    def test_concurrent_keeps_order(self):
+        # All three probes must be in flight at once to pass the barrier.
+        barrier = threading.Barrier(3, timeout=5)
+
+        def detect(conn):
+            conn.validate_thread_sharing()
+            barrier.wait()
+            return (int(conn.alias),)
+
+        conns = [connection.copy(alias=str(i)) for i in range(3)]
+
+        results = probing.probe_versions(conns, detect, workers=3)
+
+        assert [r.version for r in results] == [(0,), (1,), (2,)]
+        assert all(not c.allow_thread_sharing for c in conns)
+
+
+class GetVersionsTests(SimpleTestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_path = Path(temp_dir.name) / "versions.json"
+
+    def test_no_cache(self):
+        calls = []
+
+        def detect(conn):
+            calls.append(conn.alias)
+            return (13, 2)
+
+        results = probing.get_versions([connection], detect)
+
+        assert [r.version for r in results] == [(13, 2)]
+        assert calls == ["default"]
+
+    def test_cache(self):
+        calls = []
+
+        def detect(conn):
+            calls.append(conn.alias)
+            return (13, 2)
+
+        with override_settings(VERSION_CHECKS_CACHE_PATH=self.cache_path):
+            cold = probing.get_versions([connection], detect)
+            warm = probing.get_versions([connection], detect)
+
+        assert [(r.version, r.source) for r in cold] == [((13, 2), "live")]
+        assert warm == [probing.ProbeResult((13, 2), 0.0, "cache")]
+        assert calls == ["default"]
+
+    def test_cache_flavor(self):
+        conn = make_connection(FakeMySQLWrapper, "mysql")
+
+        def detect(conn):
+            conn.__dict__["mysql_server_info"] = "10.11.6-MariaDB"
+            return (10, 11, 6)
+
+        with override_settings(VERSION_CHECKS_CACHE_PATH=self.cache_path):
+            probing.get_versions([conn], detect)
+            conn.__dict__.pop("mysql_server_info")
+            warm = probing.get_versions([conn], detect)
+
+        assert warm == [probing.ProbeResult((10, 11, 6), 0.0, "cache", "mariadb")]
+
+    def test_cache_partial(self):
+        other = connection.copy(alias="other")
+        other.settings_dict["NAME"] = "other.sqlite3"
+        calls = []
+
+        def detect(conn):
+            calls.append(conn.alias)
+            return (len(calls),)
+
+        with override_settings(VERSION_CHECKS_CACHE_PATH=self.cache_path):
+            probing.get_versions([connection], detect)
+            results = probing.get_versions([connection, other], detect)
+
+        assert [(r.version, r.source) for r in results] == [
+            ((1,), "cache"),
+            ((2,), "live"),
+        ]
+        assert calls == ["default", "other"]
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="Requires the fork start method.",
+    )
+    def test_cache_shared_between_processes(self):
+        context = multiprocessing.get_context("fork")
+        barrier = context.Barrier(4)
+        sources = context.Queue()
+
+        def worker():
+            def detect(conn):
+                time.sleep(0.2)
+                return (13, 2)
+
+            barrier.wait()
+            with override_settings(VERSION_CHECKS_CACHE_PATH=self.cache_path):
+                results = probing.get_versions([connection.copy()], detect)
+            sources.put(results[0].source)
+
+        processes = [context.Process(target=worker) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(10)
+
+        assert all(process.exitcode == 0 for process in processes)
+        assert sorted(sources.get(timeout=1) for _ in processes) == [
+            "cache",
+            "cache",
+            "cache",
+            "live",
+        ]
+
+    def test_cache_lock_unavailable(self):
+        # Locking is best-effort, so an unusable lock file still probes.
+        self.cache_path.with_name("versions.json.lock").mkdir()
+
+        with override_settings(VERSION_CHECKS_CACHE_PATH=self.cache_path):
+            results = probing.get_versions([connection], lambda conn: (13, 2))
+
+        assert [(r.version, r.source) for r in results] == [((13, 2), "live")]
+
+    def test_records_probes(self):
+        probes = []
+
+        def receiver(sender, **kwargs):
+            probes.append((sender, kwargs))
+
+        version_probed.connect(receiver)
+        self.addCleanup(version_probed.disconnect, receiver)
+
+        results = probing.get_versions([connection], lambda conn: (13, 2))
+
+        assert probes == [
+            (
+                type(connection),
+                {
+                    "signal": version_probed,
+                    "alias": "default",
+                    "vendor": "sqlite",
+                    "version": (13, 2),
+                    "duration": results[0].duration,
+                    "source": "live",
+                    "flavor": None,
+                },
+            )
+        ]
+
+
+class GetDetectedVersionsTests(SimpleTestCase):
+    def test_memoized(self):
+        detect = mock.Mock(side_effect=[(13, 2), (14, 0)])
+
+        first = probing.get_detected_versions([connection], detect)
+        second = probing.get_detected_versions([connection], detect)
+
+        assert first == second
+        assert detect.call_count == 1
+
+    def test_timeout_not_memoized(self):
+        results = [
+            [probing.ProbeResult(None, 1.0, "timeout")],
+            [probing.ProbeResult((13, 2), 0.1, "live")],
+        ]
+
+        with mock.patch.object(probing, "get_versions", side_effect=results):
+            first = probing.get_detected_versions([connection], probing.detect_version)
+            second = probing.get_detected_versions([connection], probing.detect_version)
+
+        assert first[0].version is None
+        assert second[0].version == (13, 2)
+
+    def test_cleared_in_child_process(self):
+        detect = mock.Mock(side_effect=[(13, 2), (14, 0)])
+        probing.get_detected_versions([connection], detect)
+
+        with mock.patch.object(os, "getpid", return_value=-1):
+            results = probing.get_detected_versions([connection], detect)
+
+        assert results[0].version == (14, 0)
+
+    def test_cleared_on_databases_change(self):
+        detect = mock.Mock(side_effect=[(13, 2), (14, 0)])
+        probing.get_detected_versions([connection], detect)
+
+        with pytest.warns(UserWarning, match="Overriding setting DATABASES"):
+            setting_changed.send(
+                sender=self.__class__, setting="DATABASES", value={}, enter=True
+            )
+        results = probing.get_detected_versions([connection], detect)
+
+        assert results[0].version == (14, 0)
+
+    def test_async(self):
+        detect = mock.Mock(side_effect=[(13, 2), (14, 0)])
+        conn = connection.copy()
+
+        first = asyncio.run(probing.aget_detected_versions([conn], detect))
+        second = asyncio.run(probing.aget_detected_versions([conn], detect))
+
+        assert first == second
+        assert detect.call_count == 1
+
+
+class GetProbeTimeoutTests(SimpleTestCase):
+    def test_default(self):
+        assert probing.get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT") is None
+
+    @override_settings(VERSION_CHECKS_PROBE_TIMEOUT=2.5)
+    def test_setting(self):
+        assert probing.get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT") == 2.5
+
+    @override_settings(VERSION_CHECKS_PROBE_TIMEOUT=0)
+    def test_bad_setting(self):
+        assert probing.get_probe_timeout("VERSION_CHECKS_PROBE_TIMEOUT") is None
+
+
+class DetectWithinTests(SimpleTestCase):
+    def setUp(self):
+        self.seen = []
+
+    def detect(self, conn):
+        self.seen.append(conn)
+        return (1,)
+
+    def test_no_timeout(self):
+        conn = connection.copy()
+
+        probing.detect_within(self.detect, conn, None)
+
+        assert self.seen == [conn]
+
+    def test_unsupported_vendor(self):
+        conn = connection.copy()
+
+        probing.detect_within(self.detect, conn, 1.5)
+
+        assert self.seen == [conn]
+
+    def test_connect_timeout(self):
+        conn = connection.copy()
+        conn.vendor = "postgresql"
+
+        version = probing.detect_within(self.detect, conn, 1.5)
+
+        assert version == (1,)
+        assert len(self.seen) == 1
+        assert self.seen[0] is not conn
+        assert self.seen[0].settings_dict["OPTIONS"]["connect_timeout"] == 2
+        assert "connect_timeout" not in conn.settings_dict["OPTIONS"]
+
+    def test_connect_timeout_keeps_detected(self):
+        conn = connection.copy()
+        conn.vendor = "mysql"
+
+        def detect(probe_conn):
+            probe_conn.__dict__["mysql_server_info"] = "10.11.6-MariaDB"
+            return (10, 11, 6)
+
+        probing.detect_within(detect, conn, 1.5)
+
+        assert conn.__dict__["mysql_server_info"] == "10.11.6-MariaDB"
+
+    def test_connect_timeout_shares_cached(self):
+        conn = connection.copy()
+        conn.vendor = "postgresql"
+        conn.__dict__["pg_settings"] = {"jit": None}
+        raw = FakeDriverConnection()
+
+        def fetch(probe_conn):
+            # Only the setting not yet cached is fetched.
+            with fake_connect(probe_conn, raw):
+                return probing.get_postgresql_settings(probe_conn, ["jit"])
+
+        result = probing.detect_within(fetch, conn, 1.5)
+
+        assert result == {"jit": None}
+        assert raw.closed is False
+        assert conn.connection is None
+
+    def test_connect_timeout_already_set(self):
+        conn = connection.copy()
+        conn.vendor = "mysql"
+        conn.settings_dict["OPTIONS"]["connect_timeout"] = 10
+
+        probing.detect_within(self.detect, conn, 1.5)
+
+        assert self.seen[0].settings_dict["OPTIONS"]["connect_timeout"] == 10
+
+
+class ProbeVersionsBoundedTests(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def detect(self, conn):
+        if conn.alias.startswith("hang"):
+            self.release.wait(5)
+        return (int(conn.alias[-1]),)
+
+    def test_all_finish(self):
+        conns = [connection.copy(alias=str(i)) for i in range(3)]
+
+        results = probing.probe_versions(conns, self.detect, workers=2, timeout=5)
+
+        assert [r.version for r in results] == [(0,), (1,), (2,)]
+        assert all(r.source == "live" for r in results)
+        assert all(not c.allow_thread_sharing for c in conns)
+
+    def test_timeout(self):
+        conns = [connection.copy(alias=a) for a in ["0", "hang1", "2", "3"]]
+
+        results = probing.probe_versions(conns, self.detect, workers=2, timeout=0.1)
+
+        assert [(r.version, r.source) for r in results] == [
+            ((0,), "live"),
+            (None, "timeout"),
+            ((2,), "live"),
+            ((3,), "live"),
+        ]
+        assert results[1].duration >= 0.1
+
+    def test_deadline(self):
+        conns = [connection.copy(alias=a) for a in ["hang0", "1"]]
+
+        results = probing.probe_versions(conns, self.detect, deadline=0.1)
+
+        assert results == [
+            probing.ProbeResult(None, results[0].duration, "timeout"),
+            probing.ProbeResult(None, 0.0, "timeout"),
+        ]
+
+    def test_error(self):
+        def detect(conn):
+            raise ValueError("Boom")
+
+        with pytest.raises(ValueError, match="Boom"):
+            probing.probe_versions([connection.copy()], detect, timeout=5)
+
+    def test_abandoned_keep_workers(self):
+        # Release the hung probes after they've timed out, so the rest run.
+        timer = threading.Timer(0.2, self.release.set)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        lock = threading.Lock()
+        live = 0
+        peak = 0
+
+        def detect(conn):
+            nonlocal live, peak
+            with lock:
+                live += 1
+                peak = max(peak, live)
+            try:
+                self.release.wait(5)
+            finally:
+                with lock:
+                    live -= 1
+            return (1,)
+
+        conns = [connection.copy(alias=f"hang{i}") for i in range(6)]
+
+        results = probing.probe_versions(conns, detect, workers=2, timeout=0.05)
+
+        # The rest waited for the hung probes to free their workers.
+        assert [r.source for r in results] == ["timeout"] * 2 + ["live"] * 4
+        assert peak == 2
+
+    def test_finish_after_timeout(self):
+        # "0" fails after timing out, while "3" is still running.
+        delays = {"0": 0.3, "1": 0.05, "2": 0.5, "3": 0.15}
+
+        def detect(conn):
+            time.sleep(delays[conn.alias])
+            if conn.alias == "0":
+                raise ValueError("Boom")
+            return (int(conn.alias),)
+
+        conns = [connection.copy(alias=a) for a in delays]
+
+        results = probing.probe_versions(conns, detect, workers=2, timeout=0.2)
+
+        assert [(r.version, r.source) for r in results] == [
+            (None, "timeout"),
+            ((1,), "live"),
+            (None, "timeout"),
+            ((3,), "live"),
+        ]
+
+
+class StreamVersionsTests(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def detect(self, conn):
+        if conn.alias.startswith("hang"):
+            self.release.wait(5)
+        if conn.alias.startswith("fail"):
+            raise ValueError("Boom")
+        return (int(conn.alias[-1]),)
+
+    def test_empty(self):
+        results = probing.stream_versions([], self.detect, workers=2, timeout=None)
+
+        assert list(results) == []
+
+    def test_all_finish(self):
+        conns = [connection.copy(alias=str(i)) for i in range(3)]
+
+        results = probing.stream_versions(conns, self.detect, workers=2, timeout=5)
+
+        versions = {c.alias: r for c, r in results}
+        assert versions == {
+            "0": probing.ProbeResult((0,), mock.ANY, "live"),
+            "1": probing.ProbeResult((1,), mock.ANY, "live"),
+            "2": probing.ProbeResult((2,), mock.ANY, "live"),
+        }
+        assert all(not c.allow_thread_sharing for c in conns)
+
+    def test_takes_connections_as_workers_free(self):
+        taken = []
+
+        def connections() -> Generator[BaseDatabaseWrapper]:
+            for i in range(5):
+                taken.append(i)
+                yield connection.copy(alias=str(i))
+
+        results = probing.stream_versions(
+            connections(), self.detect, workers=2, timeout=None
+        )
+        first, _ = next(results)
+
+        assert taken == [0, 1]
+        assert first.alias in ["0", "1"]
+        assert len(list(results)) == 4
+
+    def test_timeout(self):
+        conns = [connection.copy(alias=a) for a in ["hang0", "1", "2"]]
+
+        results = list(
+            probing.stream_versions(conns, self.detect, workers=2, timeout=0.1)
+        )
+
+        assert [c.alias for c, _ in results][-1] == "hang0"
+        result = results[-1][1]
+        assert isinstance(result, probing.ProbeResult)
+        assert result.version is None
+        assert result.source == "timeout"
+        assert result.duration >= 0.1
+        assert sorted(c.alias for c, _ in results[:-1]) == ["1", "2"]
+
+    def test_error(self):
+        conns = [connection.copy(alias="fail0")]
+
+        results = list(
+            probing.stream_versions(conns, self.detect, workers=1, timeout=None)
+        )
+
+        assert len(results) == 1
+        assert isinstance(results[0][1], ValueError)
+
+
+class AprobeVersionsTests(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def detect(self, conn):
+        if conn.alias.startswith("hang"):
+            self.release.wait(5)
+        return (int(conn.alias[-1]),)
+
+    def test_empty(self):
+        assert asyncio.run(probing.aprobe_versions([], self.detect)) == []
+
+    def test_all_finish(self):
+        conns = [connection.copy(alias=str(i)) for i in range(3)]
+
+        results = asyncio.run(probing.aprobe_versions(conns, self.detect))
+
+        assert [r.version for r in results] == [(0,), (1,), (2,)]
+        assert all(r.source == "live" for r in results)
+        assert all(not c.allow_thread_sharing for c in conns)
+
+    def test_concurrent(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def detect(conn):
+            barrier.wait()
+            return (1,)
+
+        conns = [connection.copy(alias=str(i)) for i in range(3)]
+
+        results = asyncio.run(probing.aprobe_versions(conns, detect))
+
+        assert [r.version for r in results] == [(1,), (1,), (1,)]
+
+    def test_timeout(self):
+        conns = [connection.copy(alias=a) for a in ["0", "hang1", "2"]]
+
+        results = asyncio.run(probing.aprobe_versions(conns, self.detect, deadline=0.1))
+
+        assert [(r.version, r.source) for r in results] == [
+            ((0,), "live"),
+            (None, "timeout"),
+            ((2,), "live"),
+        ]
+        assert results[1].duration >= 0.1
+
+    def test_error(self):
+        def detect(conn):
+            raise ValueError("Boom")
+
+        with pytest.raises(ValueError, match="Boom"):
+            asyncio.run(probing.aprobe_versions([connection.copy()], detect))
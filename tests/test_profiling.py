@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import tempfile
+from contextlib import ExitStack
+from unittest import mock
+
+from django.core import checks as django_checks
+from django.core.checks import Error, Tags
+from django.core.checks import registry as registry_module
+from django.core.checks.registry import CheckRegistry
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import SimpleTestCase, override_settings
+
+from django_version_checks import profiling
+from django_version_checks.profiling import CheckProfile
+
+
+def query_check(**kwargs):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+    connection_created.send(sender=type(connection), connection=connection)
+    return [Error("Queried.", id="tests.E001")]
+
+
+def quiet_check(**kwargs):
+    return []
+
+
+class ProfileChecksTests(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        # Count only the connection query_check reports opening.
+        connection.ensure_connection()
+        self.registry = CheckRegistry()
+        self.registry.register(query_check, Tags.database)
+        self.registry.register(quiet_check, Tags.compatibility)
+
+    def test_profiles(self):
+        with profiling.profile_checks(self.registry) as profiles:
+            errors = self.registry.run_checks()
+
+        assert [e.id for e in errors] == ["tests.E001"]
+        assert sorted((p.name, p.queries, p.connections_opened) for p in profiles) == [
+            ("tests.test_profiling.query_check", 2, 1),
+            ("tests.test_profiling.quiet_check", 0, 0),
+        ]
+        assert all(p.duration >= 0 for p in profiles)
+
+    def test_tags(self):
+        with profiling.profile_checks(self.registry) as profiles:
+            self.registry.run_checks(tags=[Tags.compatibility])
+
+        assert [p.name for p in profiles] == ["tests.test_profiling.quiet_check"]
+
+    def test_restores(self):
+        with profiling.profile_checks(self.registry):
+            pass
+
+        assert "get_checks" not in vars(self.registry)
+        assert len(self.registry.get_checks()) == 2
+        assert connection.execute_wrappers == []
+
+
+class FormatProfilesTests(SimpleTestCase):
+    def test_format(self):
+        profiles = [
+            CheckProfile("app.checks.fast", 0.0012, 0, 0),
+            CheckProfile("app.checks.slow", 0.25, 3, 1),
+        ]
+
+        assert profiling.format_profiles(profiles) == (
+            "Ran 2 system checks in 251.2ms.\n"
+            + "  Duration  Queries  Connections  Check\n"
+            + "   250.0ms        3            1  app.checks.slow\n"
+            + "     1.2ms        0            0  app.checks.fast\n"
+        )
+
+
+class ReportProfilesTests(SimpleTestCase):
+    profiles = [
+        CheckProfile("app.checks.fast", 0.001, 0, 0),
+        CheckProfile("app.checks.slow", 0.25, 3, 1),
+    ]
+
+    def test_disabled(self):
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            profiling.report_profiles(self.profiles)
+
+        assert stderr.getvalue() == ""
+
+    @override_settings(VERSION_CHECKS_PROFILE=True)
+    def test_stderr(self):
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            profiling.report_profiles(self.profiles)
+
+        assert stderr.getvalue() == profiling.format_profiles(self.profiles)
+
+    def test_json(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "profile.json")
+            with override_settings(VERSION_CHECKS_PROFILE=path):
+                profiling.report_profiles(self.profiles)
+            with open(path) as profile_file:
+                data = json.load(profile_file)
+
+        assert data == {
+            "duration": 0.251,
+            "checks": [
+                {
+                    "name": "app.checks.slow",
+                    "duration": 0.25,
+                    "queries": 3,
+                    "connections_opened": 1,
+                },
+                {
+                    "name": "app.checks.fast",
+                    "duration": 0.001,
+                    "queries": 0,
+                    "connections_opened": 0,
+                },
+            ],
+        }
+
+
+class InstallProfilerTests(SimpleTestCase):
+    def setUp(self):
+        registry = CheckRegistry()
+        registry.register(quiet_check)
+        stack = ExitStack()
+        self.addCleanup(stack.close)
+        stack.enter_context(mock.patch.object(registry_module, "registry", registry))
+        stack.enter_context(
+            mock.patch.object(registry_module, "run_checks", registry.run_checks)
+        )
+        stack.enter_context(
+            mock.patch.object(django_checks, "run_checks", registry.run_checks)
+        )
+
+    @override_settings(VERSION_CHECKS_PROFILE=True)
+    def test_install(self):
+        profiling.install_profiler()
+        profiling.install_profiler()
+
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            errors = django_checks.run_checks()
+
+        assert errors == []
+        assert registry_module.run_checks is django_checks.run_checks
+        assert registry_module.registry.run_checks is django_checks.run_checks
+        lines = stderr.getvalue().splitlines()
+        assert lines[0].startswith("Ran 1 system check in ")
+        assert lines[2].endswith("  tests.test_profiling.quiet_check")
+        assert len(lines) == 3
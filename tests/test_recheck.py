@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.db import connection, connections
+from django.test import SimpleTestCase, override_settings
+from packaging.specifiers import SpecifierSet
+
+from django_version_checks import checks, probing, recheck
+from django_version_checks.signals import version_drifted
+
+
+class RecheckVersionsTests(SimpleTestCase):
+    def setUp(self):
+        recheck.last_matched.clear()
+        self.addCleanup(recheck.last_matched.clear)
+        self.drifts: list[dict[str, Any]] = []
+
+        def receiver(sender, **kwargs):
+            self.drifts.append(kwargs)
+
+        version_drifted.connect(receiver)
+        self.addCleanup(version_drifted.disconnect, receiver)
+
+        mock_vendor = mock.patch.object(connection, "vendor", "postgresql")
+        mock_vendor.start()
+        self.addCleanup(mock_vendor.stop)
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_in_range(self):
+        detect = mock.Mock(return_value=(13, 2))
+
+        with mock.patch.dict(probing.version_detectors, {"postgresql": detect}):
+            report = recheck.recheck_versions(databases=["default"])
+
+        assert [(r.alias, r.version, r.matched) for r in report] == [
+            ("default", (13, 2), True)
+        ]
+        assert self.drifts == []
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_drift(self):
+        with mock.patch.dict(
+            probing.version_detectors,
+            {"postgresql": mock.Mock(side_effect=[(13, 2), (13, 0), (13, 0)])},
+        ):
+            checks.get_version_report()
+            with self.assertLogs("django_version_checks", "WARNING") as logs:
+                recheck.recheck_versions()
+            recheck.recheck_versions()
+
+        assert self.drifts == [
+            {
+                "signal": version_drifted,
+                "alias": "default",
+                "vendor": "postgresql",
+                "version": (13, 0),
+                "previous_version": (13, 2),
+                "specifier": SpecifierSet("~=13.1"),
+            }
+        ]
+        assert logs.output == [
+            "WARNING:django_version_checks:The postgresql version of the default"
+            + " database connection changed from 13.2 to 13.0, which does not"
+            + " match the specified range (~=13.1)."
+        ]
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_drift_again_after_recovery(self):
+        with mock.patch.dict(
+            probing.version_detectors,
+            {"postgresql": mock.Mock(side_effect=[(13, 0), (13, 2), (13, 0)])},
+        ):
+            for _ in range(3):
+                recheck.recheck_versions()
+
+        assert [(d["previous_version"], d["version"]) for d in self.drifts] == [
+            (None, (13, 0)),
+            ((13, 2), (13, 0)),
+        ]
+
+    def test_updates_memoized_versions(self):
+        with mock.patch.dict(
+            probing.version_detectors,
+            {"postgresql": mock.Mock(side_effect=[(13, 0), (14, 0)])},
+        ):
+            checks.get_version_report()
+            report = recheck.recheck_versions()
+
+        assert report[0].version == (14, 0)
+        assert checks.get_version_report() == report
+
+    def test_forgets_connection_versions(self):
+        wrapper = connections["default"]
+        wrapper.__dict__["pg_version"] = 13_00_00
+        self.addCleanup(wrapper.__dict__.pop, "pg_version", None)
+
+        with mock.patch.dict(
+            probing.version_detectors, {"postgresql": mock.Mock(return_value=(14,))}
+        ):
+            recheck.recheck_versions()
+
+        assert "pg_version" not in wrapper.__dict__
+
+    def test_unspecified(self):
+        with mock.patch.dict(
+            probing.version_detectors, {"postgresql": mock.Mock(return_value=(9,))}
+        ):
+            report = recheck.recheck_versions()
+
+        assert [r.matched for r in report] == [None]
+        assert self.drifts == []
+
+
+class VersionRecheckerTests(SimpleTestCase):
+    def test_next_delay(self):
+        rechecker = recheck.VersionRechecker(10, 0.2)
+
+        delays = [rechecker.next_delay() for _ in range(100)]
+
+        assert all(8 <= d <= 12 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_runs_periodically(self):
+        calls = threading.Semaphore(0)
+        rechecker = recheck.VersionRechecker(0.01, 0)
+
+        with mock.patch.object(
+            recheck, "recheck_versions", side_effect=lambda: calls.release()
+        ):
+            rechecker.start()
+            try:
+                assert calls.acquire(timeout=5)
+                assert calls.acquire(timeout=5)
+            finally:
+                rechecker.stop(5)
+
+        assert rechecker.thread is None
+
+    def test_survives_errors(self):
+        calls = threading.Semaphore(0)
+
+        def recheck_versions():
+            calls.release()
+            raise ValueError("Boom")
+
+        rechecker = recheck.VersionRechecker(0.01, 0)
+
+        with (
+            mock.patch.object(recheck, "recheck_versions", recheck_versions),
+            self.assertLogs("django_version_checks", "ERROR") as logs,
+        ):
+            rechecker.start()
+            try:
+                assert calls.acquire(timeout=5)
+                assert calls.acquire(timeout=5)
+            finally:
+                rechecker.stop(5)
+
+        assert logs.output[0].startswith(
+            "ERROR:django_version_checks:Error rechecking database versions."
+        )
+
+    def test_reuses_connections(self):
+        calls = threading.Semaphore(0)
+        conn = mock.Mock()
+        rechecker = recheck.VersionRechecker(0.01, 0)
+
+        with (
+            mock.patch.object(
+                recheck, "recheck_versions", side_effect=lambda: calls.release()
+            ),
+            mock.patch.object(recheck, "connections") as mock_connections,
+            mock.patch.object(recheck, "reused_connections", set[Any]()) as reused,
+        ):
+            mock_connections.all.return_value = [conn]
+            rechecker.start()
+            try:
+                assert calls.acquire(timeout=5)
+                assert calls.acquire(timeout=5)
+                # Connections are only closed when obsolete, between rechecks.
+                mock_connections.close_all.assert_not_called()
+            finally:
+                rechecker.stop(5)
+
+        assert conn.close_if_unusable_or_obsolete.call_count >= 3
+        mock_connections.close_all.assert_called_once_with()
+        assert reused == {conn}
+
+
+class StartRecheckerTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(recheck.stop_rechecker)
+
+    def test_disabled(self):
+        recheck.start_rechecker()
+
+        assert recheck.rechecker is None
+
+    @override_settings(
+        VERSION_CHECKS_RECHECK_INTERVAL=3600, VERSION_CHECKS_RECHECK_JITTER=0.5
+    )
+    def test_enabled(self):
+        recheck.start_rechecker()
+        rechecker = recheck.rechecker
+        recheck.start_rechecker()
+
+        assert rechecker is not None
+        assert recheck.rechecker is rechecker
+        assert (rechecker.interval, rechecker.jitter) == (3600, 0.5)
+        assert rechecker.thread is not None and rechecker.thread.daemon
+
+    @override_settings(
+        VERSION_CHECKS_RECHECK_INTERVAL=3600, VERSION_CHECKS_RECHECK_JITTER=2
+    )
+    def test_bad_jitter(self):
+        recheck.start_rechecker()
+
+        assert recheck.rechecker is not None
+        assert recheck.rechecker.jitter == recheck.DEFAULT_JITTER
+
+    @override_settings(VERSION_CHECKS_RECHECK_INTERVAL=3600)
+    def test_restart_in_child(self):
+        recheck.start_rechecker()
+        parent = recheck.rechecker
+
+        recheck.restart_rechecker_in_child()
+
+        assert recheck.rechecker is not None
+        assert recheck.rechecker is not parent
+        assert recheck.rechecker.thread is not None
+        assert recheck.rechecker.thread.is_alive()
+        assert parent is not None
+        parent.stop(5)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork()")
+    @override_settings(VERSION_CHECKS_RECHECK_INTERVAL=3600)
+    def test_not_restarted_on_fork(self):
+        recheck.start_rechecker()
+        read_fd, write_fd = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            names = [thread.name for thread in threading.enumerate()]
+            os.write(write_fd, str("django-version-checks-recheck" in names).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as reader:
+            output = reader.read()
+        os.waitpid(pid, 0)
+
+        assert output == "False"
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import itertools
+import random
+
+from django.test import SimpleTestCase
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import Version
+
+from django_version_checks.probing import format_version
+from django_version_checks.specifiers import (
+    CompiledSpecifierSet,
+    strip_zeros,
+    version_matches,
+)
+from django_version_checks.typing import VersionTuple
+
+# Every release of one to four components, each 0, 1, or 2, covering
+# trailing zeros and adjacent versions around each bound.
+VERSIONS: list[VersionTuple] = [
+    version
+    for length in range(1, 5)
+    for version in itertools.product(range(3), repeat=length)
+]
+
+OPERATORS = ["==", "!=", "<=", ">=", "<", ">", "~=", "==="]
+
+SPEC_VERSIONS = [
+    format_version(version)
+    for length in range(1, 4)
+    for version in itertools.product(range(3), repeat=length)
+]
+
+EXOTIC_SPEC_VERSIONS = ["1.0rc1", "1.0.post1", "1.0.dev0", "1!1.0", "1.0+local"]
+
+
+def build_specifiers() -> list[str]:
+    specifiers = [
+        f"{operator}{version}"
+        for operator in OPERATORS
+        for version in SPEC_VERSIONS + EXOTIC_SPEC_VERSIONS
+    ]
+    specifiers += [
+        f"{operator}{version}.*"
+        for operator in ["==", "!="]
+        for version in SPEC_VERSIONS
+    ]
+    valid = []
+    for specifier in specifiers:
+        try:
+            SpecifierSet(specifier)
+        except InvalidSpecifier:
+            continue
+        valid.append(specifier)
+    return valid
+
+
+SPECIFIERS = build_specifiers()
+
+
+def mismatches(specifier: str) -> list[tuple[str, str, bool]]:
+    expected_set = SpecifierSet(specifier)
+    compiled_set = CompiledSpecifierSet(specifier)
+    return [
+        (specifier, format_version(version), expected)
+        for version in VERSIONS
+        if version_matches(version, compiled_set)
+        != (expected := Version(format_version(version)) in expected_set)
+    ]
+
+
+class CompiledSpecifierSetTests(SimpleTestCase):
+    def test_compiled(self):
+        specifier_set = CompiledSpecifierSet(">=13,!=13.2.*")
+
+        assert specifier_set.intervals is not None
+        assert specifier_set == SpecifierSet(">=13,!=13.2.*")
+        assert str(specifier_set) == "!=13.2.*,>=13"
+        assert repr(specifier_set) == repr(SpecifierSet(">=13,!=13.2.*"))
+
+    def test_fallback(self):
+        for specifier in ["===13.0", ">=13.0rc1", "==13.0+local", ">=1!13"]:
+            assert CompiledSpecifierSet(specifier).intervals is None
+
+    def test_arbitrary_equality(self):
+        specifier_set = CompiledSpecifierSet("===13.0")
+
+        assert version_matches((13, 0), specifier_set)
+        assert not version_matches((13,), specifier_set)
+
+    def test_plain_specifier_set(self):
+        assert version_matches((13, 2), SpecifierSet("~=13.1"))
+        assert not version_matches((14, 0), SpecifierSet("~=13.1"))
+
+    def test_unsatisfiable(self):
+        specifier_set = CompiledSpecifierSet(">2,<1")
+
+        assert specifier_set.intervals == []
+        assert not version_matches((1, 5), specifier_set)
+
+    def test_strip_zeros(self):
+        assert strip_zeros((13, 0, 0)) == (13,)
+        assert strip_zeros((0, 0)) == ()
+        assert strip_zeros((13, 0, 1)) == (13, 0, 1)
+
+
+class DifferentialTests(SimpleTestCase):
+    """
+    Compare the compiled intervals to packaging across generated corpora.
+    """
+
+    def test_single_specifiers(self):
+        found = [m for specifier in SPECIFIERS for m in mismatches(specifier)]
+
+        assert found == []
+
+    def test_combined_specifiers(self):
+        # A fixed seed keeps failures reproducible.
+        rng = random.Random(20201214)
+        combined = [
+            ",".join(rng.sample(SPECIFIERS, rng.randint(2, 4))) for _ in range(500)
+        ]
+
+        found = [m for specifier in combined for m in mismatches(specifier)]
+
+        assert found == []
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from unittest import mock
+
+import pytest
+from django.db import connection, connections
+from django.test import SimpleTestCase, override_settings
+from packaging.version import InvalidVersion
+
+from django_version_checks import checks, probing, recheck
+from django_version_checks.testing import override_detected_versions
+
+
+class OverrideDetectedVersionsTests(SimpleTestCase):
+    def setUp(self):
+        detect = mock.Mock(side_effect=AssertionError("probed"))
+        mock_detectors = mock.patch.dict(
+            probing.version_detectors,
+            {"postgresql": detect, "mysql": detect, "sqlite": detect},
+        )
+        mock_detectors.start()
+        self.addCleanup(mock_detectors.stop)
+
+    @override_settings(VERSION_CHECKS={"sqlite": ">=3.9"})
+    def test_sqlite(self):
+        with override_detected_versions({"default": "3.8.7"}):
+            errors = checks.check_sqlite_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E006"
+        assert errors[0].msg == (
+            "The current version of SQLite (3.8.7) for the default database"
+            + " connection does not match the specified range (>=3.9)."
+        )
+
+    @override_settings(VERSION_CHECKS={"postgresql": "~=13.1"})
+    def test_vendor(self):
+        with (
+            mock.patch.object(connection, "vendor", "postgresql"),
+            override_detected_versions({"postgresql": "13.0"}),
+        ):
+            errors = checks.check_postgresql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E004"
+        assert errors[0].msg == (
+            "The current version of PostgreSQL (13.0) for the default database"
+            + " connection does not match the specified range (~=13.1)."
+        )
+        assert "pg_version" not in connections["default"].__dict__
+
+    @override_settings(VERSION_CHECKS={"sqlite": ">=3.9"})
+    def test_alias_over_vendor(self):
+        with override_detected_versions({"sqlite": "3.8.7", "default": "3.9.0"}):
+            errors = checks.check_sqlite_version(databases=["default"])
+
+        assert errors == []
+
+    @override_settings(VERSION_CHECKS={"mysql": ">=8.0", "mariadb": "~=11.4"})
+    def test_mariadb(self):
+        with (
+            mock.patch.object(connection, "vendor", "mysql"),
+            override_detected_versions({"default": "10.11.6-MariaDB"}),
+        ):
+            errors = checks.check_mysql_version(databases=["default"])
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E005"
+        assert errors[0].msg == (
+            "The current version of MariaDB (10.11.6) for the default database"
+            + " connection does not match the specified range (~=11.4)."
+        )
+
+    @override_settings(VERSION_CHECKS={"python": ">=3.10"})
+    def test_python(self):
+        with override_detected_versions(python="3.9.2"):
+            errors = checks.check_python_version()
+
+        assert len(errors) == 1
+        assert errors[0].id == "dvc.E003"
+        assert errors[0].msg == (
+            "The current version of Python (3.9.2) does not match the"
+            + " specified range (>=3.10)."
+        )
+        assert checks.check_python_version() == []
+
+    def test_restores(self):
+        with override_detected_versions({"default": "3.8.7"}, python="3.9.2"):
+            with override_detected_versions({"default": "3.9.0"}):
+                assert probing.overridden_versions["default"].version == (3, 9, 0)
+            assert probing.overridden_versions["default"].version == (3, 8, 7)
+            assert checks.python_version == "3.9.2"
+
+        assert probing.overridden_versions == {}
+        assert checks.python_version != "3.9.2"
+
+    @override_detected_versions({"default": "3.8.7"})
+    def test_decorator(self):
+        report = checks.get_version_report(databases=["default"])
+
+        assert [(r.alias, r.version, r.source) for r in report] == [
+            ("default", (3, 8, 7), "override")
+        ]
+
+    @override_settings(VERSION_CHECKS={"sqlite": ">=3.9"})
+    def test_recheck(self):
+        with override_detected_versions({"default": "3.8.7"}):
+            report = recheck.recheck_versions(databases=["default"])
+
+        assert [(r.alias, r.version, r.matched) for r in report] == [
+            ("default", (3, 8, 7), False)
+        ]
+
+    def test_invalid_version(self):
+        with pytest.raises(ValueError, match="Invalid version 'latest'"):
+            override_detected_versions({"default": "latest"})
+
+    def test_invalid_python(self):
+        with pytest.raises(InvalidVersion):
+            override_detected_versions(python="three")
+
+
+@override_detected_versions({"default": "3.8.7"})
+class OverrideDetectedVersionsClassTests(SimpleTestCase):
+    def test_class_decorator(self):
+        results = probing.get_detected_versions(
+            [connections["default"]], probing.detect_version
+        )
+
+        assert results[0].version == (3, 8, 7)
+
+
+@override_settings(VERSION_CHECKS={"sqlite": ">=3.9"})
+def test_fixture(detected_versions: Callable[..., None]) -> None:
+    detected_versions({"default": "3.8.7"})
+
+    errors = checks.check_sqlite_version(databases=["default"])
+
+    assert [e.id for e in errors] == ["dvc.E006"]
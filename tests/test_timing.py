@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.core.checks import Error
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from django_version_checks import timing
+from django_version_checks.signals import check_timed
+
+hook_calls: list[tuple[str, dict[str, object]]] = []
+
+
+def hook(event, **kwargs):
+    hook_calls.append((event, kwargs))
+
+
+class GetTimingHookTests(SimpleTestCase):
+    def test_default(self):
+        assert timing.get_timing_hook() is None
+
+    @override_settings(VERSION_CHECKS_TIMING_HOOK=hook)
+    def test_callable(self):
+        assert timing.get_timing_hook() is hook
+
+    @override_settings(VERSION_CHECKS_TIMING_HOOK="tests.test_timing.hook")
+    def test_import_string(self):
+        assert timing.get_timing_hook() is hook
+
+    @override_settings(VERSION_CHECKS_TIMING_HOOK=1)
+    def test_not_callable(self):
+        assert timing.get_timing_hook() is None
+
+
+class FormatDurationTests(SimpleTestCase):
+    def test_format(self):
+        assert timing.format_duration(0.01234) == "12.3ms"
+
+
+class RecordCheckTests(SimpleTestCase):
+    def setUp(self):
+        hook_calls.clear()
+
+    @override_settings(VERSION_CHECKS_TIMING_HOOK=hook)
+    def test_reports(self):
+        def check_example(**kwargs):
+            return []
+
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append((sender, kwargs))
+
+        check_timed.connect(receiver)
+        self.addCleanup(check_timed.disconnect, receiver)
+
+        with self.assertLogs("django_version_checks", "DEBUG") as logs:
+            timing.record_check(check_example, 0.5)
+
+        assert logs.output == [
+            "DEBUG:django_version_checks:Check check_example took 500.0ms."
+        ]
+        assert received == [
+            (
+                check_example,
+                {"signal": check_timed, "name": "check_example", "duration": 0.5},
+            )
+        ]
+        assert hook_calls == [("check", {"name": "check_example", "duration": 0.5})]
+
+
+class RecordProbeTests(SimpleTestCase):
+    def setUp(self):
+        hook_calls.clear()
+
+    @override_settings(VERSION_CHECKS_TIMING_HOOK=hook)
+    def test_reports(self):
+        with self.assertLogs("django_version_checks", "DEBUG") as logs:
+            timing.record_probe(connection, (13, 2), 0.01, "live")
+
+        assert logs.output == [
+            "DEBUG:django_version_checks:Detected sqlite version 13.2 for the"
+            + " default database connection in 10.0ms (live)."
+        ]
+        assert hook_calls == [
+            (
+                "probe",
+                {
+                    "alias": "default",
+                    "vendor": "sqlite",
+                    "version": (13, 2),
+                    "duration": 0.01,
+                    "source": "live",
+                    "flavor": None,
+                },
+            )
+        ]
+
+    def test_timeout(self):
+        with self.assertLogs("django_version_checks", "DEBUG") as logs:
+            timing.record_probe(connection, None, 2.0, "timeout")
+
+        assert logs.output == [
+            "WARNING:django_version_checks:Timed out detecting sqlite version for"
+            + " the default database connection after 2000.0ms."
+        ]
+
+
+class ProbeMessageTests(SimpleTestCase):
+    def test_message(self):
+        message = timing.probe_message("default", "sqlite", 0.01, "cache")
+
+        assert message.id == "dvc.D002"
+        assert message.msg == (
+            "Detected the SQLite version for the default database connection"
+            + " in 10.0ms (cache)."
+        )
+
+    def test_message_flavor(self):
+        message = timing.probe_message("default", "mysql", 0.01, "live", "mariadb")
+
+        assert message.msg == (
+            "Detected the MariaDB version for the default database connection"
+            + " in 10.0ms (live)."
+        )
+
+
+class VendorDisplayNameTests(SimpleTestCase):
+    def test_vendor(self):
+        assert timing.vendor_display_name("postgresql") == "PostgreSQL"
+
+    def test_mysql_unknown_flavor(self):
+        assert timing.vendor_display_name("mysql") == "MariaDB/MySQL"
+
+    def test_mysql_flavor(self):
+        assert timing.vendor_display_name("mysql", "mysql") == "MySQL"
+
+    def test_unknown_vendor(self):
+        assert timing.vendor_display_name("oracle") == "oracle"
+
+
+class TimedCheckTests(SimpleTestCase):
+    def test_no_messages(self):
+        error = Error("Uh oh")
+
+        @timing.timed_check
+        def check_example(**kwargs):
+            return [error]
+
+        assert check_example() == [error]
+
+    @override_settings(VERSION_CHECKS_TIMING_MESSAGES=True)
+    def test_messages(self):
+        error = Error("Uh oh")
+
+        @timing.timed_check
+        def check_example(**kwargs):
+            return [error]
+
+        with mock.patch(
+            "django_version_checks.timing.time.perf_counter", side_effect=[1.0, 1.25]
+        ):
+            messages = check_example()
+
+        assert messages[0] is error
+        assert messages[1].id == "dvc.D001"
+        assert messages[1].msg == "Check check_example took 250.0ms."
+
+    @override_settings(VERSION_CHECKS_TIMING_MESSAGES=True)
+    def test_nested(self):
+        @timing.timed_check
+        def check_inner(**kwargs):
+            return []
+
+        @timing.timed_check
+        def check_outer(**kwargs):
+            return check_inner()
+
+        with (
+            mock.patch(
+                "django_version_checks.timing.time.perf_counter",
+                side_effect=[1.0, 1.25],
+            ),
+            self.assertLogs("django_version_checks", "DEBUG") as logs,
+        ):
+            messages = check_outer()
+
+        assert [m.msg for m in messages] == ["Check check_outer took 250.0ms."]
+        assert logs.output == [
+            "DEBUG:django_version_checks:Check check_outer took 250.0ms."
+        ]